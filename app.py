@@ -2,6 +2,7 @@ import streamlit as st
 import pandas as pd
 import os
 from utils.data_utils import load_program_info
+from utils.profiling import run_profiled
 
 # Page configuration
 st.set_page_config(
@@ -94,4 +95,4 @@ def sidebar():
 
 if __name__ == "__main__":
     sidebar()
-    main()
+    run_profiled(main, "app")
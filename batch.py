@@ -0,0 +1,292 @@
+"""
+Headless batch runner for formasi predictions, allocations and exports
+
+Runs scenario files without a browser session, writing one folder of
+CSV/Parquet outputs per scenario plus a summary table of the whole sweep.
+Parquet output needs pyarrow (or fastparquet) installed.
+
+    python batch.py scenarios.json --output out/
+    python batch.py scenarios/ --output out/ --workers 8 --format parquet csv
+    python batch.py --export-data --output out/
+
+A scenario file holds a JSON object, a list of objects, or an object with a
+"scenarios" list; a directory is read as all of its *.json files. Keys not
+given in a scenario fall back to DEFAULT_SCENARIO, e.g.
+
+    {"name": "timur_floor", "total_positions": 900, "budget": 40000,
+     "region_floor": 150, "monte_carlo_draws": 2000}
+"""
+import argparse
+import glob
+import json
+import importlib.util
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from core import data, products
+from core.cache import memoized_functions
+from utils.allocation import allocate_formasi, prepare_allocation_units
+from utils.reconciliation import reconcile_hierarchy
+
+# Settings used for every key a scenario does not specify
+DEFAULT_SCENARIO = {
+    "seed": products.DEFAULT_SEED,
+    "total_positions": None,            # None: the program's nutrition_focus_positions
+    "budget": None,                     # total stipend budget (juta Rupiah), None for no limit
+    "region_floor": 0,                  # minimum positions per region
+    "floors": None,                     # explicit {region: minimum}, overrides region_floor
+    "allocation_method": "auto",
+    "reconciliation_method": "bottom_up",
+    "monte_carlo_draws": 1000,          # 0 skips the Monte Carlo intervals
+    "quantiles": [0.05, 0.5, 0.95]
+}
+
+# Base tables written by --export-data
+DATA_EXPORTS = {
+    "nutrition_data": data.load_nutrition_data,
+    "placement_opportunities": data.load_placement_opportunities,
+    "kecamatan_nutrition": data.load_kecamatan_nutrition,
+    "private_sector_opportunities": data.load_private_sector_opportunities
+}
+
+def scenario_dirname(name):
+    """
+    Output folder name of a scenario
+
+    Scenario names come from user-supplied files, so anything other than
+    letters, digits, '-', '_' and '.' becomes '_' and the name cannot climb
+    out of the output directory.
+    """
+    safe = re.sub(r"[^A-Za-z0-9_.-]+", "_", str(name)).strip("._")
+    return safe or "scenario"
+
+def parquet_available():
+    """
+    Whether pandas can write Parquet (pyarrow or fastparquet is installed)
+    """
+    return any(importlib.util.find_spec(engine) is not None for engine in ("pyarrow", "fastparquet"))
+
+def load_scenarios(paths):
+    """
+    Read scenario definitions from JSON files or directories of JSON files
+
+    Parameters:
+    - paths: list of file or directory paths
+
+    Returns:
+    - list of scenario dicts with every DEFAULT_SCENARIO key filled in and
+      names usable as folder names (see scenario_dirname)
+    """
+    files = []
+    for path in paths:
+        files.extend(sorted(glob.glob(os.path.join(path, "*.json"))) if os.path.isdir(path) else [path])
+
+    scenarios = []
+    for file in files:
+        with open(file) as f:
+            content = json.load(f)
+        if isinstance(content, dict):
+            content = content.get("scenarios", [content])
+
+        stem = os.path.splitext(os.path.basename(file))[0]
+        for i, scenario in enumerate(content):
+            name = scenario.get("name") or (stem if len(content) == 1 else f"{stem}_{i + 1}")
+            scenarios.append(dict(DEFAULT_SCENARIO, **scenario) | {"name": scenario_dirname(name)})
+
+    names = [scenario["name"] for scenario in scenarios]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"Duplicate scenario names: {', '.join(duplicates)}")
+
+    return scenarios
+
+def prime_base_data(data_seed):
+    """
+    Load the base nutrition and placement tables under a fixed seed
+
+    The seed replaces data.BASE_DATA_SEED in this process, so every loader
+    and product built on the base tables uses it; the remaining unseeded
+    loaders draw from NumPy's global random state, which is seeded too.
+
+    Parameters:
+    - data_seed: seed of the base data
+    """
+    np.random.seed(data_seed)
+    if data.BASE_DATA_SEED != data_seed:
+        data.BASE_DATA_SEED = data_seed
+        for function in memoized_functions():
+            function.cache_clear()
+    data.load_nutrition_data()
+    data.load_placement_opportunities()
+
+def write_table(df, path, formats):
+    """
+    Write a DataFrame once per output format
+
+    Parameters:
+    - df: Pandas DataFrame
+    - path: output path without extension
+    - formats: list of 'parquet' and/or 'csv'
+    """
+    for output_format in formats:
+        if output_format == "parquet":
+            if not parquet_available():
+                raise ImportError("Parquet output needs pyarrow: pip install pyarrow, or use --format csv")
+            df.to_parquet(f"{path}.parquet", index=False)
+        else:
+            df.to_csv(f"{path}.csv", index=False)
+
+def run_scenario(scenario, output_dir, formats):
+    """
+    Run one scenario: prediction, reconciliation, Monte Carlo intervals and allocation
+
+    Parameters:
+    - scenario: scenario dict from load_scenarios
+    - output_dir: root output directory; results go to <output_dir>/<name>/
+    - formats: list of output formats
+
+    Returns:
+    - dict summarizing the scenario (one row of the sweep summary)
+    """
+    start = time.perf_counter()
+    summary = {"scenario": scenario["name"], "status": "ok", "error": None}
+
+    try:
+        predictions = products.load_formasi_predictions(scenario["seed"])
+        tables = {"predictions": predictions}
+
+        tables["hierarchy"] = reconcile_hierarchy(
+            predictions,
+            levels=["region", "province"],
+            value_columns=["formasi_needed", "current_placements", "gap"],
+            method=scenario["reconciliation_method"]
+        )
+
+        if scenario["monte_carlo_draws"]:
+            tables["intervals"] = products.simulate_formasi_intervals(
+                scenario["monte_carlo_draws"], tuple(scenario["quantiles"]), scenario["seed"]
+            )
+
+        total_positions = scenario["total_positions"]
+        if total_positions is None:
+            total_positions = data.load_program_info()["nutrition_focus_positions"]
+
+        units = prepare_allocation_units(predictions, data.load_placement_opportunities())
+        floors = scenario["floors"]
+        if floors is None and scenario["region_floor"]:
+            floors = {region: scenario["region_floor"] for region in units["region"].unique()}
+
+        allocation, allocation_summary = allocate_formasi(
+            units,
+            total_positions=total_positions,
+            budget=scenario["budget"],
+            floors=floors,
+            method=scenario["allocation_method"]
+        )
+        tables["allocation"] = allocation
+
+        scenario_dir = os.path.join(output_dir, scenario_dirname(scenario["name"]))
+        os.makedirs(scenario_dir, exist_ok=True)
+        for table_name, table in tables.items():
+            write_table(table, os.path.join(scenario_dir, table_name), formats)
+
+        summary.update({
+            "formasi_needed": int(predictions["formasi_needed"].sum()),
+            "gap": int(predictions["gap"].sum()),
+            "allocated": allocation_summary["allocated"],
+            "weighted_unmet_gap": allocation_summary["weighted_unmet_gap"],
+            "budget_used": allocation_summary["budget_used"],
+            "allocation_method": allocation_summary["method"]
+        })
+    except Exception as error:
+        # An infeasible or malformed scenario, or one whose outputs cannot be
+        # written, should not stop the rest of the sweep
+        summary.update(status="failed", error=f"{type(error).__name__}: {error}")
+
+    summary["elapsed_seconds"] = time.perf_counter() - start
+    return summary
+
+def run_batch(scenarios, output_dir, formats=("csv",), workers=1, data_seed=products.DEFAULT_SEED):
+    """
+    Run a list of scenarios, in parallel worker processes when workers > 1
+
+    Parameters:
+    - scenarios: list of scenario dicts from load_scenarios
+    - output_dir: root output directory
+    - formats: output formats
+    - workers: number of worker processes
+    - data_seed: seed of the base data shared by all scenarios
+
+    Returns:
+    - Pandas DataFrame with one summary row per scenario, also written to <output_dir>/scenarios
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    formats = list(formats)
+
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=prime_base_data, initargs=(data_seed,)) as pool:
+            futures = [pool.submit(run_scenario, scenario, output_dir, formats) for scenario in scenarios]
+            results = [future.result() for future in futures]
+    else:
+        prime_base_data(data_seed)
+        results = [run_scenario(scenario, output_dir, formats) for scenario in scenarios]
+
+    summary = pd.DataFrame(results)
+    write_table(summary, os.path.join(output_dir, "scenarios"), formats)
+
+    return summary
+
+def export_data(output_dir, formats=("csv",), data_seed=products.DEFAULT_SEED):
+    """
+    Write the base data tables to <output_dir>/data/
+
+    Parameters:
+    - output_dir: root output directory
+    - formats: output formats
+    - data_seed: seed of the base data
+    """
+    prime_base_data(data_seed)
+    data_dir = os.path.join(output_dir, "data")
+    os.makedirs(data_dir, exist_ok=True)
+
+    for name, loader in DATA_EXPORTS.items():
+        write_table(loader(), os.path.join(data_dir, name), formats)
+
+def main():
+    parser = argparse.ArgumentParser(description="Run SPPI formasi scenarios without the Streamlit app")
+    parser.add_argument("scenarios", nargs="*", help="scenario JSON files or directories")
+    parser.add_argument("--output", "-o", default="batch_output", help="output directory")
+    parser.add_argument("--format", nargs="+", choices=["csv", "parquet"], default=["csv"],
+                        help="output formats")
+    parser.add_argument("--workers", "-j", type=int, default=1, help="parallel worker processes")
+    parser.add_argument("--data-seed", type=int, default=products.DEFAULT_SEED, help="seed of the base data")
+    parser.add_argument("--export-data", action="store_true", help="also export the base data tables")
+    args = parser.parse_args()
+
+    if not args.scenarios and not args.export_data:
+        parser.error("give at least one scenario file or --export-data")
+    if "parquet" in args.format and not parquet_available():
+        parser.error("--format parquet needs pyarrow: pip install pyarrow, or use --format csv")
+
+    if args.export_data:
+        export_data(args.output, args.format, args.data_seed)
+
+    if args.scenarios:
+        scenarios = load_scenarios(args.scenarios)
+        start = time.perf_counter()
+        summary = run_batch(scenarios, args.output, args.format, args.workers, args.data_seed)
+        failed = summary[summary["status"] != "ok"]
+
+        print(f"{len(summary) - len(failed)} of {len(summary)} scenarios done in "
+              f"{time.perf_counter() - start:.1f} s, outputs in {args.output}")
+        for _, row in failed.iterrows():
+            print(f"  {row['scenario']}: {row['error']}")
+        if len(failed):
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Cold-start import benchmark for the Streamlit pages
+
+Every page is executed in a fresh interpreter, up to (but not including)
+its main(), which covers the imports and module-level setup a new worker
+pays before the first render. Run from the repository root:
+
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --repeat 7 --json import_times.json
+    python benchmarks/import_time.py --budget-ms 1500
+"""
+import argparse
+import glob
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Executed in the child interpreter; prints the elapsed seconds of the page import
+PAGE_SNIPPET = """
+import runpy, sys, time
+start = time.perf_counter()
+runpy.run_path(sys.argv[1], run_name="__import_benchmark__")
+print(time.perf_counter() - start)
+"""
+
+def list_pages():
+    """
+    Return the entry script followed by the pages, relative to the repository root
+    """
+    return ["app.py"] + sorted(os.path.relpath(path, ROOT) for path in glob.glob(os.path.join(ROOT, "pages", "*.py")))
+
+def parse_importtime(stderr, top=5):
+    """
+    Extract the slowest top-level imports from -X importtime output
+
+    Parameters:
+    - stderr: stderr of a child run with -X importtime
+    - top: number of modules to return
+
+    Returns:
+    - list of (module, cumulative milliseconds), slowest first
+    """
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Top-level imports are the ones without indentation in the tree
+        if not name.startswith("  "):
+            modules.append((name.strip(), int(cumulative) / 1000))
+
+    return sorted(modules, key=lambda module: -module[1])[:top]
+
+def measure_page(page, repeat=5):
+    """
+    Measure the cold import time of one page
+
+    Parameters:
+    - page: script path relative to the repository root
+    - repeat: number of fresh interpreters to average over
+
+    Returns:
+    - dict with page, median_ms, min_ms and the slowest top-level imports
+    """
+    env = dict(os.environ, PYTHONPATH=ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    timings = []
+    heaviest = []
+
+    for run in range(repeat):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", PAGE_SNIPPET, page],
+            cwd=ROOT, env=env, capture_output=True, text=True, check=True
+        )
+        timings.append(float(result.stdout.strip().splitlines()[-1]) * 1000)
+        # The import tree is the same on every run; keep the first one
+        if run == 0:
+            heaviest = parse_importtime(result.stderr)
+
+    return {
+        "page": page,
+        "median_ms": statistics.median(timings),
+        "min_ms": min(timings),
+        "heaviest_imports": heaviest
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the cold-start import time of every page")
+    parser.add_argument("pages", nargs="*", help="pages to measure (default: app.py and pages/*.py)")
+    parser.add_argument("--repeat", type=int, default=5, help="fresh interpreters per page")
+    parser.add_argument("--json", help="also write the results to this file")
+    parser.add_argument("--budget-ms", type=float, help="exit with status 1 if any page median exceeds this")
+    args = parser.parse_args()
+
+    results = [measure_page(page, args.repeat) for page in (args.pages or list_pages())]
+
+    width = max(len(result["page"]) for result in results)
+    print(f"{'page':<{width}}  {'median ms':>9}  {'min ms':>7}  heaviest imports")
+    for result in results:
+        heaviest = ", ".join(f"{name} {ms:.0f}" for name, ms in result["heaviest_imports"][:3])
+        print(f"{result['page']:<{width}}  {result['median_ms']:>9.0f}  {result['min_ms']:>7.0f}  {heaviest}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"python": sys.version.split()[0], "repeat": args.repeat, "pages": results}, f, indent=2)
+
+    if args.budget_ms is not None:
+        over = [result["page"] for result in results if result["median_ms"] > args.budget_ms]
+        if over:
+            print(f"Over the {args.budget_ms:.0f} ms budget: {', '.join(over)}")
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
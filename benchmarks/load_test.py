@@ -0,0 +1,299 @@
+"""
+In-process load test with concurrent simulated sessions
+
+Each simulated session is a thread driving its own AppTest instances: it
+opens a random page from --pages, then keeps changing a random widget
+(or tab) on it to a random value, with an optional think time between
+steps. All sessions share one interpreter and therefore the same
+st.cache_data / st.cache_resource entries and the same GIL, like the
+sessions of one Streamlit server process. Nothing leaves the process, so
+the test runs offline.
+
+Before the sessions start every page is rendered once, so shared caches
+are warm and their memory is not attributed to the sessions. For every
+session count the script reports rerun latency percentiles (first paint
+and interactions separately), throughput, resident memory per session
+and process CPU use sampled every 0.5 s. With several --sessions values
+it sweeps them in turn, which shows where latency grows faster than the
+load. Run from the repository root:
+
+    python benchmarks/load_test.py --sessions 1 2 4 8
+    python benchmarks/load_test.py --sessions 8 --steps 20 --think 1 --json load_test.json
+    python benchmarks/load_test.py --pages pages/6_Prediksi_Kebutuhan_Formasi.py --sessions 16
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import resource
+import statistics
+import sys
+import threading
+import time
+from collections import defaultdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Widgets a simulated user changes, per page: (kind, key, values); kind 'tab' selects a tab by label
+INTERACTIONS = {
+    "pages/2_Nutrition_Data.py": [
+        ("tab", "nutrition_map_tabs", ["Peta Interaktif", "Distribusi Provinsi", "Kepadatan per Desa"]),
+        ("tab", "nutrition_indicator_tabs", ["Perbandingan Radar", "Korelasi Indikator"])
+    ],
+    "pages/3_Placement_Opportunities.py": [
+        ("slider", "placement_page_priority_filter", [1, 2, 3, 4, 5]),
+        ("radio", "placement_page_remote_filter", ["Semua", "Hanya Area Terpencil", "Kecuali Area Terpencil"]),
+        ("radio", "placement_page_housing_filter", ["Semua", "Ya", "Tidak"]),
+        ("slider", "placement_table_priority_filter", [1, 3, 5]),
+        ("radio", "matching_method", ["min_cost", "deferred_acceptance"]),
+        ("tab", "placement_distribution_tabs", ["Berdasarkan Spesialisasi", "Berdasarkan Provinsi", "Berdasarkan Prioritas"])
+    ],
+    "pages/6_Prediksi_Kebutuhan_Formasi.py": [
+        ("selectbox", "stunting_density_region", ["Seluruh Indonesia", "Indonesia Barat", "Indonesia Tengah", "Indonesia Timur"]),
+        ("number_input", "allocation_budget", [20000, 30000, 40000]),
+        ("slider", "prediction_table_gap_filter", [0, 10, 20, 40]),
+        ("tab", "formasi_region_tabs", ["Kebutuhan per Region", "Distribusi Keahlian"])
+    ],
+    "pages/8_Dashboard_Kolaborasi_Swasta.py": [
+        ("selectbox", "recommendation_partner", [1, 2, 3, 4, 5]),
+        ("tab", "collaboration_roi_tabs", ["ROI berdasarkan Tipe Kolaborasi", "Analisis Dampak"])
+    ]
+}
+
+# Page 3's map and page 6's predictions are the suspected bottlenecks
+DEFAULT_PAGES = ["pages/3_Placement_Opportunities.py", "pages/6_Prediksi_Kebutuhan_Formasi.py"]
+
+def resident_bytes():
+    """
+    Current resident set size of this process (peak size where /proc is unavailable)
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+def available_cores():
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+class CpuSampler(threading.Thread):
+    """
+    Samples the process CPU time, in cores busy, at a fixed interval
+    """
+
+    def __init__(self, interval=0.5):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.samples = []
+        self._done = threading.Event()
+
+    def run(self):
+        wall, cpu = time.perf_counter(), time.process_time()
+        while not self._done.wait(self.interval):
+            now_wall, now_cpu = time.perf_counter(), time.process_time()
+            self.samples.append((now_cpu - cpu) / (now_wall - wall))
+            wall, cpu = now_wall, now_cpu
+
+    def stop(self):
+        self._done.set()
+        self.join()
+
+def percentile(values, q):
+    """
+    q-th percentile (0-100) of values, linearly interpolated
+    """
+    values = sorted(values)
+    if not values:
+        return None
+    position = (len(values) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+def open_page(page, timeout):
+    from streamlit.testing.v1 import AppTest
+
+    return AppTest.from_file(os.path.join(ROOT, page), default_timeout=timeout)
+
+def simulate_session(index, pages, steps, think, timeout, seed, records, apps):
+    """
+    Drive one simulated session
+
+    Parameters:
+    - index: session number, also used to seed its choices
+    - pages: pages the session may visit
+    - steps: number of reruns
+    - think: longest pause between reruns, in seconds
+    - timeout: AppTest timeout per rerun, in seconds
+    - seed: base random seed
+    - records: list receiving one dict per rerun
+    - apps: list receiving the session's AppTest instances, kept alive until the memory is read
+    """
+    rng = random.Random(seed * 1000 + index)
+    session_apps = {}
+
+    for _ in range(steps):
+        page = rng.choice(pages)
+        app = session_apps.get(page)
+
+        if app is None:
+            app = session_apps[page] = open_page(page, timeout)
+            apps.append(app)
+            kind = "first"
+        else:
+            widget_kind, key, values = rng.choice(INTERACTIONS[page])
+            value = rng.choice(values)
+            if widget_kind == "tab":
+                app.session_state[key] = value
+            else:
+                getattr(app, widget_kind)(key=key).set_value(value)
+            kind = "interaction"
+
+        start = time.perf_counter()
+        try:
+            app.run()
+            error = str(app.exception[0].value) if app.exception else None
+        except Exception as exception:
+            error = f"{type(exception).__name__}: {exception}"
+        records.append({
+            "session": index,
+            "page": page,
+            "kind": kind,
+            "ms": (time.perf_counter() - start) * 1000,
+            "error": error
+        })
+
+        if think:
+            time.sleep(rng.uniform(0, think))
+
+def summarize(records):
+    """
+    Latency percentiles of a list of rerun records
+
+    Returns:
+    - dict with count, p50_ms, p95_ms and p99_ms
+    """
+    latencies = [record["ms"] for record in records]
+    return {
+        "count": len(latencies),
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99)
+    }
+
+def run_load(sessions, pages, steps, think=0.0, timeout=300, seed=0):
+    """
+    Run concurrent sessions and measure latency, memory and CPU
+
+    Parameters:
+    - sessions: number of concurrent sessions
+    - pages, steps, think, timeout, seed: see simulate_session
+
+    Returns:
+    - dict with the latency summaries (overall, per kind, per page), throughput,
+      memory per session, CPU use and errors
+    """
+    records, apps = [], []
+    gc.collect()
+    memory_before = resident_bytes()
+
+    sampler = CpuSampler()
+    threads = [
+        threading.Thread(target=simulate_session, args=(index, pages, steps, think, timeout, seed, records, apps))
+        for index in range(sessions)
+    ]
+
+    start = time.perf_counter()
+    sampler.start()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    sampler.stop()
+    elapsed = time.perf_counter() - start
+
+    # Read while every session's AppTest instances are still alive
+    gc.collect()
+    memory_after = resident_bytes()
+    del apps[:]
+
+    cores = available_cores()
+    cpu = sampler.samples or [0.0]
+    by_kind = defaultdict(list)
+    by_page = defaultdict(list)
+    for record in records:
+        by_kind[record["kind"]].append(record)
+        by_page[record["page"]].append(record)
+
+    return {
+        "sessions": sessions,
+        "reruns": len(records),
+        "elapsed_s": elapsed,
+        "reruns_per_s": len(records) / elapsed if elapsed else None,
+        "latency": summarize(records),
+        "latency_by_kind": {kind: summarize(kind_records) for kind, kind_records in by_kind.items()},
+        "latency_by_page": {page: summarize(page_records) for page, page_records in by_page.items()},
+        "memory_per_session_mib": max(memory_after - memory_before, 0) / sessions / 2 ** 20,
+        "rss_mib": memory_after / 2 ** 20,
+        "cpu_cores_mean": statistics.mean(cpu),
+        "cpu_cores_max": max(cpu),
+        "cpu_saturation": statistics.mean(cpu) / cores,
+        "errors": [record for record in records if record["error"]]
+    }
+
+def warm_up(pages, timeout):
+    """
+    Render every page once so the shared caches are filled before measuring
+    """
+    for page in pages:
+        app = open_page(page, timeout).run()
+        if app.exception:
+            raise RuntimeError(f"{page} failed: {app.exception[0].value}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Drive concurrent simulated sessions through the pages in-process")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 2, 4, 8], help="concurrent session counts to run in turn")
+    parser.add_argument("--pages", nargs="+", choices=list(INTERACTIONS), default=DEFAULT_PAGES, help="pages the sessions visit")
+    parser.add_argument("--steps", type=int, default=10, help="reruns per session")
+    parser.add_argument("--think", type=float, default=0.0, help="longest random pause between reruns, in seconds")
+    parser.add_argument("--timeout", type=float, default=300, help="AppTest timeout per rerun, in seconds")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the simulated interactions")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    sys.path.insert(0, ROOT)
+    os.chdir(ROOT)
+
+    warm_up(args.pages, args.timeout)
+    results = [run_load(sessions, args.pages, args.steps, args.think, args.timeout, args.seed) for sessions in args.sessions]
+
+    print(f"{available_cores()} cores available")
+    print(f"{'sessions':>8}  {'reruns/s':>8}  {'p50 ms':>7}  {'p95 ms':>7}  {'p99 ms':>7}  "
+          f"{'MiB/session':>11}  {'CPU mean':>8}  {'CPU max':>7}  errors")
+    for result in results:
+        latency = result["latency"]
+        print(f"{result['sessions']:>8}  {result['reruns_per_s']:>8.2f}  {latency['p50_ms']:>7.0f}  "
+              f"{latency['p95_ms']:>7.0f}  {latency['p99_ms']:>7.0f}  {result['memory_per_session_mib']:>11.1f}  "
+              f"{result['cpu_cores_mean']:>8.2f}  {result['cpu_cores_max']:>7.2f}  {len(result['errors'])}")
+
+    for result in results:
+        print(f"\n{result['sessions']} sessions")
+        for label, latency in list(result["latency_by_kind"].items()) + list(result["latency_by_page"].items()):
+            print(f"  {label:<40}  n={latency['count']:<4}  p50 {latency['p50_ms']:>7.0f}  "
+                  f"p95 {latency['p95_ms']:>7.0f}  p99 {latency['p99_ms']:>7.0f} ms")
+        for error in result["errors"][:5]:
+            print(f"  error in session {error['session']} on {error['page']}: {error['error']}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"python": sys.version.split()[0], "cores": available_cores(), "pages": args.pages,
+                       "steps": args.steps, "think": args.think, "runs": results}, f, indent=2)
+
+if __name__ == "__main__":
+    main()
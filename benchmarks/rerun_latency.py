@@ -0,0 +1,136 @@
+"""
+Rerun latency benchmark for widget interactions on the Streamlit pages
+
+For each scenario a page is rendered once with AppTest (warming the
+caches), then one widget is toggled between two values. Every toggle is
+timed twice: the full script rerun, which is what each interaction cost
+before the page was split into fragments, and the body of the fragment
+that owns the widget, which is all a fragment-scoped rerun executes.
+AppTest itself always reruns the full script, so fragment bodies are
+timed by wrapping st.fragment. Run from the repository root:
+
+    python benchmarks/rerun_latency.py
+    python benchmarks/rerun_latency.py --repeat 9 --json rerun_latency.json
+"""
+import argparse
+import functools
+import json
+import os
+import statistics
+import sys
+import time
+from collections import defaultdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# page, widget kind and key, the two values it is toggled between, and the fragment owning it
+SCENARIOS = [
+    {"page": "pages/3_Placement_Opportunities.py", "widget": ("slider", "placement_page_priority_filter"),
+     "values": (3, 1), "fragment": "display_map_with_filters"},
+    {"page": "pages/3_Placement_Opportunities.py", "widget": ("slider", "placement_table_priority_filter"),
+     "values": (3, 1), "fragment": "display_placement_table"},
+    {"page": "pages/3_Placement_Opportunities.py", "widget": ("radio", "matching_method"),
+     "values": ("min_cost", "deferred_acceptance"), "fragment": "display_matching_simulation"},
+    {"page": "pages/6_Prediksi_Kebutuhan_Formasi.py", "widget": ("selectbox", "stunting_density_region"),
+     "values": ("Indonesia Timur", "Seluruh Indonesia"), "fragment": "display_stunting_density"},
+    {"page": "pages/6_Prediksi_Kebutuhan_Formasi.py", "widget": ("number_input", "allocation_budget"),
+     "values": (40000, 30000), "fragment": "display_allocation_optimizer"},
+    {"page": "pages/6_Prediksi_Kebutuhan_Formasi.py", "widget": ("slider", "prediction_table_gap_filter"),
+     "values": (20, 0), "fragment": "display_prediction_table"},
+    {"page": "pages/8_Dashboard_Kolaborasi_Swasta.py", "widget": ("selectbox", "recommendation_partner"),
+     "values": (2, 1), "fragment": "display_partner_recommendations"}
+]
+
+# Seconds spent in each fragment body, by function name
+fragment_timings = defaultdict(list)
+
+def install_fragment_timer():
+    """
+    Wrap st.fragment so every fragment body records its run time in fragment_timings
+
+    Must run before the pages and utils.map_utils are imported.
+    """
+    import streamlit as st
+    original = st.fragment
+
+    def timed_fragment(function=None, **kwargs):
+        if function is None:
+            return lambda inner: timed_fragment(inner, **kwargs)
+
+        @functools.wraps(function)
+        def timed(*args, **inner_kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **inner_kwargs)
+            finally:
+                fragment_timings[function.__name__].append(time.perf_counter() - start)
+
+        return original(timed, **kwargs)
+
+    st.fragment = timed_fragment
+
+def measure_scenario(scenario, repeat=5):
+    """
+    Time the full rerun and the owning fragment for one widget interaction
+
+    Parameters:
+    - scenario: dict from SCENARIOS
+    - repeat: number of toggles
+
+    Returns:
+    - dict with the scenario, full_ms and fragment_ms medians and the speedup
+    """
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(os.path.join(ROOT, scenario["page"]), default_timeout=300).run()
+    if app.exception:
+        raise RuntimeError(f"{scenario['page']} failed: {app.exception[0].value}")
+
+    kind, key = scenario["widget"]
+    full, fragment = [], []
+    for run in range(repeat):
+        widget = getattr(app, kind)(key=key)
+        widget.set_value(scenario["values"][run % 2])
+        fragment_timings[scenario["fragment"]].clear()
+
+        start = time.perf_counter()
+        app.run()
+        full.append(time.perf_counter() - start)
+        fragment.append(sum(fragment_timings[scenario["fragment"]]))
+
+    full_ms = statistics.median(full) * 1000
+    fragment_ms = statistics.median(fragment) * 1000
+    return {
+        "page": scenario["page"],
+        "widget": key,
+        "fragment": scenario["fragment"],
+        "full_ms": full_ms,
+        "fragment_ms": fragment_ms,
+        "speedup": full_ms / fragment_ms if fragment_ms else None
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure full-script and fragment rerun latency per widget")
+    parser.add_argument("--repeat", type=int, default=5, help="widget toggles per scenario")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    sys.path.insert(0, ROOT)
+    os.chdir(ROOT)
+    install_fragment_timer()
+
+    results = [measure_scenario(scenario, args.repeat) for scenario in SCENARIOS]
+
+    width = max(len(result["widget"]) for result in results)
+    print(f"{'widget':<{width}}  {'full ms':>8}  {'fragment ms':>11}  {'speedup':>7}  fragment")
+    for result in results:
+        speedup = f"{result['speedup']:.1f}x" if result["speedup"] else "-"
+        print(f"{result['widget']:<{width}}  {result['full_ms']:>8.0f}  {result['fragment_ms']:>11.0f}  "
+              f"{speedup:>7}  {result['fragment']}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"python": sys.version.split()[0], "repeat": args.repeat, "scenarios": results}, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,402 @@
+"""
+Benchmark suite for the data loaders, maps, filters, page 6 predictions and
+chart builders at Indonesian administrative scales
+
+Every case runs on synthetic inputs with as many rows as there are
+provinces (34), districts (514), kecamatan (7k) and villages (83k),
+resampled from the simulated data in core.data with unique unit names and
+jittered indicators. The data loaders take no size argument and run once,
+cold, at their own scale. Each case runs once untimed (imports, lazy
+initialization), is then timed over --repeat runs (median) and run once
+more under tracemalloc for its peak Python memory. The page 6 case runs
+core.products.load_formasi_predictions and the reconciliation on the
+synthetic units, so it measures the code the page runs.
+
+Results are appended to a JSON Lines history and compared against a
+baseline; a case is a regression when its time or peak memory grows by
+more than --tolerance (and more than a small noise floor). Timings only
+compare on the same machine, so the baseline is not part of the
+repository: store one locally with --update-baseline before changing
+code. Regressions are reported as advisory; with --strict the script
+exits with status 1 when any case regressed. Run from the repository
+root:
+
+    python benchmarks/scale_suite.py --update-baseline
+    python benchmarks/scale_suite.py
+    python benchmarks/scale_suite.py --scales province district --cases map --strict
+
+Figure builders are called through __wrapped__, so the figure cache does
+not turn repeated runs into cache hits. The Streamlit display helpers
+(display_drilldown, display_figure_payloads) are not builders and are not
+covered.
+"""
+import argparse
+import gc
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Rows per synthetic scale
+SCALES = {"province": 34, "district": 514, "kecamatan": 7000, "village": 83000}
+
+DEFAULT_HISTORY = os.path.join(ROOT, "benchmarks", "scale_history.jsonl")
+DEFAULT_BASELINE = os.path.join(ROOT, "benchmarks", "scale_baseline.json")
+
+# Differences below these are noise, whatever the relative change
+MIN_REGRESSION_MS = 2.0
+MIN_REGRESSION_MIB = 1.0
+
+# Largest scale for cases whose output grows with the rows sent to the browser
+# (one folium marker per row); larger scales are reported as skipped
+MAX_SCALE = {"create_placement_map": "kecamatan", "create_nutrition_heatmap": "kecamatan"}
+
+def resample(df, n, rng, jitter=(), unique=None):
+    """
+    Draw n rows of df with replacement
+
+    Parameters:
+    - df: Pandas DataFrame to resample
+    - n: number of rows
+    - rng: numpy Generator
+    - jitter: numeric columns scaled by a random factor in [0.9, 1.1]
+    - unique: optional column overwritten with a unique name per row
+
+    Returns:
+    - Pandas DataFrame with n rows
+    """
+    rows = df.iloc[rng.integers(0, len(df), n)].reset_index(drop=True)
+    for column in jitter:
+        rows[column] = (rows[column] * rng.uniform(0.9, 1.1, n)).astype(rows[column].dtype)
+    if unique is not None:
+        rows[unique] = [f"{unique.title()} {i + 1}" for i in range(n)]
+    return rows
+
+def synthetic_tables(n, seed=2025):
+    """
+    Synthetic inputs with n rows each
+
+    Returns:
+    - dict with 'nutrition', 'placements', 'collaborations' and 'villages'
+    """
+    import numpy as np
+    from core import data
+
+    rng = np.random.default_rng(seed)
+    nutrition = data.load_nutrition_data()
+    metrics = [column for column in nutrition.columns if column.endswith(("_percentage", "_breastfeeding", "_score"))]
+
+    return {
+        "nutrition": resample(nutrition, n, rng, jitter=metrics + ["health_workers_per_1000"], unique="unit"),
+        "placements": resample(data.load_placement_opportunities(), n, rng, unique="district"),
+        "collaborations": resample(data.load_private_sector_opportunities(), n, rng),
+        "villages": resample(data.load_village_points(), n, rng, jitter=["latitude", "longitude"])
+    }
+
+def formasi_inputs(tables):
+    """
+    Page 6 inputs at the scale of the tables: every synthetic unit is a
+    province of its own, and the placements are spread over the units
+
+    Returns:
+    - (nutrition, placements) Pandas DataFrames
+    """
+    import numpy as np
+
+    rng = np.random.default_rng(2)
+    nutrition = tables["nutrition"].assign(province=tables["nutrition"]["unit"])
+    placements = tables["placements"].assign(
+        province=rng.choice(nutrition["province"].to_numpy(), len(tables["placements"]))
+    )
+    return nutrition, placements
+
+def predict_formasi(nutrition, placements):
+    """
+    Page 6 predictions: core.products.load_formasi_predictions run on the
+    given tables instead of the simulated national data, then reconciled
+    into the region/province hierarchy as the page does
+    """
+    from unittest import mock
+    from core import products
+    from utils.reconciliation import reconcile_hierarchy
+
+    with mock.patch.object(products, "load_nutrition_data", lambda: nutrition), \
+            mock.patch.object(products, "load_placement_opportunities", lambda: placements):
+        predictions = products.load_formasi_predictions.__wrapped__()
+
+    return reconcile_hierarchy(predictions, ["region", "province"], ["formasi_needed", "current_placements", "gap"])
+
+def allocation_units(units):
+    """
+    Allocation inputs (gap, priority, stipend cost, housing capacity) for arbitrary units
+    """
+    import numpy as np
+
+    rng = np.random.default_rng(1)
+    return units.assign(
+        gap=rng.integers(0, 80, len(units)),
+        stipend_cost=rng.choice([36, 42, 54], len(units)),
+        housing_capacity=rng.integers(0, 20, len(units))
+    )
+
+def build_cases():
+    """
+    Benchmark cases
+
+    Returns:
+    - list of dicts with 'name', 'group', 'setup' (tables -> argument tuple,
+      untimed) and 'run' (the timed call); loader cases have no setup and
+      run once at their own scale
+    """
+    import plotly.graph_objects as go
+    from core import data, products
+    from utils import visualization_utils as viz
+    from utils.cube import PlacementCube
+    from utils.raster import DensityRenderer
+    from utils.allocation import allocate_formasi
+    from utils.map_utils import create_placement_map, create_nutrition_heatmap, filter_placements
+
+    memoized = [value for module in (data, products) for value in vars(module).values() if hasattr(value, "cache_clear")]
+
+    def cold(loader, *args):
+        # What a st.cache_data miss in utils.data_utils executes
+        for function in memoized:
+            function.cache_clear()
+        return loader.__wrapped__(*args)
+
+    cases = []
+    for name in ["load_program_info", "load_nutrition_data", "load_placement_opportunities", "load_applicant_pool",
+                 "load_kecamatan_nutrition", "load_village_points", "load_private_sector_opportunities",
+                 "load_partner_profiles", "load_eligibility_criteria"]:
+        cases.append({"name": name, "group": "loader", "setup": None,
+                      "run": lambda loader=getattr(data, name): cold(loader)})
+    cases.append({"name": "load_village_nutrition", "group": "loader", "setup": None,
+                  "run": lambda: cold(data.load_village_nutrition, "Papua", "District 1 Papua", "Kecamatan 1")})
+
+    def aggregates(tables):
+        return {**viz.plan_nutrition_charts().compute(tables["nutrition"]),
+                **viz.plan_national_nutrition_charts().compute(tables["nutrition"])}
+
+    def density_map(villages):
+        renderer = DensityRenderer(villages["longitude"], villages["latitude"],
+                                   columns={"stunted_children": villages["stunted_children"]})
+        raster = renderer.render(renderer.bounds(), width=800, height=450, how="sum", column="stunted_children")
+        return viz.create_density_map_figure.__wrapped__(raster, "Sebaran Balita Stunting")
+
+    def large_data_mode(x, y):
+        return viz.apply_large_data_mode(go.Figure(go.Scatter(x=x, y=y, mode="markers")))
+
+    map_filters = {
+        "provinces": ["Papua", "Jawa Barat", "Nusa Tenggara Timur"],
+        "specializations": ["Nutritionist", "Public Health"],
+        "min_priority": 3,
+        "remote_area": False,
+        "housing_provided": True
+    }
+
+    cases += [
+        # Maps are built and rendered to HTML, which is what folium_static sends
+        {"name": "create_placement_map", "group": "map", "setup": lambda t: (t["placements"],),
+         "run": lambda df: create_placement_map(df).get_root().render()},
+        {"name": "create_nutrition_heatmap", "group": "map", "setup": lambda t: (t["nutrition"],),
+         "run": lambda df: create_nutrition_heatmap(df).get_root().render()},
+        # display_map_with_filters: the row filter and the cube totals for the same selection
+        {"name": "filter_placements", "group": "filter", "setup": lambda t: (t["placements"],),
+         "run": lambda df: filter_placements(df, **map_filters)},
+        {"name": "placement_cube_totals", "group": "filter", "setup": lambda t: (PlacementCube(t["placements"]),),
+         "run": lambda cube: cube.totals({
+             "province": map_filters["provinces"],
+             "specialization": map_filters["specializations"],
+             "priority_level": range(map_filters["min_priority"], 6),
+             "remote_area": map_filters["remote_area"],
+             "housing_provided": map_filters["housing_provided"]
+         })},
+        {"name": "predict_formasi", "group": "page6", "setup": formasi_inputs,
+         "run": predict_formasi},
+        {"name": "allocate_formasi", "group": "page6", "setup": lambda t: (allocation_units(t["nutrition"]),),
+         "run": lambda units: allocate_formasi(units, 750, method="greedy")},
+        {"name": "plan_nutrition_charts", "group": "chart", "setup": lambda t: (t["nutrition"],),
+         "run": lambda df: (viz.plan_nutrition_charts().compute(df), viz.plan_national_nutrition_charts().compute(df))},
+        {"name": "create_regional_nutrition_comparison", "group": "chart",
+         "setup": lambda t: (aggregates(t)["by_region"], "stunting_percentage"),
+         "run": viz.create_regional_nutrition_comparison.__wrapped__},
+        {"name": "create_provincial_nutrition_map", "group": "chart",
+         "setup": lambda t: (aggregates(t)["by_province"], "stunting_percentage"),
+         "run": viz.create_provincial_nutrition_map.__wrapped__},
+        {"name": "create_nutrition_indicators_radar", "group": "chart", "setup": lambda t: (aggregates(t)["radar_rows"],),
+         "run": viz.create_nutrition_indicators_radar.__wrapped__},
+        {"name": "create_priority_level_distribution", "group": "chart",
+         "setup": lambda t: (aggregates(t)["priority_counts"],),
+         "run": viz.create_priority_level_distribution.__wrapped__},
+        {"name": "create_correlation_heatmap", "group": "chart", "setup": lambda t: (aggregates(t)["correlation"],),
+         "run": viz.create_correlation_heatmap.__wrapped__},
+        {"name": "create_specialization_distribution", "group": "chart", "setup": lambda t: (t["placements"],),
+         "run": viz.create_specialization_distribution.__wrapped__},
+        {"name": "create_collaboration_types_chart", "group": "chart", "setup": lambda t: (t["collaborations"],),
+         "run": viz.create_collaboration_types_chart.__wrapped__},
+        {"name": "create_density_map_figure", "group": "chart", "setup": lambda t: (t["villages"],),
+         "run": density_map},
+        {"name": "apply_large_data_mode", "group": "chart",
+         "setup": lambda t: (t["villages"]["longitude"].to_numpy(), t["villages"]["latitude"].to_numpy()),
+         "run": large_data_mode}
+    ]
+
+    return cases
+
+def measure(run, args, repeat):
+    """
+    Time a call and measure its peak memory
+
+    Returns:
+    - dict with median_ms, min_ms and peak_mib
+    """
+    # Untimed warm-up: first-call imports and lazy initialization are not what is measured
+    run(*args)
+
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        run(*args)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        run(*args)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {"median_ms": statistics.median(timings), "min_ms": min(timings), "peak_mib": peak / 2 ** 20}
+
+def run_suite(scales, case_filter=None, repeat=3):
+    """
+    Run every matching case at every scale
+
+    Parameters:
+    - scales: list of SCALES keys
+    - case_filter: optional substrings; a case runs when its name or group contains one
+    - repeat: timed runs per case and scale
+
+    Returns:
+    - list of result dicts (case, group, scale, rows, median_ms, min_ms, peak_mib, or skipped)
+    """
+    cases = [
+        case for case in build_cases()
+        if not case_filter or any(text in case["name"] or text == case["group"] for text in case_filter)
+    ]
+    order = list(SCALES)
+    results = []
+
+    for case in cases:
+        if case["setup"] is None:
+            results.append(dict(case=case["name"], group=case["group"], scale="native", rows=None,
+                                **measure(case["run"], (), repeat)))
+
+    for scale in scales:
+        tables = synthetic_tables(SCALES[scale])
+        for case in cases:
+            if case["setup"] is None:
+                continue
+            result = {"case": case["name"], "group": case["group"], "scale": scale, "rows": SCALES[scale]}
+            limit = MAX_SCALE.get(case["name"])
+            if limit is not None and order.index(scale) > order.index(limit):
+                result["skipped"] = f"above the {limit} scale"
+            else:
+                result.update(measure(case["run"], case["setup"](tables), repeat))
+            results.append(result)
+
+    return results
+
+def find_regressions(results, baseline, tolerance):
+    """
+    Cases slower or heavier than the baseline by more than tolerance
+
+    Returns:
+    - list of (case, scale, metric, baseline value, current value)
+    """
+    previous = {(result["case"], result["scale"]): result for result in baseline.get("results", [])}
+    regressions = []
+
+    for result in results:
+        before = previous.get((result["case"], result["scale"]))
+        if before is None or "skipped" in result or "skipped" in before:
+            continue
+        for metric, floor in (("median_ms", MIN_REGRESSION_MS), ("peak_mib", MIN_REGRESSION_MIB)):
+            if result[metric] > before[metric] * (1 + tolerance) and result[metric] - before[metric] > floor:
+                regressions.append((result["case"], result["scale"], metric, before[metric], result[metric]))
+
+    return regressions
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark loaders, maps, filters and charts at several data scales")
+    parser.add_argument("--scales", nargs="+", choices=list(SCALES), default=list(SCALES), help="scales to run")
+    parser.add_argument("--cases", nargs="+", help="only cases whose name contains, or whose group is, one of these")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case and scale")
+    parser.add_argument("--history", default=DEFAULT_HISTORY, help="JSON Lines file the run is appended to")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="stored results to compare against")
+    parser.add_argument("--update-baseline", action="store_true", help="store this run as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative growth before flagging")
+    parser.add_argument("--strict", action="store_true", help="exit with status 1 when any case regressed")
+    args = parser.parse_args()
+
+    sys.path.insert(0, ROOT)
+    os.chdir(ROOT)
+
+    results = run_suite(args.scales, args.cases, args.repeat)
+    run = {
+        "time": datetime.now().isoformat(timespec="seconds"),
+        "revision": git_revision(),
+        "python": sys.version.split()[0],
+        "repeat": args.repeat,
+        "results": results
+    }
+
+    width = max(len(result["case"]) for result in results)
+    print(f"{'case':<{width}}  {'scale':<9}  {'median ms':>9}  {'peak MiB':>8}")
+    for result in results:
+        if "skipped" in result:
+            print(f"{result['case']:<{width}}  {result['scale']:<9}  skipped ({result['skipped']})")
+        else:
+            print(f"{result['case']:<{width}}  {result['scale']:<9}  {result['median_ms']:>9.1f}  {result['peak_mib']:>8.1f}")
+
+    with open(args.history, "a") as f:
+        f.write(json.dumps(run) + "\n")
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(run, f, indent=2)
+        print(f"Baseline written to {os.path.relpath(args.baseline, ROOT)}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print("No baseline yet; store one with --update-baseline")
+        return
+
+    with open(args.baseline) as f:
+        regressions = find_regressions(results, json.load(f), args.tolerance)
+
+    if regressions:
+        print(f"Regressions over {args.tolerance:.0%} against the baseline (advisory unless --strict):")
+        for case, scale, metric, before, after in regressions:
+            print(f"  {case} [{scale}] {metric}: {before:.1f} -> {after:.1f}")
+        if args.strict:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+class AggregationPlan:
+    """
+    Collects the aggregates a set of charts needs and computes them together
+
+    Charts register what they need (means, group means, value counts,
+    selected rows, correlations) under a name. compute() then touches the
+    input once per kind of work: requests grouping by the same column share
+    one groupby, all overall means share one mean, and all correlation
+    requests are cut from a single correlation matrix.
+    """
+
+    def __init__(self):
+        self.requests = {}
+
+    def _add(self, name, kind, **spec):
+        if name in self.requests:
+            raise ValueError(f"Aggregate '{name}' is already planned")
+        self.requests[name] = dict(spec, kind=kind)
+        return self
+
+    def mean(self, name, columns):
+        """
+        Plan the overall mean of columns (a Series indexed by column)
+        """
+        return self._add(name, "mean", columns=list(columns))
+
+    def group_mean(self, name, by, columns):
+        """
+        Plan the mean of columns per value of by (a DataFrame with by as a column)
+        """
+        return self._add(name, "group_mean", by=by, columns=list(columns))
+
+    def value_counts(self, name, column):
+        """
+        Plan the number of rows per value of column (a Series, most frequent first)
+        """
+        return self._add(name, "value_counts", column=column)
+
+    def rows(self, name, column, values, columns):
+        """
+        Plan the rows whose column is in values, restricted to columns
+        """
+        return self._add(name, "rows", column=column, values=list(values), columns=list(columns))
+
+    def correlation(self, name, columns):
+        """
+        Plan the Pearson correlation matrix of columns
+        """
+        return self._add(name, "correlation", columns=list(columns))
+
+    def columns(self):
+        """
+        Every input column any planned aggregate reads
+        """
+        needed = []
+        for spec in self.requests.values():
+            for column in [spec.get("by"), spec.get("column")] + spec.get("columns", []):
+                if column is not None and column not in needed:
+                    needed.append(column)
+        return needed
+
+    def compute(self, data):
+        """
+        Compute every planned aggregate
+
+        Parameters:
+        - data: Pandas DataFrame holding all planned columns
+
+        Returns:
+        - dict mapping each planned name to its result
+        """
+        missing = [column for column in self.columns() if column not in data.columns]
+        if missing:
+            raise KeyError(f"Columns missing for the planned aggregates: {', '.join(missing)}")
+
+        frame = data[self.columns()]
+        by_kind = {}
+        for name, spec in self.requests.items():
+            by_kind.setdefault(spec["kind"], []).append(name)
+
+        results = {}
+
+        names = by_kind.get("mean", [])
+        if names:
+            means = frame[self._union(names)].mean()
+            for name in names:
+                results[name] = means[self.requests[name]["columns"]]
+
+        groups = {}
+        for name in by_kind.get("group_mean", []):
+            groups.setdefault(self.requests[name]["by"], []).append(name)
+        for by, names in groups.items():
+            means = frame.groupby(by)[self._union(names)].mean().reset_index()
+            for name in names:
+                results[name] = means[[by] + self.requests[name]["columns"]]
+
+        for name in by_kind.get("value_counts", []):
+            results[name] = frame[self.requests[name]["column"]].value_counts()
+
+        for name in by_kind.get("rows", []):
+            spec = self.requests[name]
+            results[name] = frame.loc[frame[spec["column"]].isin(spec["values"]), [spec["column"]] + spec["columns"]]
+
+        names = by_kind.get("correlation", [])
+        if names:
+            matrix = frame[self._union(names)].corr()
+            for name in names:
+                columns = self.requests[name]["columns"]
+                results[name] = matrix.loc[columns, columns]
+
+        return results
+
+    def _union(self, names):
+        columns = []
+        for name in names:
+            columns.extend(c for c in self.requests[name]["columns"] if c not in columns)
+        return columns
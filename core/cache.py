@@ -0,0 +1,89 @@
+import copy
+import functools
+import inspect
+import threading
+from collections import OrderedDict
+
+# Every memoized function, in definition order (see memoized_functions)
+_registry = []
+_registry_lock = threading.Lock()
+
+def memoize(function=None, maxsize=128):
+    """
+    Process-wide memoization for the core data loaders
+
+    Works like st.cache_data without needing Streamlit: results are keyed by
+    the bound arguments (defaults included, so f() and f(seed=2025) share an
+    entry) and every call returns a deep copy, so callers may modify what
+    they get. Can be used as @memoize or @memoize(maxsize=...).
+
+    Parameters:
+    - function: function to wrap (when used without arguments)
+    - maxsize: number of results kept, least recently used dropped first (None for no limit)
+
+    Returns:
+    - wrapped function with cache_clear(), cache_info() and cache_values(),
+      listed by memoized_functions()
+    """
+    if function is None:
+        return functools.partial(memoize, maxsize=maxsize)
+
+    signature = inspect.signature(function)
+    results = OrderedDict()
+    lock = threading.Lock()
+    stats = {"hits": 0, "misses": 0}
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        key = tuple(bound.arguments.items())
+
+        with lock:
+            if key in results:
+                results.move_to_end(key)
+                stats["hits"] += 1
+                return copy.deepcopy(results[key])
+
+        # Computed outside the lock, so slow loaders do not block each other
+        value = function(*args, **kwargs)
+
+        with lock:
+            stats["misses"] += 1
+            results[key] = value
+            if maxsize is not None:
+                while len(results) > maxsize:
+                    results.popitem(last=False)
+
+        return copy.deepcopy(value)
+
+    def cache_clear():
+        with lock:
+            results.clear()
+
+    def cache_info():
+        with lock:
+            return dict(stats, entries=len(results), maxsize=maxsize)
+
+    def cache_values():
+        with lock:
+            return list(results.values())
+
+    wrapper.cache_clear = cache_clear
+    wrapper.cache_info = cache_info
+    wrapper.cache_values = cache_values
+
+    with _registry_lock:
+        _registry.append(wrapper)
+
+    return wrapper
+
+def memoized_functions():
+    """
+    Every function decorated with memoize so far, in any module
+
+    Returns:
+    - list of wrapped functions
+    """
+    with _registry_lock:
+        return list(_registry)
@@ -0,0 +1,507 @@
+import pandas as pd
+import numpy as np
+import json
+import os
+import zlib
+from core.cache import memoize
+from core.geo import generate_indonesia_coordinates
+
+# Seed of the base nutrition and placement tables when none is given, so the
+# app and every batch worker process draw the same tables; the batch
+# runner's --data-seed replaces it for the whole run
+BASE_DATA_SEED = 2025
+
+# Cache for performance optimization
+@memoize
+def load_program_info():
+    """
+    Load SPPI program information
+    This would typically come from an API or database, but for this example,
+    we'll create structured information about the program
+    """
+    program_info = {
+        "program_name": "Sarjana Penggerak Pembangunan Indonesia (SPPI)",
+        "year": 2025,
+        "focus_area": "Kesehatan Gizi",
+        "description": """
+        Program Sarjana Penggerak Pembangunan Indonesia (SPPI) adalah inisiatif nasional 
+        yang bertujuan untuk menempatkan lulusan sarjana di berbagai daerah Indonesia 
+        untuk mendukung pembangunan. Pada tahun 2025, program ini akan memberikan 
+        penekanan khusus pada bidang kesehatan gizi.
+        """,
+        "objectives": [
+            "Meningkatkan status gizi masyarakat Indonesia",
+            "Mengurangi prevalensi stunting pada anak-anak",
+            "Meningkatkan kesadaran tentang pola makan sehat",
+            "Memastikan akses ke makanan bergizi di daerah terpencil",
+            "Memberdayakan masyarakat dalam praktik keamanan pangan"
+        ],
+        "estimated_positions": 3500,
+        "nutrition_focus_positions": 750,
+        "application_period": "Januari - Maret 2025",
+        "program_duration": "1 tahun (dapat diperpanjang)"
+    }
+    
+    return program_info
+
+@memoize
+def load_nutrition_data(seed=None):
+    """
+    Load nutrition data by region
+    This function simulates nutrition data that would typically come from a real database
+
+    Parameters:
+    - seed: random seed of the simulated values (None for BASE_DATA_SEED)
+    """
+    random = np.random.RandomState(BASE_DATA_SEED if seed is None else seed)
+    
+    # Create province list (all Indonesia provinces)
+    provinces = [
+        "Aceh", "Sumatera Utara", "Sumatera Barat", "Riau", "Jambi", "Sumatera Selatan",
+        "Bengkulu", "Lampung", "Kepulauan Bangka Belitung", "Kepulauan Riau", "DKI Jakarta",
+        "Jawa Barat", "Jawa Tengah", "DI Yogyakarta", "Jawa Timur", "Banten", "Bali",
+        "Nusa Tenggara Barat", "Nusa Tenggara Timur", "Kalimantan Barat", "Kalimantan Tengah",
+        "Kalimantan Selatan", "Kalimantan Timur", "Kalimantan Utara", "Sulawesi Utara",
+        "Sulawesi Tengah", "Sulawesi Selatan", "Sulawesi Tenggara", "Gorontalo",
+        "Sulawesi Barat", "Maluku", "Maluku Utara", "Papua Barat", "Papua"
+    ]
+    
+    # In a real application, these would be real values from research/databases
+    # Simulating data for educational purposes
+    data = {
+        "province": provinces,
+        "stunting_percentage": random.uniform(15, 35, len(provinces)),
+        "wasting_percentage": random.uniform(5, 15, len(provinces)),
+        "obesity_percentage": random.uniform(3, 25, len(provinces)),
+        "anemia_percentage": random.uniform(10, 40, len(provinces)),
+        "exclusive_breastfeeding": random.uniform(30, 70, len(provinces)),
+        "food_security_score": random.uniform(50, 90, len(provinces)),
+        "nutrition_centers": random.randint(5, 100, len(provinces)),
+        "health_workers_per_1000": random.uniform(0.5, 5.0, len(provinces)),
+        "priority_level": random.randint(1, 6, len(provinces))
+    }
+    
+    # Convert to DataFrame
+    df = pd.DataFrame(data)
+    
+    # Add regional grouping
+    western_indonesia = [
+        "Aceh", "Sumatera Utara", "Sumatera Barat", "Riau", "Jambi", "Sumatera Selatan",
+        "Bengkulu", "Lampung", "Kepulauan Bangka Belitung", "Kepulauan Riau", "DKI Jakarta",
+        "Jawa Barat", "Jawa Tengah", "DI Yogyakarta", "Jawa Timur", "Banten", "Bali"
+    ]
+    
+    central_indonesia = [
+        "Nusa Tenggara Barat", "Nusa Tenggara Timur", "Kalimantan Barat", "Kalimantan Tengah",
+        "Kalimantan Selatan", "Kalimantan Timur", "Kalimantan Utara", "Sulawesi Utara",
+        "Sulawesi Tengah", "Sulawesi Selatan", "Sulawesi Tenggara", "Gorontalo",
+        "Sulawesi Barat"
+    ]
+    
+    eastern_indonesia = ["Maluku", "Maluku Utara", "Papua Barat", "Papua"]
+    
+    def get_region(province):
+        if province in western_indonesia:
+            return "Indonesia Barat"
+        elif province in central_indonesia:
+            return "Indonesia Tengah"
+        else:
+            return "Indonesia Timur"
+    
+    df["region"] = df["province"].apply(get_region)
+    
+    return df
+
+@memoize
+def load_placement_opportunities(seed=None):
+    """
+    Load SPPI placement opportunities
+
+    Parameters:
+    - seed: random seed of the simulated opportunities (None for BASE_DATA_SEED)
+    """
+    random = np.random.RandomState(BASE_DATA_SEED if seed is None else seed)
+    
+    # Creating a representative dataset based on regions in Indonesia
+    provinces = [
+        "Aceh", "Sumatera Utara", "Sumatera Barat", "Riau", "Jambi", "Sumatera Selatan",
+        "Bengkulu", "Lampung", "Kepulauan Bangka Belitung", "Kepulauan Riau", "DKI Jakarta",
+        "Jawa Barat", "Jawa Tengah", "DI Yogyakarta", "Jawa Timur", "Banten", "Bali",
+        "Nusa Tenggara Barat", "Nusa Tenggara Timur", "Kalimantan Barat", "Kalimantan Tengah",
+        "Kalimantan Selatan", "Kalimantan Timur", "Kalimantan Utara", "Sulawesi Utara",
+        "Sulawesi Tengah", "Sulawesi Selatan", "Sulawesi Tenggara", "Gorontalo",
+        "Sulawesi Barat", "Maluku", "Maluku Utara", "Papua Barat", "Papua"
+    ]
+    
+    specializations = [
+        "Nutritionist", "Community Health", "Food Science", "Maternal & Child Nutrition",
+        "Public Health", "Dietetics", "Health Education", "Food Security"
+    ]
+    
+    # Create empty list to hold all placement opportunities
+    opportunities = []
+    
+    # Generate placement opportunities for each province
+    for province in provinces:
+        # Determine number of opportunities per province (more for high-need areas)
+        if province in ["Papua", "Papua Barat", "Maluku", "Nusa Tenggara Timur", "Aceh"]:
+            num_opportunities = random.randint(30, 50)
+        elif province in ["DKI Jakarta", "Jawa Barat", "Jawa Timur", "Jawa Tengah"]:
+            num_opportunities = random.randint(15, 30)
+        else:
+            num_opportunities = random.randint(10, 25)
+            
+        for i in range(num_opportunities):
+            opportunities.append({
+                "province": province,
+                "district": f"District {i+1} {province}",
+                "specialization": random.choice(specializations),
+                "positions_available": random.randint(1, 5),
+                "priority_level": random.randint(1, 6),  # 1-5 priority level (5 being highest)
+                "remote_area": random.choice([True, False], p=[0.3, 0.7]),
+                "housing_provided": random.choice([True, False], p=[0.7, 0.3]),
+                "latitude": random.uniform(-10, 6) if province in ["Papua", "Maluku", "Sulawesi Selatan"] else random.uniform(-8, 5),
+                "longitude": random.uniform(95, 140),
+                "stipend_level": random.choice(["Basic", "Medium", "Enhanced"], p=[0.2, 0.6, 0.2])
+            })
+    
+    # Convert to DataFrame
+    df = pd.DataFrame(opportunities)
+    
+    return df
+
+@memoize
+def load_applicant_pool(n_applicants=20000, seed=2025):
+    """
+    Load a simulated pool of SPPI applicants
+    In production this would come from the registration portal; the pool is
+    generated around the placement locations so matching can be exercised
+    at national scale
+    """
+    rng = np.random.default_rng(seed)
+    placements = load_placement_opportunities()
+    
+    specializations = sorted(placements["specialization"].unique())
+    degree_fields = [
+        "Gizi", "Kesehatan Masyarakat", "Kedokteran", "Teknologi Pangan",
+        "Keperawatan", "Biologi", "Ekonomi", "Teknik"
+    ]
+    
+    # Applicants live near an existing placement location
+    home = placements.iloc[rng.integers(0, len(placements), n_applicants)]
+    
+    df = pd.DataFrame({
+        "applicant_id": np.arange(1, n_applicants + 1),
+        "specialization": rng.choice(specializations, n_applicants),
+        "ipk": np.round(rng.normal(3.3, 0.3, n_applicants).clip(2.0, 4.0), 2),
+        "age": rng.integers(21, 31, n_applicants),
+        "degree_level": rng.choice(["S1", "D4", "D3"], n_applicants, p=[0.75, 0.15, 0.10]),
+        "degree_field": rng.choice(degree_fields, n_applicants, p=[0.3, 0.25, 0.1, 0.1, 0.1, 0.05, 0.05, 0.05]),
+        "university_accredited": rng.choice([True, False], n_applicants, p=[0.9, 0.1]),
+        "willing_remote": rng.choice([True, False], n_applicants, p=[0.6, 0.4]),
+        "home_province": home["province"].to_numpy(),
+        "latitude": home["latitude"].to_numpy() + rng.normal(0, 0.5, n_applicants),
+        "longitude": home["longitude"].to_numpy() + rng.normal(0, 0.5, n_applicants),
+        "selection_score": np.round(rng.uniform(40, 100, n_applicants), 1)
+    })
+    
+    return df
+
+@memoize
+def load_kecamatan_nutrition(seed=2025):
+    """
+    Load simulated child nutrition counts per kecamatan (sub-district)
+    Kabupaten are the placement districts of each province; village-level
+    rows are generated on demand by load_village_nutrition
+    """
+    rng = np.random.default_rng(seed)
+    nutrition = load_nutrition_data().set_index("province")
+    placements = load_placement_opportunities()
+    
+    kabupaten = placements[["province", "district"]].drop_duplicates().rename(columns={"district": "kabupaten"})
+    n_kecamatan = rng.integers(6, 15, len(kabupaten))
+    
+    df = kabupaten.loc[kabupaten.index.repeat(n_kecamatan)].reset_index(drop=True)
+    df["kecamatan"] = "Kecamatan " + (df.groupby("kabupaten").cumcount() + 1).astype(str)
+    df.insert(0, "region", nutrition.loc[df["province"], "region"].to_numpy())
+    
+    n = len(df)
+    df["villages"] = rng.integers(6, 20, n)
+    df["children_under5"] = df["villages"] * rng.integers(80, 350, n)
+    
+    # Local rates scatter around the provincial rates
+    stunting_rate = np.clip(nutrition.loc[df["province"], "stunting_percentage"].to_numpy() + rng.normal(0, 4, n), 5, 60)
+    wasting_rate = np.clip(nutrition.loc[df["province"], "wasting_percentage"].to_numpy() + rng.normal(0, 2, n), 1, 30)
+    df["stunted_children"] = rng.binomial(df["children_under5"], stunting_rate / 100)
+    df["wasted_children"] = rng.binomial(df["children_under5"], wasting_rate / 100)
+    df["stunting_percentage"] = df["stunted_children"] / df["children_under5"] * 100
+    df["wasting_percentage"] = df["wasted_children"] / df["children_under5"] * 100
+    
+    return df
+
+def _split_kecamatan(row, seed):
+    """
+    Split the child counts of one kecamatan row over its villages
+    """
+    # Seeded per kecamatan, so a village is the same whenever and wherever it is opened
+    path = f"{row['province']}/{row['kabupaten']}/{row['kecamatan']}"
+    rng = np.random.default_rng([seed, zlib.crc32(path.encode("utf-8"))])
+    n = int(row["villages"])
+    
+    children = rng.multinomial(int(row["children_under5"]), rng.dirichlet(np.full(n, 4.0)))
+    stunted = rng.multivariate_hypergeometric(children, int(row["stunted_children"]))
+    wasted = rng.multivariate_hypergeometric(children, int(row["wasted_children"]))
+    
+    return children, stunted, wasted
+
+@memoize(maxsize=512)
+def load_village_nutrition(province, kabupaten, kecamatan, seed=2025):
+    """
+    Load simulated child nutrition counts per desa (village) of one kecamatan
+    Village counts add up exactly to the kecamatan totals of load_kecamatan_nutrition
+    """
+    kecamatan_data = load_kecamatan_nutrition(seed)
+    row = kecamatan_data[
+        (kecamatan_data["province"] == province) &
+        (kecamatan_data["kabupaten"] == kabupaten) &
+        (kecamatan_data["kecamatan"] == kecamatan)
+    ].iloc[0]
+    
+    n = int(row["villages"])
+    children, stunted, wasted = _split_kecamatan(row, seed)
+    
+    df = pd.DataFrame({
+        "region": row["region"],
+        "province": province,
+        "kabupaten": kabupaten,
+        "kecamatan": kecamatan,
+        "desa": [f"Desa {i + 1}" for i in range(n)],
+        "villages": 1,
+        "children_under5": children,
+        "stunted_children": stunted,
+        "wasted_children": wasted
+    })
+    
+    with np.errstate(invalid="ignore", divide="ignore"):
+        df["stunting_percentage"] = np.nan_to_num(stunted / children * 100)
+        df["wasting_percentage"] = np.nan_to_num(wasted / children * 100)
+    
+    return df
+
+@memoize
+def load_village_points(seed=2025):
+    """
+    Load every simulated village with approximate coordinates
+    Counts match load_village_nutrition; villages are scattered around their
+    province centre by kabupaten, kecamatan and village offsets, for
+    point-density maps
+    """
+    kecamatan_data = load_kecamatan_nutrition(seed)
+    province_coords = generate_indonesia_coordinates()
+    
+    counts = [_split_kecamatan(row, seed) for row in kecamatan_data.to_dict("records")]
+    villages = kecamatan_data["villages"].to_numpy()
+    
+    df = kecamatan_data.loc[kecamatan_data.index.repeat(villages), ["region", "province", "kabupaten", "kecamatan"]]
+    df = df.reset_index(drop=True)
+    df["desa"] = "Desa " + (np.arange(len(df)) - np.repeat(np.cumsum(villages) - villages, villages) + 1).astype(str)
+    df["children_under5"] = np.concatenate([children for children, _, _ in counts])
+    df["stunted_children"] = np.concatenate([stunted for _, stunted, _ in counts])
+    df["wasted_children"] = np.concatenate([wasted for _, _, wasted in counts])
+    
+    with np.errstate(invalid="ignore", divide="ignore"):
+        df["stunting_percentage"] = np.nan_to_num(df["stunted_children"] / df["children_under5"] * 100)
+        df["wasting_percentage"] = np.nan_to_num(df["wasted_children"] / df["children_under5"] * 100)
+    
+    # Hierarchical offsets (degrees): kabupaten within a province, kecamatan within a kabupaten, then villages
+    rng = np.random.default_rng([seed, 1])
+    centre = np.array([province_coords.get(province, [-2.5, 118]) for province in df["province"]])
+    kabupaten_codes = pd.factorize(df["province"] + "/" + df["kabupaten"])[0]
+    kecamatan_codes = pd.factorize(df["province"] + "/" + df["kabupaten"] + "/" + df["kecamatan"])[0]
+    offset = (
+        rng.normal(0, 0.6, (kabupaten_codes.max() + 1, 2))[kabupaten_codes] +
+        rng.normal(0, 0.12, (kecamatan_codes.max() + 1, 2))[kecamatan_codes] +
+        rng.normal(0, 0.03, (len(df), 2))
+    )
+    df["latitude"] = centre[:, 0] + offset[:, 0]
+    df["longitude"] = centre[:, 1] + offset[:, 1]
+    
+    return df
+
+@memoize
+def load_private_sector_opportunities():
+    """
+    Load private sector collaboration opportunities
+    """
+    collaboration_types = [
+        "Training & Development", "Nutritional Product Supply", "Research Partnership",
+        "Technology Support", "Funding Program", "Community Outreach", 
+        "Infrastructure Development", "Healthcare Service Provision"
+    ]
+    
+    target_regions = [
+        "Indonesia Barat", "Indonesia Tengah", "Indonesia Timur", "Nasional"
+    ]
+    
+    # Create collaboration opportunities
+    opportunities = []
+    
+    for i in range(20):
+        opportunities.append({
+            "id": i+1,
+            "collaboration_type": np.random.choice(collaboration_types),
+            "description": f"Program kerjasama {i+1} dengan sektor swasta",
+            "target_region": np.random.choice(target_regions),
+            "investment_level": np.random.choice(["Low", "Medium", "High"]),
+            "duration_months": np.random.randint(6, 36),
+            "benefits": np.random.randint(3, 8),
+            "requirements": np.random.randint(2, 6)
+        })
+    
+    # Convert to DataFrame
+    df = pd.DataFrame(opportunities)
+    
+    return df
+
+@memoize
+def load_partner_profiles(n_partners=2000, seed=2025):
+    """
+    Load simulated profiles of private-sector partners registered with SPPI
+    In production these would come from the partnership registration form
+    """
+    rng = np.random.default_rng(seed)
+    
+    sectors = [
+        "Makanan & Minuman", "Farmasi & Suplemen", "Teknologi Kesehatan", 
+        "Retail & Distribusi", "Pendidikan & Pelatihan", "Logistik & Supply Chain",
+        "Konsultan Kesehatan", "Manufaktur", "Teknologi Informasi", "Asuransi Kesehatan"
+    ]
+    opportunity_types = [
+        "Pelatihan & Pemberdayaan", "Distribusi Produk Gizi", "Riset & Pengembangan", 
+        "Teknologi & Inovasi", "Pendanaan Program", "Infrastruktur"
+    ]
+    regions = ["Indonesia Barat", "Indonesia Tengah", "Indonesia Timur", "Nasional"]
+    
+    partners = []
+    
+    for i in range(n_partners):
+        partners.append({
+            "partner_id": i + 1,
+            "company": f"Mitra {i + 1:04d}",
+            "sector": sectors[rng.integers(len(sectors))],
+            "interest_areas": list(rng.choice(opportunity_types, rng.integers(1, 4), replace=False)),
+            "preferred_regions": list(rng.choice(regions, rng.integers(1, 3), replace=False)),
+            "impact_weight": round(float(rng.uniform(0.2, 0.8)), 2)
+        })
+    
+    return pd.DataFrame(partners)
+
+@memoize
+def load_eligibility_criteria():
+    """
+    Load eligibility criteria and application resources for SPPI program
+    """
+    eligibility = {
+        "general_requirements": [
+            "Warga Negara Indonesia (WNI)",
+            "Lulusan S1/D4 dari perguruan tinggi terakreditasi",
+            "IPK minimal 3.00 dari skala 4.00",
+            "Usia maksimal 27 tahun pada saat mendaftar",
+            "Sehat jasmani dan rohani",
+            "Tidak sedang menempuh pendidikan lain",
+            "Bersedia ditempatkan di seluruh wilayah Indonesia"
+        ],
+        "nutrition_specialization_requirements": [
+            "Gelar sarjana di bidang Gizi, Kesehatan Masyarakat, Kedokteran, atau bidang terkait",
+            "Pengalaman kerja/magang di bidang kesehatan gizi menjadi nilai tambah",
+            "Memiliki pengetahuan tentang isu kesehatan gizi di Indonesia",
+            "Kemampuan komunikasi yang baik untuk edukasi masyarakat"
+        ],
+        # Machine-readable form of the requirements above, used for batch screening
+        "screening_rules": [
+            {
+                "code": "IPK_MIN",
+                "column": "ipk",
+                "op": ">=",
+                "value": 3.00,
+                "description": "IPK minimal 3.00 dari skala 4.00"
+            },
+            {
+                "code": "AGE_MAX",
+                "column": "age",
+                "op": "<=",
+                "value": 27,
+                "description": "Usia maksimal 27 tahun pada saat mendaftar"
+            },
+            {
+                "code": "DEGREE_LEVEL",
+                "column": "degree_level",
+                "op": "in",
+                "value": ["S1", "D4"],
+                "description": "Lulusan S1/D4"
+            },
+            {
+                "code": "ACCREDITED",
+                "column": "university_accredited",
+                "op": "==",
+                "value": True,
+                "description": "Perguruan tinggi terakreditasi"
+            },
+            {
+                "code": "DEGREE_FIELD",
+                "column": "degree_field",
+                "op": "in",
+                "value": ["Gizi", "Kesehatan Masyarakat", "Kedokteran", "Teknologi Pangan", "Keperawatan"],
+                "description": "Gelar di bidang Gizi, Kesehatan Masyarakat, Kedokteran, atau bidang terkait",
+                "track": "nutrition"
+            }
+        ],
+        "application_process": [
+            "Pendaftaran online melalui portal SPPI",
+            "Seleksi administrasi",
+            "Tes potensi akademik dan bahasa",
+            "Tes bidang kesehatan gizi",
+            "Wawancara dan simulasi",
+            "Pemeriksaan kesehatan",
+            "Pengumuman hasil seleksi"
+        ],
+        "documents_required": [
+            "Scan KTP asli",
+            "Scan ijazah dan transkrip nilai",
+            "Pas foto terbaru",
+            "Surat keterangan sehat dari dokter",
+            "Surat rekomendasi (opsional)",
+            "Portofolio kegiatan terkait kesehatan/gizi (jika ada)"
+        ],
+        "timeline": {
+            "registration_start": "Januari 2025",
+            "registration_end": "Maret 2025",
+            "selection_process": "April - Mei 2025",
+            "announcement": "Juni 2025",
+            "placement_start": "Agustus 2025"
+        },
+        "resources": [
+            {
+                "name": "Portal Resmi SPPI",
+                "url": "https://sppi.kemdikbud.go.id",
+                "description": "Situs resmi untuk informasi dan pendaftaran program SPPI"
+            },
+            {
+                "name": "Panduan Persiapan Seleksi",
+                "url": "https://sppi.kemdikbud.go.id/panduan",
+                "description": "Materi dan tips untuk menghadapi proses seleksi"
+            },
+            {
+                "name": "FAQ Program SPPI",
+                "url": "https://sppi.kemdikbud.go.id/faq",
+                "description": "Jawaban untuk pertanyaan yang sering diajukan"
+            },
+            {
+                "name": "Grup Telegram Pendaftar SPPI",
+                "url": "https://t.me/sppi2025",
+                "description": "Komunitas untuk berbagi informasi antarPendaftar"
+            }
+        ]
+    }
+    
+    return eligibility
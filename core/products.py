@@ -0,0 +1,347 @@
+import numpy as np
+import pandas as pd
+from core.cache import memoize
+from core.data import load_nutrition_data, load_placement_opportunities
+
+# Bump when the logic of any generator below changes; the version is part of
+# every cache key, so all sessions pick up the new outputs together
+DATA_PRODUCT_VERSION = "2025.1"
+
+# Default seed shared by the simulated data products
+DEFAULT_SEED = 2025
+
+@memoize
+def load_sector_simulation(seed=DEFAULT_SEED, version=DATA_PRODUCT_VERSION):
+    """
+    Load simulated private-sector participation per business sector
+
+    Parameters:
+    - seed: random seed of the simulation
+    - version: data product version (part of the cache key)
+
+    Returns:
+    - Pandas DataFrame with one row per sector
+    """
+    rng = np.random.default_rng(seed)
+
+    # Define sectors and their participation level
+    sectors = [
+        "Makanan & Minuman", "Farmasi & Suplemen", "Teknologi Kesehatan",
+        "Retail & Distribusi", "Pendidikan & Pelatihan", "Logistik & Supply Chain",
+        "Konsultan Kesehatan", "Manufaktur", "Teknologi Informasi", "Asuransi Kesehatan"
+    ]
+
+    data = []
+    for sector in sectors:
+        if sector in ["Makanan & Minuman", "Farmasi & Suplemen"]:
+            current_participation = int(rng.integers(40, 70))
+            potential_growth = int(rng.integers(15, 30))
+        elif sector in ["Teknologi Kesehatan", "Pendidikan & Pelatihan", "Teknologi Informasi"]:
+            current_participation = int(rng.integers(25, 45))
+            potential_growth = int(rng.integers(30, 50))
+        else:
+            current_participation = int(rng.integers(10, 35))
+            potential_growth = int(rng.integers(20, 40))
+
+        investment_level = "High" if current_participation > 50 else "Medium" if current_participation > 30 else "Low"
+
+        data.append({
+            "sector": sector,
+            "current_participation": current_participation,
+            "potential_growth": potential_growth,
+            "investment_level": investment_level,
+            "roi_score": int(rng.integers(60, 95)),
+            "impact_score": int(rng.integers(65, 98)),
+            "total_opportunities": int(rng.integers(5, 25))
+        })
+
+    return pd.DataFrame(data)
+
+@memoize
+def load_regional_opportunities(seed=DEFAULT_SEED, version=DATA_PRODUCT_VERSION):
+    """
+    Load simulated need level and business potential per region and opportunity type
+
+    Parameters:
+    - seed: random seed of the simulation
+    - version: data product version (part of the cache key)
+
+    Returns:
+    - Pandas DataFrame with one row per (region, opportunity type)
+    """
+    rng = np.random.default_rng(seed)
+
+    regions = ["Indonesia Barat", "Indonesia Tengah", "Indonesia Timur", "Nasional"]
+    opportunity_types = [
+        "Pelatihan & Pemberdayaan", "Distribusi Produk Gizi", "Riset & Pengembangan",
+        "Teknologi & Inovasi", "Pendanaan Program", "Infrastruktur"
+    ]
+
+    # (need, business potential) ranges per region
+    ranges = {
+        "Indonesia Timur": ((70, 100), (60, 90)),   # Higher need in eastern Indonesia
+        "Indonesia Barat": ((40, 70), (70, 95)),    # More business potential but lower need
+        "Indonesia Tengah": ((50, 85), (50, 80)),   # Balanced in central Indonesia
+        "Nasional": ((60, 80), (65, 85))
+    }
+
+    data = []
+    for region in regions:
+        need_range, potential_range = ranges[region]
+        for opportunity in opportunity_types:
+            need_level = int(rng.integers(*need_range))
+            business_potential = int(rng.integers(*potential_range))
+
+            # Adjust based on opportunity type
+            if opportunity in ["Distribusi Produk Gizi", "Teknologi & Inovasi"]:
+                business_potential += int(rng.integers(5, 15))
+            elif opportunity in ["Pendanaan Program", "Infrastruktur"]:
+                need_level += int(rng.integers(5, 15))
+
+            # Ensure values are in range 0-100
+            need_level = min(100, need_level)
+            business_potential = min(100, business_potential)
+
+            data.append({
+                "region": region,
+                "opportunity_type": opportunity,
+                "need_level": need_level,
+                "business_potential": business_potential,
+                "overall_score": (need_level + business_potential) / 2
+            })
+
+    return pd.DataFrame(data)
+
+@memoize
+def load_case_studies(seed=DEFAULT_SEED, version=DATA_PRODUCT_VERSION):
+    """
+    Load case studies of successful private-sector collaborations
+
+    Parameters:
+    - seed: random seed of the simulated success, ROI and impact scores
+    - version: data product version (part of the cache key)
+
+    Returns:
+    - list of case study dicts
+    """
+    rng = np.random.default_rng(seed)
+
+    case_studies = [
+        {
+            "title": "Program Fortifikasi Makanan di NTT",
+            "company": "PT Nutrisi Indonesia",
+            "sector": "Makanan & Minuman",
+            "region": "Indonesia Timur",
+            "investment": "Rp 5 Miliar",
+            "duration": "24 bulan",
+            "impact": [
+                "15,000 keluarga menerima produk fortifikasi",
+                "Penurunan 22% kasus anemia pada anak",
+                "50 tenaga kesehatan lokal dilatih"
+            ],
+            "business_benefits": [
+                "Pengembangan pasar baru di Indonesia Timur",
+                "Peningkatan citra perusahaan sebagai pioneer nutrisi",
+                "Pembelajaran untuk inovasi produk baru"
+            ]
+        },
+        {
+            "title": "Aplikasi Monitoring Gizi untuk SPPI",
+            "company": "TechHealth Indonesia",
+            "sector": "Teknologi Informasi",
+            "region": "Nasional",
+            "investment": "Rp 3.5 Miliar",
+            "duration": "18 bulan",
+            "impact": [
+                "Pemantauan real-time 50,000 anak balita",
+                "Peningkatan 35% dalam deteksi dini masalah gizi",
+                "Data analytics untuk perbaikan program gizi"
+            ],
+            "business_benefits": [
+                "Ekspansi ke pasar kesehatan publik",
+                "Akuisisi data untuk pengembangan AI kesehatan",
+                "Kontrak jangka panjang dengan pemerintah"
+            ]
+        },
+        {
+            "title": "Program Pelatihan Fasilitator Gizi",
+            "company": "EduHealth Consortium",
+            "sector": "Pendidikan & Pelatihan",
+            "region": "Indonesia Barat",
+            "investment": "Rp 2 Miliar",
+            "duration": "12 bulan",
+            "impact": [
+                "500 fasilitator gizi terlatih",
+                "Jangkauan program ke 200+ desa",
+                "Pengembangan kurikulum gizi berbasis kearifan lokal"
+            ],
+            "business_benefits": [
+                "Pengakuan sebagai penyedia pelatihan kesehatan terkemuka",
+                "Sertifikasi dan akreditasi nasional",
+                "Pipeline talent untuk rekrutmen"
+            ]
+        }
+    ]
+
+    # Scores shown next to each case study
+    for case in case_studies:
+        case["success_score"] = int(rng.integers(75, 98))
+        case["roi_score"] = int(rng.integers(70, 95))
+        case["impact_score"] = int(rng.integers(75, 98))
+
+    return case_studies
+
+# Standard deviation of the simulated model noise on the base formasi needs
+FORMASI_NOISE_SD = 5
+
+def formasi_need_model(stunting, wasting, health_workers, priority_level, noise):
+    """
+    Formasi needed per province from its nutrition indicators
+
+    Works on scalars as well as numpy arrays, so the same model drives the
+    point predictions and the Monte Carlo draws.
+
+    Parameters:
+    - stunting, wasting: prevalence in percent
+    - health_workers: health workers per 1000 inhabitants
+    - priority_level: priority level 1-5
+    - noise: model noise added to the base needs
+
+    Returns:
+    - formasi needed, between 10 and 100
+    """
+    # Higher stunting and wasting lead to higher formasi needs
+    stunting_factor = stunting / 20  # normalize
+    wasting_factor = wasting / 10  # normalize
+
+    # Fewer health workers increases needs
+    inverse_health_worker = np.maximum(0, 5 - health_workers)
+    health_worker_factor = inverse_health_worker / 5  # normalize
+
+    # Basic needs with some randomness for simulation
+    base_needs = np.trunc(20 + stunting_factor * 30 + wasting_factor * 20 + health_worker_factor * 25 + noise)
+
+    # Adjust based on priority level, within a reasonable range
+    priority_adjustment = priority_level / 3
+    return np.clip(np.trunc(base_needs * priority_adjustment), 10, 100).astype(int)
+
+@memoize
+def load_formasi_predictions(seed=DEFAULT_SEED, version=DATA_PRODUCT_VERSION):
+    """
+    Load predicted formasi needs per province
+    This would typically come from machine learning models in production
+
+    The model noise is drawn from seed; the nutrition and placement tables
+    it builds on are seeded by core.data.BASE_DATA_SEED, so the predictions
+    are the same in every process.
+
+    Parameters:
+    - seed: random seed of the simulated model noise
+    - version: data product version (part of the cache key)
+
+    Returns:
+    - Pandas DataFrame with one row per province
+    """
+    rng = np.random.default_rng(seed)
+    nutrition_data = load_nutrition_data()
+    placement_data = load_placement_opportunities()
+
+    current_by_province = placement_data.groupby("province")["positions_available"].sum()
+
+    predictions = []
+    for _, province_nutrition in nutrition_data.drop_duplicates("province").iterrows():
+        province = province_nutrition["province"]
+
+        formasi_needed = int(formasi_need_model(
+            province_nutrition["stunting_percentage"],
+            province_nutrition["wasting_percentage"],
+            province_nutrition["health_workers_per_1000"],
+            province_nutrition["priority_level"],
+            rng.normal(0, FORMASI_NOISE_SD)
+        ))
+
+        current_placements = int(current_by_province.get(province, 0))
+        gap = formasi_needed - current_placements
+
+        # Private sector opportunity score (higher when gap is higher)
+        private_opportunity = int(np.clip(int(gap / 10) + rng.integers(1, 5), 1, 10))
+
+        # Required skills based on indicators
+        if province_nutrition["stunting_percentage"] > 25:
+            primary_need = "Specialist Gizi Anak"
+        elif province_nutrition["wasting_percentage"] > 12:
+            primary_need = "Nutritionist Klinis"
+        elif province_nutrition["obesity_percentage"] > 20:
+            primary_need = "Edukator Gizi"
+        elif province_nutrition["anemia_percentage"] > 30:
+            primary_need = "Specialist Gizi Maternal"
+        else:
+            primary_need = "Public Health Nutritionist"
+
+        predictions.append({
+            "province": province,
+            "region": province_nutrition["region"],
+            "formasi_needed": formasi_needed,
+            "current_placements": current_placements,
+            "gap": gap,
+            "primary_need": primary_need,
+            "priority_level": province_nutrition["priority_level"],
+            "private_sector_opportunity": private_opportunity
+        })
+
+    return pd.DataFrame(predictions)
+
+@memoize(maxsize=32)
+def simulate_formasi_intervals(n_draws=1000, quantiles=(0.05, 0.5, 0.95), seed=DEFAULT_SEED,
+                               version=DATA_PRODUCT_VERSION):
+    """
+    Monte Carlo prediction intervals for the formasi needs per province
+
+    The model noise of load_formasi_predictions is redrawn n_draws times for
+    all provinces at once, giving the spread of formasi_needed and gap.
+
+    Parameters:
+    - n_draws: number of Monte Carlo draws
+    - quantiles: quantiles to report, e.g. (0.05, 0.5, 0.95)
+    - seed: random seed of the draws
+    - version: data product version (part of the cache key)
+
+    Returns:
+    - Pandas DataFrame with one row per province, the mean and one column per
+      quantile (e.g. formasi_needed_p5) for formasi_needed and gap
+    """
+    rng = np.random.default_rng(seed)
+    nutrition_data = load_nutrition_data().drop_duplicates("province")
+    placement_data = load_placement_opportunities()
+
+    current = (
+        placement_data.groupby("province")["positions_available"].sum()
+        .reindex(nutrition_data["province"], fill_value=0).to_numpy()
+    )
+
+    # Draws x provinces
+    needed = formasi_need_model(
+        nutrition_data["stunting_percentage"].to_numpy(),
+        nutrition_data["wasting_percentage"].to_numpy(),
+        nutrition_data["health_workers_per_1000"].to_numpy(),
+        nutrition_data["priority_level"].to_numpy(),
+        rng.normal(0, FORMASI_NOISE_SD, (n_draws, len(nutrition_data)))
+    )
+    draws = {"formasi_needed": needed, "gap": needed - current}
+
+    intervals = nutrition_data[["province", "region"]].reset_index(drop=True)
+    for measure, values in draws.items():
+        intervals[f"{measure}_mean"] = values.mean(axis=0)
+        for q, column in zip(quantiles, np.quantile(values, quantiles, axis=0)):
+            intervals[f"{measure}_p{q * 100:g}"] = column
+
+    return intervals
+
+# Registry of the simulated data products, by name
+DATA_PRODUCTS = {
+    "sector_simulation": load_sector_simulation,
+    "regional_opportunities": load_regional_opportunities,
+    "case_studies": load_case_studies,
+    "formasi_predictions": load_formasi_predictions,
+    "formasi_intervals": simulate_formasi_intervals
+}
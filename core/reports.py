@@ -0,0 +1,175 @@
+import hashlib
+import html
+import pandas as pd
+
+# Bump when the report layout changes, so cached reports are rendered again
+REPORT_VERSION = "1"
+
+# Tables every briefing pack is rendered from
+REPORT_TABLES = ("nutrition", "placements", "predictions", "collaborations")
+
+# Indicators shown in the nutrition section: column -> (label, lower is better)
+REPORT_INDICATORS = {
+    "stunting_percentage": ("Stunting (%)", True),
+    "wasting_percentage": ("Wasting (%)", True),
+    "obesity_percentage": ("Obesitas (%)", True),
+    "anemia_percentage": ("Anemia (%)", True),
+    "exclusive_breastfeeding": ("ASI Eksklusif (%)", False),
+    "food_security_score": ("Skor Ketahanan Pangan", False),
+    "health_workers_per_1000": ("Tenaga Kesehatan per 1000", False),
+    "nutrition_centers": ("Pusat Gizi", False)
+}
+
+REPORT_STYLE = """
+body { font-family: Helvetica, Arial, sans-serif; color: #222; max-width: 900px; margin: 2em auto; }
+h1 { color: #7f2704; margin-bottom: 0; }
+h2 { border-bottom: 2px solid #fd8d3c; padding-bottom: 4px; margin-top: 1.6em; }
+table { border-collapse: collapse; width: 100%; font-size: 0.9em; }
+th, td { border: 1px solid #ddd; padding: 4px 8px; text-align: left; }
+th { background: #fff5eb; }
+.meta { color: #777; font-size: 0.85em; }
+.worse { color: #b30000; }
+.better { color: #006d2c; }
+"""
+
+def report_data_version(tables):
+    """
+    Digest of the report input tables and REPORT_VERSION
+
+    Reports are cached under this key, so a new data version renders fresh
+    packs while unchanged data keeps serving the cached ones.
+
+    Parameters:
+    - tables: dict with the REPORT_TABLES DataFrames
+
+    Returns:
+    - short hex string
+    """
+    digest = hashlib.blake2b(REPORT_VERSION.encode("utf-8"), digest_size=8)
+    for name in REPORT_TABLES:
+        table = tables[name]
+        digest.update(name.encode("utf-8"))
+        digest.update(repr(list(table.columns)).encode("utf-8"))
+        digest.update(pd.util.hash_pandas_object(table, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+def _table(df, float_format="{:,.1f}"):
+    return df.to_html(index=False, border=0, escape=True, float_format=float_format.format)
+
+def render_province_report(province, tables, data_version=None):
+    """
+    Render the HTML briefing pack of one province
+
+    The pack holds the province's nutrition indicators against the national
+    average, its formasi prediction, its placement opportunities and the
+    private sector collaborations open to its region. It is a single
+    self-contained HTML file that can be printed to PDF from a browser.
+
+    Parameters:
+    - province: province name
+    - tables: dict with the REPORT_TABLES DataFrames
+    - data_version: optional report_data_version of the tables, shown in the header
+
+    Returns:
+    - HTML string
+    """
+    nutrition = tables["nutrition"]
+    rows = nutrition[nutrition["province"] == province]
+    if rows.empty:
+        raise KeyError(f"No nutrition data for province: {province}")
+    row = rows.iloc[0]
+    region = row["region"]
+    national = nutrition[list(REPORT_INDICATORS)].mean()
+
+    # Nutrition indicators against the national average
+    indicator_rows = []
+    for column, (label, lower_is_better) in REPORT_INDICATORS.items():
+        difference = row[column] - national[column]
+        worse = difference > 0 if lower_is_better else difference < 0
+        indicator_rows.append(
+            f"<tr><td>{html.escape(label)}</td><td>{row[column]:,.1f}</td><td>{national[column]:,.1f}</td>"
+            f"<td class=\"{'worse' if worse else 'better'}\">{difference:+,.1f}</td></tr>"
+        )
+
+    # Formasi prediction
+    predictions = tables["predictions"]
+    prediction = predictions[predictions["province"] == province]
+    if prediction.empty:
+        prediction_html = "<p>Belum ada prediksi formasi untuk provinsi ini.</p>"
+    else:
+        prediction = prediction.iloc[0]
+        prediction_html = (
+            "<table>"
+            f"<tr><th>Kebutuhan Formasi</th><td>{int(prediction['formasi_needed']):,}</td></tr>"
+            f"<tr><th>Penempatan Saat Ini</th><td>{int(prediction['current_placements']):,}</td></tr>"
+            f"<tr><th>Gap</th><td>{int(prediction['gap']):,}</td></tr>"
+            f"<tr><th>Kebutuhan Utama</th><td>{html.escape(str(prediction['primary_need']))}</td></tr>"
+            f"<tr><th>Peluang Sektor Swasta</th><td>{int(prediction['private_sector_opportunity'])}/10</td></tr>"
+            "</table>"
+        )
+
+    # Placement opportunities per specialization
+    placements = tables["placements"]
+    placements = placements[placements["province"] == province]
+    if placements.empty:
+        placement_html = "<p>Belum ada peluang penempatan di provinsi ini.</p>"
+    else:
+        by_specialization = placements.groupby("specialization").agg(
+            positions=("positions_available", "sum"),
+            districts=("district", "nunique"),
+            remote=("remote_area", "mean")
+        ).reset_index().sort_values("positions", ascending=False)
+        by_specialization["remote"] = by_specialization["remote"] * 100
+        by_specialization.columns = ["Spesialisasi", "Posisi", "Kabupaten/Kota", "Daerah Terpencil (%)"]
+        placement_html = (
+            f"<p>{int(placements['positions_available'].sum()):,} posisi di "
+            f"{placements['district'].nunique()} kabupaten/kota.</p>" + _table(by_specialization)
+        )
+
+    # Collaborations open to the province's region
+    collaborations = tables["collaborations"]
+    collaborations = collaborations[collaborations["target_region"].isin([region, "Nasional"])]
+    if collaborations.empty:
+        collaboration_html = "<p>Belum ada peluang kolaborasi untuk region ini.</p>"
+    else:
+        collaboration_html = _table(
+            collaborations[["collaboration_type", "target_region", "investment_level", "duration_months"]].rename(columns={
+                "collaboration_type": "Jenis Kolaborasi",
+                "target_region": "Target",
+                "investment_level": "Investasi",
+                "duration_months": "Durasi (bulan)"
+            }),
+            float_format="{:,.0f}"
+        )
+
+    version = f" · versi data {html.escape(data_version)}" if data_version is not None else ""
+    title = html.escape(f"Paket Ringkasan SPPI 2025 - {province}")
+
+    return f"""<!DOCTYPE html>
+<html lang="id">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>{REPORT_STYLE}</style>
+</head>
+<body>
+<h1>{html.escape(province)}</h1>
+<p class="meta">{html.escape(region)} · tingkat prioritas {int(row['priority_level'])}{version}</p>
+
+<h2>Indikator Gizi</h2>
+<table>
+<tr><th>Indikator</th><th>Provinsi</th><th>Rata-rata Nasional</th><th>Selisih</th></tr>
+{''.join(indicator_rows)}
+</table>
+
+<h2>Prediksi Kebutuhan Formasi</h2>
+{prediction_html}
+
+<h2>Peluang Penempatan</h2>
+{placement_html}
+
+<h2>Peluang Kolaborasi Sektor Swasta</h2>
+{collaboration_html}
+</body>
+</html>
+"""
@@ -1,5 +1,6 @@
 import streamlit as st
 from utils.data_utils import load_program_info
+from utils.profiling import section_header, run_profiled
 
 # Page configuration
 st.set_page_config(
@@ -16,7 +17,7 @@ def main():
     program_info = load_program_info()
     
     # Program description section
-    st.header("Tentang Program SPPI 2025")
+    section_header("Tentang Program SPPI 2025")
     
     col1, col2 = st.columns([2, 1])
     
@@ -48,7 +49,7 @@ def main():
         st.image("assets/sppi_logo.svg", width=200)
     
     # Program timeline
-    st.header("Timeline Program")
+    section_header("Timeline Program")
     
     timeline_col1, timeline_col2, timeline_col3, timeline_col4, timeline_col5 = st.columns(5)
     
@@ -78,7 +79,7 @@ def main():
         st.markdown("Peserta mulai bertugas di lokasi penempatan")
     
     # Program focus
-    st.header("Fokus Kesehatan Gizi")
+    section_header("Fokus Kesehatan Gizi")
     
     st.markdown("""
     Program SPPI 2025 memberikan penekanan khusus pada kesehatan gizi untuk mengatasi tantangan kesehatan masyarakat di Indonesia.
@@ -98,7 +99,7 @@ def main():
     """)
     
     # Target areas
-    st.header("Area Target")
+    section_header("Area Target")
     
     st.markdown("""
     Program SPPI 2025 akan menempatkan peserta di seluruh wilayah Indonesia dengan prioritas pada:
@@ -112,7 +113,7 @@ def main():
     """)
     
     # Additional resources
-    st.header("Sumber Informasi Tambahan")
+    section_header("Sumber Informasi Tambahan")
     
     resources_col1, resources_col2 = st.columns(2)
     
@@ -141,7 +142,7 @@ def main():
         """)
     
     # FAQ Section
-    st.header("Pertanyaan yang Sering Diajukan (FAQ)")
+    section_header("Pertanyaan yang Sering Diajukan (FAQ)")
     
     with st.expander("Apa itu Program SPPI?"):
         st.markdown("""
@@ -192,4 +193,4 @@ def main():
         """)
 
 if __name__ == "__main__":
-    main()
+    run_profiled(main, "1_Program_Overview")
@@ -1,15 +1,23 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
-from utils.data_utils import load_nutrition_data
+from utils.data_utils import load_nutrition_data, load_kecamatan_nutrition, load_village_nutrition, load_village_points
+from utils.rollup import RollupStore, ADMIN_LEVELS
+from utils.raster import DensityRenderer
 from utils.visualization_utils import (
     create_regional_nutrition_comparison,
     create_provincial_nutrition_map,
     create_nutrition_indicators_radar,
     create_priority_level_distribution,
-    create_correlation_heatmap
+    create_correlation_heatmap,
+    display_drilldown,
+    display_figure_payloads,
+    plan_nutrition_charts,
+    plan_national_nutrition_charts
 )
-from utils.map_utils import create_nutrition_heatmap, folium_static
+from utils.map_utils import create_nutrition_heatmap, create_density_overlay_map, folium_static
+from utils.profiling import section_header, run_profiled, profiled_fragment
 
 # Page configuration
 st.set_page_config(
@@ -18,6 +26,121 @@ st.set_page_config(
     layout="wide"
 )
 
+# Rollups from region down to kecamatan shared by all sessions; villages are loaded per kecamatan on demand
+@st.cache_resource
+def get_nutrition_rollup():
+    return RollupStore(
+        load_kecamatan_nutrition(),
+        levels=ADMIN_LEVELS[:4],
+        sum_columns=['villages', 'children_under5', 'stunted_children', 'wasted_children'],
+        weighted_means={'stunting_percentage': 'children_under5', 'wasting_percentage': 'children_under5'},
+        child_level='desa',
+        child_loader=lambda path: load_village_nutrition(*path[1:])
+    )
+
+# Village points binned server-side for the density map, shared by all sessions
+@st.cache_resource
+def get_village_renderer():
+    villages = load_village_points()
+    renderer = DensityRenderer(
+        villages['longitude'],
+        villages['latitude'],
+        columns={
+            'stunted_children': villages['stunted_children'],
+            'stunting_percentage': villages['stunting_percentage']
+        }
+    )
+    return renderer, villages['province'].to_numpy()
+
+# Means, groupbys and counts behind the filtered nutrition charts, computed in one plan per filter
+@st.cache_data
+def get_nutrition_aggregates(data):
+    return plan_nutrition_charts().compute(data)
+
+# Radar rows and correlations always cover all provinces, so they are computed once
+@st.cache_data
+def get_national_aggregates():
+    return plan_national_nutrition_charts().compute(load_nutrition_data())
+
+# Only the selected tab is computed; switching tabs reruns just this section
+@profiled_fragment
+def display_map_tabs(filtered_data, by_province, selected_metric, metrics):
+    """
+    Nutrition maps (interactive, provincial and village density), one tab at a time
+    """
+    map_tab1, map_tab2, map_tab3 = st.tabs(
+        ["Peta Interaktif", "Distribusi Provinsi", "Kepadatan per Desa"],
+        key="nutrition_map_tabs",
+        on_change="rerun"
+    )
+    
+    if map_tab1.open:
+        with map_tab1:
+            st.markdown(f"Peta di bawah menunjukkan distribusi **{metrics[selected_metric]}** di seluruh Indonesia. Area merah menunjukkan daerah dengan tingkat yang lebih tinggi.")
+            nutrition_map = create_nutrition_heatmap(filtered_data)
+            folium_static(nutrition_map)
+    
+    if map_tab2.open:
+        with map_tab2:
+            st.markdown(f"Visualisasi distribusi **{metrics[selected_metric]}** berdasarkan provinsi:")
+            fig = create_provincial_nutrition_map(by_province, selected_metric)
+            st.plotly_chart(fig, use_container_width=True)
+    
+    if map_tab3.open:
+        with map_tab3:
+            renderer, village_provinces = get_village_renderer()
+            
+            # Reduction per pixel: (how, value column)
+            density_options = {
+                "Jumlah Desa": ("count", None),
+                "Jumlah Balita Stunting": ("sum", "stunted_children"),
+                "Rata-rata Prevalensi Stunting (%)": ("mean", "stunting_percentage")
+            }
+            density_metric = st.selectbox("Tampilkan", options=list(density_options.keys()), key="village_density_metric")
+            how, column = density_options[density_metric]
+            
+            # The view extent follows the provinces selected in the sidebar
+            in_view = np.isin(village_provinces, filtered_data['province'].unique())
+            if in_view.any():
+                raster = renderer.render(renderer.bounds(in_view), width=800, height=500, how=how, column=column)
+                st.markdown(f"Setiap piksel merangkum desa di wilayahnya; **{raster['points']:,}** desa dirender di server sebagai satu gambar.")
+                folium_static(create_density_overlay_map(raster), width=None)
+                st.caption(f"Warna lebih gelap menunjukkan nilai lebih tinggi (skala ekualisasi histogram, maksimum per piksel {raster['max']:,.1f}).")
+            else:
+                st.info("Pilih minimal satu provinsi untuk menampilkan peta kepadatan.")
+
+# Only the selected tab is computed; switching tabs reruns just this section
+@profiled_fragment
+def display_indicator_tabs(national_aggregates):
+    """
+    Radar comparison and indicator correlations, one tab at a time
+    """
+    indicator_tab1, indicator_tab2 = st.tabs(
+        ["Perbandingan Radar", "Korelasi Indikator"],
+        key="nutrition_indicator_tabs",
+        on_change="rerun"
+    )
+    
+    if indicator_tab1.open:
+        with indicator_tab1:
+            st.markdown("Diagram radar di bawah ini membandingkan beberapa indikator gizi untuk provinsi-provinsi utama:")
+            radar_chart = create_nutrition_indicators_radar(national_aggregates['radar_rows'])
+            st.plotly_chart(radar_chart, use_container_width=True)
+    
+    if indicator_tab2.open:
+        with indicator_tab2:
+            st.markdown("Matrik korelasi di bawah ini menunjukkan hubungan antar berbagai indikator gizi:")
+            corr_fig = create_correlation_heatmap(national_aggregates['correlation'])
+            st.pyplot(corr_fig)
+            
+            st.markdown("""
+            **Interpretasi Korelasi:**
+            
+            - Nilai positif mendekati 1 menunjukkan korelasi positif kuat
+            - Nilai negatif mendekati -1 menunjukkan korelasi negatif kuat
+            - Nilai mendekati 0 menunjukkan korelasi lemah atau tidak ada korelasi
+            """)
+
 def main():
     # Header
     st.title("Data Gizi Nasional")
@@ -80,50 +203,43 @@ def main():
     else:
         filtered_data = nutrition_data
     
+    aggregates = get_nutrition_aggregates(filtered_data)
+    national_aggregates = get_national_aggregates()
+    
     # Display key statistics
-    st.header("Statistik Utama")
+    section_header("Statistik Utama")
     
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        avg_stunting = filtered_data['stunting_percentage'].mean()
+        avg_stunting = aggregates['means']['stunting_percentage']
         st.metric("Rata-rata Stunting", f"{avg_stunting:.1f}%")
     
     with col2:
-        avg_wasting = filtered_data['wasting_percentage'].mean()
+        avg_wasting = aggregates['means']['wasting_percentage']
         st.metric("Rata-rata Wasting", f"{avg_wasting:.1f}%")
     
     with col3:
-        avg_obesity = filtered_data['obesity_percentage'].mean()
+        avg_obesity = aggregates['means']['obesity_percentage']
         st.metric("Rata-rata Obesitas", f"{avg_obesity:.1f}%")
     
     with col4:
-        avg_anemia = filtered_data['anemia_percentage'].mean()
+        avg_anemia = aggregates['means']['anemia_percentage']
         st.metric("Rata-rata Anemia", f"{avg_anemia:.1f}%")
     
     # Map visualization
-    st.header("Peta Status Gizi")
+    section_header("Peta Status Gizi")
     
-    map_tab1, map_tab2 = st.tabs(["Peta Interaktif", "Distribusi Provinsi"])
-    
-    with map_tab1:
-        st.markdown(f"Peta di bawah menunjukkan distribusi **{metrics[selected_metric]}** di seluruh Indonesia. Area merah menunjukkan daerah dengan tingkat yang lebih tinggi.")
-        nutrition_map = create_nutrition_heatmap(filtered_data)
-        folium_static(nutrition_map)
-    
-    with map_tab2:
-        st.markdown(f"Visualisasi distribusi **{metrics[selected_metric]}** berdasarkan provinsi:")
-        fig = create_provincial_nutrition_map(filtered_data, selected_metric)
-        st.plotly_chart(fig, use_container_width=True)
+    display_map_tabs(filtered_data, aggregates['by_province'], selected_metric, metrics)
     
     # Regional comparison
-    st.header("Perbandingan Antar Region")
+    section_header("Perbandingan Antar Region")
     
-    region_chart = create_regional_nutrition_comparison(filtered_data, selected_metric)
+    region_chart = create_regional_nutrition_comparison(aggregates['by_region'], selected_metric)
     st.plotly_chart(region_chart, use_container_width=True)
     
     # Detailed provincial data
-    st.header("Data Detail per Provinsi")
+    section_header("Data Detail per Provinsi")
     
     col1, col2 = st.columns([2, 1])
     
@@ -160,7 +276,7 @@ def main():
     with col2:
         # Display priority level distribution
         st.subheader("Distribusi Tingkat Prioritas")
-        priority_chart = create_priority_level_distribution(filtered_data)
+        priority_chart = create_priority_level_distribution(aggregates['priority_counts'])
         st.plotly_chart(priority_chart, use_container_width=True)
         
         st.markdown("""
@@ -171,30 +287,64 @@ def main():
         """)
     
     # Multi-indicator analysis
-    st.header("Analisis Multi-Indikator")
+    section_header("Analisis Multi-Indikator")
     
-    indicator_tab1, indicator_tab2 = st.tabs(["Perbandingan Radar", "Korelasi Indikator"])
+    display_indicator_tabs(national_aggregates)
     
-    with indicator_tab1:
-        st.markdown("Diagram radar di bawah ini membandingkan beberapa indikator gizi untuk provinsi-provinsi utama:")
-        radar_chart = create_nutrition_indicators_radar(nutrition_data)
-        st.plotly_chart(radar_chart, use_container_width=True)
+    # Drill-down from region to village
+    section_header("Telusur Data Gizi hingga Tingkat Desa")
     
-    with indicator_tab2:
-        st.markdown("Matrik korelasi di bawah ini menunjukkan hubungan antar berbagai indikator gizi:")
-        corr_fig = create_correlation_heatmap(nutrition_data)
-        st.pyplot(corr_fig)
-        
-        st.markdown("""
-        **Interpretasi Korelasi:**
-        
-        - Nilai positif mendekati 1 menunjukkan korelasi positif kuat
-        - Nilai negatif mendekati -1 menunjukkan korelasi negatif kuat
-        - Nilai mendekati 0 menunjukkan korelasi lemah atau tidak ada korelasi
-        """)
+    st.markdown("""
+    Pilih region, provinsi, kabupaten/kota, dan kecamatan untuk menelusuri data gizi balita hingga 
+    tingkat desa. Pilih **Semua** untuk kembali ke tingkat di atasnya.
+    """)
+    
+    drilldown_metrics = {
+        'stunting_percentage': 'Stunting (%)',
+        'wasting_percentage': 'Wasting (%)'
+    }
+    
+    drilldown_metric = st.radio(
+        "Indikator",
+        options=list(drilldown_metrics.keys()),
+        format_func=lambda x: drilldown_metrics[x],
+        horizontal=True
+    )
+    
+    drilldown_labels = {
+        'region': 'Region',
+        'province': 'Provinsi',
+        'kabupaten': 'Kabupaten/Kota',
+        'kecamatan': 'Kecamatan',
+        'desa': 'Desa',
+        **drilldown_metrics
+    }
+    
+    nutrition_rollup = get_nutrition_rollup()
+    drill_path, drill_node, drill_children = display_drilldown(
+        nutrition_rollup, drilldown_metric, drilldown_labels, key_prefix="nutrition_drilldown"
+    )
+    
+    drill_col1, drill_col2, drill_col3, drill_col4 = st.columns(4)
+    
+    with drill_col1:
+        st.metric("Jumlah Balita", f"{int(drill_node['children_under5']):,}")
+    
+    with drill_col2:
+        st.metric("Balita Stunting", f"{int(drill_node['stunted_children']):,}")
+    
+    with drill_col3:
+        st.metric(drilldown_metrics[drilldown_metric], f"{drill_node[drilldown_metric]:.1f}%")
+    
+    with drill_col4:
+        st.metric("Jumlah Desa", f"{int(drill_node['villages']):,}")
+    
+    if drill_children is not None:
+        with st.expander(f"Lihat Data per {drilldown_labels[drill_children.columns[0]]}"):
+            st.dataframe(drill_children.drop(columns=['count']), height=300)
     
     # Table of full data
-    st.header("Tabel Data Lengkap")
+    section_header("Tabel Data Lengkap")
     
     with st.expander("Lihat Tabel Data Lengkap"):
         # Rename columns for display
@@ -228,8 +378,15 @@ def main():
         
         st.dataframe(display_df, height=400)
     
+    display_figure_payloads([
+        create_regional_nutrition_comparison,
+        create_provincial_nutrition_map,
+        create_nutrition_indicators_radar,
+        create_priority_level_distribution
+    ])
+    
     # Data insights
-    st.header("Wawasan Data")
+    section_header("Wawasan Data")
     
     st.markdown("""
     ### Kesimpulan Utama:
@@ -254,4 +411,4 @@ def main():
     """)
 
 if __name__ == "__main__":
-    main()
+    run_profiled(main, "2_Nutrition_Data")
@@ -1,9 +1,17 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-from utils.data_utils import load_placement_opportunities, load_nutrition_data
+from utils.data_utils import load_placement_opportunities, load_nutrition_data, load_applicant_pool
+from utils.matching import match_applicants
+from core.products import DATA_PRODUCT_VERSION
+from utils.search import SearchIndex
+from utils.cube import PlacementCube
+from utils.rollup import RollupStore
 from utils.map_utils import display_map_with_filters
-from utils.visualization_utils import create_specialization_distribution
+from utils.visualization_utils import create_specialization_distribution, display_drilldown, apply_large_data_mode
+from utils.figure_cache import figure_cache
+from utils.profiling import section_header, run_profiled, profiled_fragment
+from utils.views import select_rows, rank_rows, display_table_page
 
 # Page configuration
 st.set_page_config(
@@ -12,155 +20,213 @@ st.set_page_config(
     layout="wide"
 )
 
-def main():
-    # Header
-    st.title("Peluang Penempatan SPPI 2025")
-    
-    # Load data
-    placement_data = load_placement_opportunities()
-    nutrition_data = load_nutrition_data()
-    
-    # Introduction
-    st.markdown("""
-    Halaman ini menampilkan informasi tentang peluang penempatan untuk program SPPI 2025 
-    dengan fokus kesehatan gizi. Gunakan peta interaktif dan filter untuk menemukan 
-    lokasi yang sesuai dengan minat dan keahlian Anda.
-    
-    > **Catatan:** Lokasi penempatan aktual dapat berubah berdasarkan kebutuhan daerah dan hasil seleksi.
-    """)
-    
-    # Overview statistics
-    total_positions = placement_data['positions_available'].sum()
-    total_locations = len(placement_data)
-    total_provinces = placement_data['province'].nunique()
-    remote_percentage = (len(placement_data[placement_data['remote_area'] == True]) / total_locations) * 100
-    
-    st.header("Statistik Penempatan")
-    
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        st.metric("Total Posisi Tersedia", f"{total_positions:,}")
-    
-    with col2:
-        st.metric("Total Lokasi Penempatan", f"{total_locations:,}")
+# One search index shared by all sessions, updated incrementally when the data changes
+@st.cache_resource
+def get_placement_index():
+    return SearchIndex(
+        fields=['district', 'province', 'specialization', 'stipend_level'],
+        id_column='district',
+        field_weights={'province': 2.0, 'specialization': 2.0}
+    )
+
+# Placement statistics pre-aggregated once and shared by all sessions
+@st.cache_resource
+def get_placement_cube():
+    return PlacementCube(load_placement_opportunities())
+
+# Matching results shared by all sessions; min_cost takes seconds on the larger pools,
+# so each (pool size, method) is solved once per data version
+@st.cache_data(max_entries=10)
+def get_matching_result(n_applicants, method, version=DATA_PRODUCT_VERSION):
+    return match_applicants(load_applicant_pool(n_applicants), load_placement_opportunities(), method=method)
+
+# Placement rollups from region down to kabupaten/kota, shared by all sessions
+@st.cache_resource
+def get_placement_rollup():
+    placements = load_placement_opportunities().merge(
+        load_nutrition_data()[['province', 'region']], on='province'
+    )
+    return RollupStore(
+        placements.assign(locations=1),
+        levels=['region', 'province', 'district'],
+        sum_columns=['positions_available', 'locations'],
+        weighted_means={'priority_level': 'locations'}
+    )
+
+# Positions per province
+@figure_cache
+def create_province_positions_chart(province_positions):
+    fig = px.bar(
+        province_positions,
+        x='province',
+        y='positions_available',
+        color='positions_available',
+        color_continuous_scale=px.colors.sequential.Viridis,
+        title='Distribusi Posisi berdasarkan Provinsi',
+        labels={
+            'province': 'Provinsi',
+            'positions_available': 'Jumlah Posisi'
+        }
+    )
     
-    with col3:
-        st.metric("Provinsi Tercakup", f"{total_provinces} dari 34")
+    fig.update_layout(
+        xaxis_tickangle=-45,
+        height=500
+    )
     
-    with col4:
-        st.metric("Lokasi Area Terpencil", f"{remote_percentage:.1f}%")
+    return fig
+
+# Stunting rate against positions per province
+@figure_cache
+def create_stunting_positions_chart(merged_data):
+    fig = px.scatter(
+        merged_data,
+        x='stunting_percentage',
+        y='positions_available',
+        color='positions_available',
+        size='positions_available',
+        hover_name='province',
+        title='Korelasi antara Tingkat Stunting dan Jumlah Posisi',
+        labels={
+            'stunting_percentage': 'Persentase Stunting',
+            'positions_available': 'Jumlah Posisi'
+        }
+    )
     
-    # Interactive map with filters
-    display_map_with_filters(placement_data, "placement_page")
+    return apply_large_data_mode(fig)
+
+# Positions per priority level
+@figure_cache
+def create_priority_positions_chart(priority_positions):
+    fig = px.pie(
+        priority_positions,
+        values='positions_available',
+        names='priority_level',
+        title='Distribusi Posisi berdasarkan Tingkat Prioritas',
+        color='priority_level',
+        color_discrete_sequence=px.colors.sequential.RdBu_r,
+        hole=0.4
+    )
     
-    # Distribution of positions
-    st.header("Distribusi Posisi")
+    fig.update_layout(
+        height=500,
+        annotations=[dict(text='Tingkat<br>Prioritas', x=0.5, y=0.5, font_size=20, showarrow=False)]
+    )
     
-    dist_tab1, dist_tab2, dist_tab3 = st.tabs(["Berdasarkan Spesialisasi", "Berdasarkan Provinsi", "Berdasarkan Prioritas"])
+    return fig
+
+# Only the selected tab is computed; switching tabs reruns just this section
+@profiled_fragment
+def display_distribution_tabs(placement_cube, nutrition_data):
+    """
+    Distribution of positions by specialization, province and priority level, one tab at a time
+    """
+    dist_tab1, dist_tab2, dist_tab3 = st.tabs(
+        ["Berdasarkan Spesialisasi", "Berdasarkan Provinsi", "Berdasarkan Prioritas"],
+        key="placement_distribution_tabs",
+        on_change="rerun"
+    )
     
-    with dist_tab1:
-        specialization_chart = create_specialization_distribution(placement_data)
-        st.plotly_chart(specialization_chart, use_container_width=True)
-        
-        st.markdown("""
-        **Tentang Spesialisasi:**
-        
-        Program SPPI 2025 dengan fokus kesehatan gizi membutuhkan berbagai spesialisasi untuk 
-        mengatasi tantangan gizi yang kompleks di Indonesia. Spesialisasi ini mencakup ahli gizi, 
-        kesehatan masyarakat, pendidikan kesehatan, dan bidang terkait lainnya.
-        """)
+    if dist_tab1.open:
+        with dist_tab1:
+            specialization_chart = create_specialization_distribution(placement_cube.rollup('specialization'))
+            st.plotly_chart(specialization_chart, use_container_width=True)
+            
+            st.markdown("""
+            **Tentang Spesialisasi:**
+            
+            Program SPPI 2025 dengan fokus kesehatan gizi membutuhkan berbagai spesialisasi untuk 
+            mengatasi tantangan gizi yang kompleks di Indonesia. Spesialisasi ini mencakup ahli gizi, 
+            kesehatan masyarakat, pendidikan kesehatan, dan bidang terkait lainnya.
+            """)
     
-    with dist_tab2:
-        # Group by province and sum positions
-        province_positions = placement_data.groupby('province')['positions_available'].sum().reset_index()
-        province_positions = province_positions.sort_values('positions_available', ascending=False)
-        
-        fig = px.bar(
-            province_positions,
-            x='province',
-            y='positions_available',
-            color='positions_available',
-            color_continuous_scale=px.colors.sequential.Viridis,
-            title='Distribusi Posisi berdasarkan Provinsi',
-            labels={
-                'province': 'Provinsi',
-                'positions_available': 'Jumlah Posisi'
-            }
-        )
-        
-        fig.update_layout(
-            xaxis_tickangle=-45,
-            height=500
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
-        
-        # Merge with nutrition data to show correlation
-        merged_data = province_positions.merge(
-            nutrition_data[['province', 'stunting_percentage']].groupby('province').mean(),
-            on='province'
-        )
-        
-        if not merged_data.empty:
-            correlation_fig = px.scatter(
-                merged_data,
-                x='stunting_percentage',
-                y='positions_available',
-                color='positions_available',
-                size='positions_available',
-                hover_name='province',
-                title='Korelasi antara Tingkat Stunting dan Jumlah Posisi',
-                labels={
-                    'stunting_percentage': 'Persentase Stunting',
-                    'positions_available': 'Jumlah Posisi'
-                }
+    if dist_tab2.open:
+        with dist_tab2:
+            # Group by province and sum positions
+            province_positions = placement_cube.rollup('province')[['province', 'positions_available']]
+            province_positions = province_positions.sort_values('positions_available', ascending=False)
+            
+            st.plotly_chart(create_province_positions_chart(province_positions), use_container_width=True)
+            
+            # Merge with nutrition data to show correlation
+            merged_data = province_positions.merge(
+                nutrition_data[['province', 'stunting_percentage']].groupby('province').mean(),
+                on='province'
             )
             
-            st.plotly_chart(correlation_fig, use_container_width=True)
+            if not merged_data.empty:
+                st.plotly_chart(create_stunting_positions_chart(merged_data), use_container_width=True)
+                
+                st.markdown("""
+                **Insight:** 
+                Grafik di atas menunjukkan bagaimana alokasi posisi SPPI 2025 berkorelasi dengan 
+                tingkat stunting di setiap provinsi. Provinsi dengan tingkat stunting yang lebih 
+                tinggi cenderung mendapatkan lebih banyak posisi untuk membantu mengatasi masalah tersebut.
+                """)
+    
+    if dist_tab3.open:
+        with dist_tab3:
+            # Group by priority level and sum positions
+            priority_positions = placement_cube.rollup('priority_level')[['priority_level', 'positions_available']]
+            
+            st.plotly_chart(create_priority_positions_chart(priority_positions), use_container_width=True)
             
             st.markdown("""
-            **Insight:** 
-            Grafik di atas menunjukkan bagaimana alokasi posisi SPPI 2025 berkorelasi dengan 
-            tingkat stunting di setiap provinsi. Provinsi dengan tingkat stunting yang lebih 
-            tinggi cenderung mendapatkan lebih banyak posisi untuk membantu mengatasi masalah tersebut.
+            **Tentang Tingkat Prioritas:**
+            
+            Tingkat prioritas ditentukan berdasarkan kombinasi dari beberapa faktor, termasuk:
+            - Tingkat prevalensi stunting dan masalah gizi lainnya
+            - Ketersediaan tenaga kesehatan gizi di daerah tersebut
+            - Akses terhadap layanan kesehatan dasar
+            - Status daerah (3T: Terdepan, Terluar, Tertinggal)
+            
+            Tingkat 5 menunjukkan prioritas tertinggi, dengan kebutuhan intervensi gizi yang paling mendesak.
             """)
+
+# Drill-down selectors rerun only this section
+@profiled_fragment
+def display_placement_drilldown():
+    """
+    Drill-down of positions from region to kabupaten/kota, with the selected node's totals
+    """
+    drilldown_labels = {
+        'region': 'Region',
+        'province': 'Provinsi',
+        'district': 'Kabupaten/Kota',
+        'positions_available': 'Jumlah Posisi'
+    }
     
-    with dist_tab3:
-        # Group by priority level and sum positions
-        priority_positions = placement_data.groupby('priority_level')['positions_available'].sum().reset_index()
-        
-        fig = px.pie(
-            priority_positions,
-            values='positions_available',
-            names='priority_level',
-            title='Distribusi Posisi berdasarkan Tingkat Prioritas',
-            color='priority_level',
-            color_discrete_sequence=px.colors.sequential.RdBu_r,
-            hole=0.4
-        )
-        
-        fig.update_layout(
-            height=500,
-            annotations=[dict(text='Tingkat<br>Prioritas', x=0.5, y=0.5, font_size=20, showarrow=False)]
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
-        
-        st.markdown("""
-        **Tentang Tingkat Prioritas:**
-        
-        Tingkat prioritas ditentukan berdasarkan kombinasi dari beberapa faktor, termasuk:
-        - Tingkat prevalensi stunting dan masalah gizi lainnya
-        - Ketersediaan tenaga kesehatan gizi di daerah tersebut
-        - Akses terhadap layanan kesehatan dasar
-        - Status daerah (3T: Terdepan, Terluar, Tertinggal)
-        
-        Tingkat 5 menunjukkan prioritas tertinggi, dengan kebutuhan intervensi gizi yang paling mendesak.
-        """)
+    placement_rollup = get_placement_rollup()
+    _, drill_node, _ = display_drilldown(
+        placement_rollup, 'positions_available', drilldown_labels, key_prefix="placement_drilldown"
+    )
     
-    # Placement details
-    st.header("Detail Penempatan")
+    drill_col1, drill_col2, drill_col3 = st.columns(3)
+    
+    with drill_col1:
+        st.metric("Posisi Tersedia", f"{int(drill_node['positions_available']):,}")
+    
+    with drill_col2:
+        st.metric("Lokasi Penempatan", f"{int(drill_node['locations']):,}")
+    
+    with drill_col3:
+        st.metric("Rata-rata Tingkat Prioritas", f"{drill_node['priority_level']:.1f}/5")
+
+# Search, table filters and the detail table rerun only this section
+@profiled_fragment
+def display_placement_table(placement_data):
+    """
+    Searchable, filterable table of the placement details
+    """
+    # Full-text search over the placements
+    placement_index = get_placement_index()
+    placement_index.update(placement_data)
+    
+    search_query = st.text_input(
+        "Cari Penempatan",
+        placeholder="Contoh: papua nutrition, maluku, food security",
+        key="placement_search"
+    )
     
     # Add filters to sidebar for the detail view
     st.sidebar.header("Filter Tabel Detail")
@@ -170,7 +236,8 @@ def main():
     selected_provinces_table = st.sidebar.multiselect(
         "Pilih Provinsi untuk Tabel",
         options=provinces,
-        default=[]
+        default=[],
+        key="placement_table_province_filter"
     )
     
     # Specialization filter for table
@@ -178,7 +245,8 @@ def main():
     selected_specializations_table = st.sidebar.multiselect(
         "Pilih Spesialisasi untuk Tabel",
         options=specializations,
-        default=[]
+        default=[],
+        key="placement_table_spec_filter"
     )
     
     # Priority level filter for table
@@ -186,19 +254,22 @@ def main():
         "Tingkat Prioritas Minimum untuk Tabel",
         min_value=1,
         max_value=5,
-        value=1
+        value=1,
+        key="placement_table_priority_filter"
     )
     
-    # Apply filters for table
-    filtered_table_data = placement_data.copy()
+    # Apply filters for table (row positions into placement_data, no copies)
+    rows = select_rows(
+        placement_data,
+        isin={'province': selected_provinces_table, 'specialization': selected_specializations_table},
+        at_least={'priority_level': min_priority_table}
+    )
     
-    if selected_provinces_table:
-        filtered_table_data = filtered_table_data[filtered_table_data['province'].isin(selected_provinces_table)]
-        
-    if selected_specializations_table:
-        filtered_table_data = filtered_table_data[filtered_table_data['specialization'].isin(selected_specializations_table)]
-        
-    filtered_table_data = filtered_table_data[filtered_table_data['priority_level'] >= min_priority_table]
+    if search_query:
+        search_results, search_ms = placement_index.search(search_query, limit=len(placement_data))
+        # Keep the search ranking order
+        rows = rank_rows(placement_data, rows, 'district', search_results['district'])
+        st.caption(f"{len(search_results)} hasil pencarian dalam {search_ms:.1f} ms")
     
     # Prepare data for display
     display_columns = {
@@ -212,22 +283,169 @@ def main():
         'stipend_level': 'Tingkat Tunjangan'
     }
     
-    display_data = filtered_table_data[display_columns.keys()].copy()
-    display_data.columns = [display_columns[col] for col in display_data.columns]
-    
     # Convert boolean columns to Yes/No
-    display_data['Area Terpencil'] = display_data['Area Terpencil'].map({True: 'Ya', False: 'Tidak'})
-    display_data['Akomodasi Disediakan'] = display_data['Akomodasi Disediakan'].map({True: 'Ya', False: 'Tidak'})
+    yes_no = {True: 'Ya', False: 'Tidak'}
     
     # Show table with pagination
-    if not display_data.empty:
-        st.write(f"Menampilkan {len(display_data)} dari {len(placement_data)} penempatan")
-        st.dataframe(display_data, height=400)
+    if len(rows):
+        st.write(f"Menampilkan {len(rows)} dari {len(placement_data)} penempatan")
+        display_table_page(
+            placement_data,
+            rows,
+            display_columns,
+            key="placement_table",
+            formats={'remote_area': yes_no, 'housing_provided': yes_no}
+        )
     else:
         st.warning("Tidak ada data yang sesuai dengan filter yang dipilih")
+
+# Changing the applicant pool or matching method reruns only the simulation
+@profiled_fragment
+def display_matching_simulation(placement_cube):
+    """
+    Applicant-to-placement matching simulation with per-province fill rates
+    """
+    st.markdown("""
+    Simulasi ini mencocokkan pendaftar dengan posisi yang tersedia berdasarkan spesialisasi, 
+    kesediaan ditempatkan di area terpencil, dan jarak dari domisili. Metode **Deferred Acceptance** 
+    menghasilkan pencocokan yang stabil, sedangkan **Biaya Minimum** meminimalkan total peringkat preferensi.
+    """)
+    
+    match_col1, match_col2 = st.columns(2)
+    
+    with match_col1:
+        n_applicants = st.select_slider(
+            "Jumlah Pendaftar",
+            options=[1000, 5000, 10000, 20000, 50000],
+            value=10000,
+            key="matching_applicants"
+        )
+    
+    with match_col2:
+        match_methods = {
+            "deferred_acceptance": "Deferred Acceptance (stabil)",
+            "min_cost": "Biaya Minimum"
+        }
+        match_method = st.radio(
+            "Metode Pencocokan",
+            options=list(match_methods.keys()),
+            format_func=lambda x: match_methods[x],
+            horizontal=True,
+            key="matching_method"
+        )
+    
+    matches, match_summary = get_matching_result(n_applicants, match_method)
+    
+    match_metric1, match_metric2, match_metric3, match_metric4 = st.columns(4)
+    
+    with match_metric1:
+        st.metric("Pendaftar Tercocokkan", f"{match_summary['matched']:,} dari {match_summary['applicants']:,}")
+    
+    with match_metric2:
+        st.metric("Posisi Terisi", f"{match_summary['matched'] / max(match_summary['positions'], 1) * 100:.1f}%")
+    
+    with match_metric3:
+        st.metric("Mendapat Pilihan Pertama", f"{match_summary['first_choice_share'] * 100:.1f}%")
+    
+    with match_metric4:
+        st.metric("Rata-rata Jarak Penempatan", f"{match_summary['mean_distance_km']:.0f} km")
+    
+    province_fill = matches.dropna(subset=['province']).groupby('province').size().reset_index(name='matched')
+    province_fill = province_fill.merge(
+        placement_cube.rollup('province')[['province', 'positions_available']],
+        on='province',
+        how='right'
+    ).fillna({'matched': 0})
+    province_fill['fill_rate'] = province_fill['matched'] / province_fill['positions_available'] * 100
+    
+    fig = px.bar(
+        province_fill.sort_values('fill_rate'),
+        x='province',
+        y='fill_rate',
+        color='fill_rate',
+        color_continuous_scale=px.colors.sequential.Viridis,
+        title='Tingkat Keterisian Posisi per Provinsi',
+        labels={
+            'province': 'Provinsi',
+            'fill_rate': 'Posisi Terisi (%)'
+        }
+    )
+    
+    fig.update_layout(
+        xaxis_tickangle=-45,
+        height=450
+    )
+    
+    st.plotly_chart(fig, use_container_width=True)
+    
+    st.caption(f"Waktu komputasi pencocokan: {match_summary['elapsed_seconds']:.2f} detik")
+
+def main():
+    # Header
+    st.title("Peluang Penempatan SPPI 2025")
+    
+    # Load data
+    placement_data = load_placement_opportunities()
+    nutrition_data = load_nutrition_data()
+    
+    # Introduction
+    st.markdown("""
+    Halaman ini menampilkan informasi tentang peluang penempatan untuk program SPPI 2025 
+    dengan fokus kesehatan gizi. Gunakan peta interaktif dan filter untuk menemukan 
+    lokasi yang sesuai dengan minat dan keahlian Anda.
+    
+    > **Catatan:** Lokasi penempatan aktual dapat berubah berdasarkan kebutuhan daerah dan hasil seleksi.
+    """)
+    
+    # Overview statistics, read from the pre-aggregated cube
+    placement_cube = get_placement_cube()
+    overview = placement_cube.totals()
+    total_positions = overview['positions']
+    total_locations = overview['locations']
+    total_provinces = overview['provinces']
+    remote_percentage = overview['remote_share']
+    
+    section_header("Statistik Penempatan")
+    
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.metric("Total Posisi Tersedia", f"{total_positions:,}")
+    
+    with col2:
+        st.metric("Total Lokasi Penempatan", f"{total_locations:,}")
+    
+    with col3:
+        st.metric("Provinsi Tercakup", f"{total_provinces} dari 34")
+    
+    with col4:
+        st.metric("Lokasi Area Terpencil", f"{remote_percentage:.1f}%")
+    
+    # Interactive map with filters
+    display_map_with_filters(placement_data, "placement_page", cube=placement_cube)
+    
+    # Distribution of positions
+    section_header("Distribusi Posisi")
+    
+    display_distribution_tabs(placement_cube, nutrition_data)
+    
+    # Drill-down from region to kabupaten/kota
+    section_header("Telusur Posisi per Wilayah")
+    
+    display_placement_drilldown()
+    
+    # Placement details
+    section_header("Detail Penempatan")
+    
+    display_placement_table(placement_data)
+    
+    # Applicant-to-placement matching simulation
+    section_header("Simulasi Pencocokan Pendaftar dan Penempatan")
+    
+    display_matching_simulation(placement_cube)
     
     # Placement benefits and considerations
-    st.header("Manfaat dan Pertimbangan Penempatan")
+    section_header("Manfaat dan Pertimbangan Penempatan")
     
     benefit_col1, benefit_col2 = st.columns(2)
     
@@ -264,7 +482,7 @@ def main():
         """)
     
     # FAQ about placements
-    st.header("Pertanyaan yang Sering Diajukan tentang Penempatan")
+    section_header("Pertanyaan yang Sering Diajukan tentang Penempatan")
     
     with st.expander("Bagaimana proses penempatan ditentukan?"):
         st.markdown("""
@@ -331,4 +549,4 @@ def main():
         """)
 
 if __name__ == "__main__":
-    main()
+    run_profiled(main, "3_Placement_Opportunities")
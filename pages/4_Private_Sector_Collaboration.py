@@ -3,6 +3,9 @@ import pandas as pd
 import plotly.express as px
 from utils.data_utils import load_private_sector_opportunities
 from utils.visualization_utils import create_collaboration_types_chart
+from utils.search import SearchIndex
+from utils.profiling import section_header, run_profiled
+from utils.views import select_rows, rank_rows, display_table_page
 
 # Page configuration
 st.set_page_config(
@@ -11,6 +14,15 @@ st.set_page_config(
     layout="wide"
 )
 
+# One search index shared by all sessions, updated incrementally when the data changes
+@st.cache_resource
+def get_opportunity_index():
+    return SearchIndex(
+        fields=['description', 'collaboration_type', 'target_region', 'investment_level'],
+        id_column='id',
+        field_weights={'collaboration_type': 2.0}
+    )
+
 def main():
     # Header
     st.title("Kolaborasi Sektor Swasta")
@@ -30,7 +42,7 @@ def main():
     """)
     
     # Why collaborate
-    st.header("Mengapa Berkolaborasi dengan SPPI?")
+    section_header("Mengapa Berkolaborasi dengan SPPI?")
     
     col1, col2, col3 = st.columns(3)
     
@@ -66,7 +78,7 @@ def main():
         """)
     
     # Types of collaboration
-    st.header("Jenis Kolaborasi")
+    section_header("Jenis Kolaborasi")
     
     # Display collaboration types chart
     collaboration_chart = create_collaboration_types_chart(collaboration_data)
@@ -184,7 +196,7 @@ def main():
         """)
     
     # Success stories (placeholder for future real stories)
-    st.header("Contoh Kolaborasi Sukses")
+    section_header("Contoh Kolaborasi Sukses")
     
     success_col1, success_col2 = st.columns(2)
     
@@ -219,7 +231,7 @@ def main():
         """)
     
     # How to get involved
-    st.header("Cara Berpartisipasi")
+    section_header("Cara Berpartisipasi")
     
     st.markdown("""
     ### Langkah-langkah Menjadi Mitra SPPI 2025:
@@ -240,7 +252,16 @@ def main():
     """)
     
     # Show collaboration opportunities table
-    st.header("Daftar Peluang Kolaborasi Saat Ini")
+    section_header("Daftar Peluang Kolaborasi Saat Ini")
+    
+    # Full-text search over the opportunities
+    opportunity_index = get_opportunity_index()
+    opportunity_index.update(collaboration_data)
+    
+    search_query = st.text_input(
+        "Cari Peluang Kolaborasi",
+        placeholder="Contoh: training, pendanaan, Indonesia Timur"
+    )
     
     # Add sidebar filters for the opportunities table
     st.sidebar.header("Filter Peluang Kolaborasi")
@@ -269,21 +290,25 @@ def main():
         default=[]
     )
     
-    # Apply filters
-    filtered_opps = collaboration_data.copy()
+    # Apply filters (row positions into collaboration_data, no copies)
+    rows = select_rows(
+        collaboration_data,
+        isin={
+            'collaboration_type': selected_collab_types,
+            'target_region': selected_regions,
+            'investment_level': selected_investment_levels
+        }
+    )
     
-    if selected_collab_types:
-        filtered_opps = filtered_opps[filtered_opps['collaboration_type'].isin(selected_collab_types)]
-        
-    if selected_regions:
-        filtered_opps = filtered_opps[filtered_opps['target_region'].isin(selected_regions)]
-        
-    if selected_investment_levels:
-        filtered_opps = filtered_opps[filtered_opps['investment_level'].isin(selected_investment_levels)]
+    if search_query:
+        search_results, search_ms = opportunity_index.search(search_query, limit=len(collaboration_data))
+        # Keep the search ranking order
+        rows = rank_rows(collaboration_data, rows, 'id', search_results['id'])
+        st.caption(f"{len(search_results)} hasil pencarian dalam {search_ms:.1f} ms")
     
     # Display data if available
-    if not filtered_opps.empty:
-        # Create a display copy with better column names
+    if len(rows):
+        # Better column names for display
         display_columns = {
             'id': 'ID',
             'collaboration_type': 'Jenis Kolaborasi',
@@ -295,26 +320,28 @@ def main():
             'requirements': 'Jumlah Persyaratan'
         }
         
-        display_opps = filtered_opps.copy()
-        display_opps.columns = [display_columns.get(col, col) for col in display_opps.columns]
-        
         # Format the investment level column for better readability
         investment_map = {"Low": "Rendah", "Medium": "Menengah", "High": "Tinggi"}
-        display_opps['Tingkat Investasi'] = display_opps['Tingkat Investasi'].map(investment_map)
         
-        st.write(f"Menampilkan {len(filtered_opps)} dari {len(collaboration_data)} peluang kolaborasi")
-        st.dataframe(display_opps, height=400)
+        st.write(f"Menampilkan {len(rows)} dari {len(collaboration_data)} peluang kolaborasi")
+        display_table_page(
+            collaboration_data,
+            rows,
+            display_columns,
+            key="collaboration_table",
+            formats={'investment_level': investment_map}
+        )
         
         # Add a section to explore a specific opportunity
         st.subheader("Eksplorasi Detail Peluang")
         
         selected_id = st.selectbox(
             "Pilih ID Peluang untuk Detail Lebih Lanjut",
-            options=display_opps['ID'].tolist()
+            options=collaboration_data['id'].to_numpy()[rows].tolist()
         )
         
         if selected_id:
-            selected_opp = filtered_opps[filtered_opps['id'] == selected_id].iloc[0]
+            selected_opp = collaboration_data[collaboration_data['id'] == selected_id].iloc[0]
             
             # Create detail card
             st.markdown(f"""
@@ -419,7 +446,7 @@ def main():
         st.warning("Tidak ada peluang kolaborasi yang sesuai dengan filter yang dipilih")
     
     # Contact information
-    st.header("Kontak Kolaborasi")
+    section_header("Kontak Kolaborasi")
     
     contact_col1, contact_col2 = st.columns(2)
     
@@ -455,4 +482,4 @@ def main():
         """)
 
 if __name__ == "__main__":
-    main()
+    run_profiled(main, "4_Private_Sector_Collaboration")
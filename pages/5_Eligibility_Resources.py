@@ -1,5 +1,12 @@
+import hashlib
+import sqlite3
 import streamlit as st
-from utils.data_utils import load_eligibility_criteria
+import pandas as pd
+import plotly.express as px
+from utils.data_utils import load_eligibility_criteria, load_applicant_pool
+from utils.eligibility import screen_applicants, summarize_screening
+from utils.intake import ApplicationIntakeStore
+from utils.profiling import section_header, run_profiled
 
 # Page configuration
 st.set_page_config(
@@ -8,6 +15,27 @@ st.set_page_config(
     layout="wide"
 )
 
+# One intake store (and writer thread) shared by all sessions
+@st.cache_resource
+def get_intake_store():
+    return ApplicationIntakeStore()
+
+# Screening results and their CSV download, computed once per upload (by content digest) and track;
+# the upload itself is not hashed again by Streamlit
+@st.cache_data(max_entries=8)
+def get_screening(upload_digest, track, _upload=None):
+    rules = load_eligibility_criteria()['screening_rules']
+    if _upload is not None:
+        _upload.seek(0)
+    source = _upload if _upload is not None else load_applicant_pool()
+    
+    screening_results, screening_summary = summarize_screening(
+        screen_applicants(source, rules, track=track),
+        rules,
+        track=track
+    )
+    return screening_summary, screening_results.to_csv(index=False).encode("utf-8")
+
 def main():
     # Header
     st.title("Eligibilitas dan Sumber Daya")
@@ -27,7 +55,7 @@ def main():
     """)
     
     # Eligibility criteria
-    st.header("Kriteria Eligibilitas")
+    section_header("Kriteria Eligibilitas")
     
     criteria_col1, criteria_col2 = st.columns(2)
     
@@ -42,7 +70,7 @@ def main():
             st.markdown(f"- {requirement}")
     
     # Application process
-    st.header("Proses Aplikasi")
+    section_header("Proses Aplikasi")
     
     # Timeline visual
     timeline_data = eligibility['timeline']
@@ -85,7 +113,7 @@ def main():
             st.info(step)
     
     # Required documents
-    st.header("Dokumen yang Diperlukan")
+    section_header("Dokumen yang Diperlukan")
     
     document_cols = st.columns(2)
     
@@ -99,8 +127,127 @@ def main():
         for document in eligibility['documents_required'][half_length + len(eligibility['documents_required']) % 2:]:
             st.markdown(f"- {document}")
     
+    # Application intake form
+    section_header("Formulir Pendaftaran")
+    
+    with st.form("application_form", clear_on_submit=True):
+        form_col1, form_col2 = st.columns(2)
+        
+        with form_col1:
+            nik = st.text_input("NIK (16 digit sesuai KTP)", max_chars=16)
+            full_name = st.text_input("Nama Lengkap")
+            email = st.text_input("Email")
+            phone = st.text_input("Nomor Telepon")
+            birth_date = st.date_input("Tanggal Lahir", value=None)
+        
+        with form_col2:
+            university = st.text_input("Perguruan Tinggi")
+            degree_level = st.selectbox("Jenjang", options=["S1", "D4", "D3", "S2"])
+            degree_field = st.text_input("Bidang Studi")
+            ipk = st.number_input("IPK", min_value=0.0, max_value=4.0, value=3.0, step=0.01)
+            preferred_province = st.text_input("Provinsi Penempatan yang Diminati")
+        
+        documents = st.file_uploader(
+            "Dokumen Pendukung (KTP, ijazah, transkrip, pas foto, surat keterangan sehat)",
+            accept_multiple_files=True
+        )
+        
+        submitted = st.form_submit_button("Kirim Pendaftaran")
+    
+    if submitted:
+        document_metadata = [
+            {
+                "doc_type": document.type,
+                "file_name": document.name,
+                "size_bytes": document.size
+            }
+            for document in documents or []
+        ]
+        
+        try:
+            status = get_intake_store().submit({
+                "nik": nik,
+                "full_name": full_name,
+                "email": email,
+                "phone": phone,
+                "university": university,
+                "degree_level": degree_level,
+                "degree_field": degree_field,
+                "ipk": ipk,
+                "birth_date": birth_date.isoformat() if birth_date else None,
+                "preferred_province": preferred_province
+            }, document_metadata).result(timeout=10)
+        except TimeoutError:
+            st.error("Penyimpanan pendaftaran sedang sibuk. Silakan coba kirim kembali beberapa saat lagi.")
+        except sqlite3.Error as error:
+            st.error(f"Pendaftaran gagal disimpan: {error}")
+        else:
+            if status == "accepted":
+                st.success("Pendaftaran berhasil disimpan.")
+            elif status == "duplicate":
+                st.warning("NIK ini sudah terdaftar. Setiap NIK hanya dapat mendaftar satu kali.")
+            else:
+                st.error("NIK harus terdiri dari 16 digit angka.")
+    
+    # Batch administrative screening
+    section_header("Seleksi Administrasi Otomatis")
+    
+    st.markdown("""
+    Unggah data pendaftar (CSV atau Parquet) untuk memeriksa kelayakan administrasi secara massal. 
+    Setiap pendaftar mendapat status kelayakan beserta kode alasan untuk persyaratan yang tidak terpenuhi. 
+    Tanpa unggahan, pemeriksaan dijalankan pada data pendaftar simulasi.
+    """)
+    
+    uploaded_file = st.file_uploader("Data Pendaftar", type=["csv", "parquet"])
+    nutrition_track = st.checkbox("Terapkan persyaratan khusus bidang gizi", value=True)
+    track = "nutrition" if nutrition_track else None
+    
+    rules = eligibility['screening_rules']
+    upload_digest = hashlib.sha256(uploaded_file.getvalue()).hexdigest() if uploaded_file is not None else None
+    screening_summary, screening_csv = get_screening(upload_digest, track, uploaded_file)
+    
+    screen_col1, screen_col2, screen_col3 = st.columns(3)
+    
+    with screen_col1:
+        st.metric("Pendaftar Diperiksa", f"{screening_summary['screened']:,}")
+    
+    with screen_col2:
+        st.metric("Memenuhi Syarat", f"{screening_summary['eligible']:,}")
+    
+    with screen_col3:
+        st.metric("Waktu Pemeriksaan", f"{screening_summary['elapsed_seconds']:.2f} detik")
+    
+    rule_descriptions = {rule['code']: rule['description'] for rule in rules}
+    failures = pd.DataFrame({
+        'Persyaratan': [rule_descriptions[code] for code in screening_summary['failures']],
+        'Tidak Memenuhi': list(screening_summary['failures'].values())
+    })
+    
+    fig = px.bar(
+        failures.sort_values('Tidak Memenuhi'),
+        x='Tidak Memenuhi',
+        y='Persyaratan',
+        orientation='h',
+        title='Jumlah Pendaftar yang Tidak Memenuhi Setiap Persyaratan',
+        color_discrete_sequence=['#ff9900']
+    )
+    
+    fig.update_layout(
+        yaxis_title='',
+        height=350
+    )
+    
+    st.plotly_chart(fig, use_container_width=True)
+    
+    st.download_button(
+        "Unduh Hasil Seleksi Administrasi (CSV)",
+        data=screening_csv,
+        file_name="hasil_seleksi_administrasi.csv",
+        mime="text/csv"
+    )
+    
     # Resources
-    st.header("Sumber Daya")
+    section_header("Sumber Daya")
     
     # Format resources as clickable cards
     resource_cols = st.columns(2)
@@ -118,7 +265,7 @@ def main():
             """, unsafe_allow_html=True)
     
     # Preparation tips
-    st.header("Tips Persiapan")
+    section_header("Tips Persiapan")
     
     tip_cols = st.columns(3)
     
@@ -153,7 +300,7 @@ def main():
         """)
     
     # Selection criteria
-    st.header("Kriteria Seleksi")
+    section_header("Kriteria Seleksi")
     
     st.markdown("""
     Seleksi SPPI 2025 untuk formasi kesehatan gizi akan mempertimbangkan beberapa faktor utama:
@@ -185,7 +332,7 @@ def main():
     """)
     
     # Frequently Asked Questions
-    st.header("Pertanyaan yang Sering Diajukan (FAQ)")
+    section_header("Pertanyaan yang Sering Diajukan (FAQ)")
     
     with st.expander("Apakah ada batasan usia untuk pendaftaran?"):
         st.markdown("""
@@ -247,7 +394,7 @@ def main():
         """)
     
     # Success profiles
-    st.header("Profil Sukses Peserta SPPI")
+    section_header("Profil Sukses Peserta SPPI")
     
     profile_col1, profile_col2 = st.columns(2)
     
@@ -290,7 +437,7 @@ def main():
         """)
     
     # Final call to action
-    st.header("Mulai Perjalanan SPPI Anda")
+    section_header("Mulai Perjalanan SPPI Anda")
     
     st.markdown("""
     Jika Anda memiliki semangat untuk berkontribusi pada perbaikan gizi masyarakat Indonesia dan 
@@ -332,4 +479,4 @@ def main():
         """)
 
 if __name__ == "__main__":
-    main()
+    run_profiled(main, "5_Eligibility_Resources")
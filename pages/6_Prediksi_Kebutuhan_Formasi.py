@@ -1,9 +1,17 @@
 import streamlit as st
 import pandas as pd
-import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
-from utils.data_utils import load_nutrition_data, load_placement_opportunities
+from utils.data_utils import load_placement_opportunities, load_program_info, load_village_points
+from utils.data_products import load_formasi_predictions
+from utils.reconciliation import reconcile_hierarchy, get_level
+from utils.allocation import allocate_formasi, prepare_allocation_units
+from utils.cube import PlacementCube
+from utils.raster import DensityRenderer
+from utils.visualization_utils import create_density_map_figure, apply_large_data_mode, display_figure_payloads
+from utils.figure_cache import figure_cache
+from utils.profiling import section_header, run_profiled, profiled_fragment
+from utils.views import select_rows, sort_rows, display_table_page
 
 # Page configuration
 st.set_page_config(
@@ -12,122 +20,25 @@ st.set_page_config(
     layout="wide"
 )
 
-def main():
-    # Header
-    st.title("Prediksi Kebutuhan Formasi SPPI 2025")
-    
-    # Introduction
-    st.markdown("""
-    # Sistem Prediksi Kebutuhan Formasi SPPI 2025 - Fokus Kesehatan Gizi
-    
-    Halaman ini menyajikan model prediktif untuk kebutuhan formasi Program SPPI 2025 dalam bidang kesehatan gizi
-    berdasarkan data demografis, kesehatan, dan pendidikan. Proyeksi ini dapat membantu pemerintah dan sektor swasta
-    untuk merencanakan kolaborasi dalam mengatasi tantangan gizi nasional.
-    
-    > **Catatan:** Model prediksi ini menggunakan kombinasi data historis dan proyeksi berdasarkan indikator kesehatan terkini.
-    """)
-    
-    # Load data
-    nutrition_data = load_nutrition_data()
-    placement_data = load_placement_opportunities()
-    
-    # Create simulation data for prediction model
-    # This would typically come from machine learning models in production
-    def generate_prediction_data():
-        provinces = nutrition_data['province'].unique()
-        predictions = []
-        
-        for province in provinces:
-            province_nutrition = nutrition_data[nutrition_data['province'] == province].iloc[0]
-            
-            # Generate prediction based on nutrition indicators
-            # Higher stunting leads to higher formasi needs
-            stunting_factor = province_nutrition['stunting_percentage'] / 20  # normalize
-            
-            # Higher wasting also increases needs
-            wasting_factor = province_nutrition['wasting_percentage'] / 10  # normalize
-            
-            # Lower health workers increases needs
-            inverse_health_worker = 5 - province_nutrition['health_workers_per_1000']
-            if inverse_health_worker < 0:
-                inverse_health_worker = 0
-            health_worker_factor = inverse_health_worker / 5  # normalize
-            
-            # Calculate basic needs with some randomness for simulation
-            base_needs = int(20 + stunting_factor * 30 + wasting_factor * 20 + health_worker_factor * 25 + np.random.normal(0, 5))
-            
-            # Adjust based on priority level
-            priority_adjustment = province_nutrition['priority_level'] / 3
-            formasi_needed = int(base_needs * priority_adjustment)
-            
-            # Ensure reasonable range
-            if formasi_needed < 10:
-                formasi_needed = 10
-            if formasi_needed > 100:
-                formasi_needed = 100
-            
-            # Calculate current placements from placement data
-            current_placements = placement_data[placement_data['province'] == province]['positions_available'].sum()
-            
-            # Calculate gap
-            gap = formasi_needed - current_placements
-            
-            # Private sector opportunity score (higher when gap is higher)
-            private_opportunity = np.clip(int(gap / 10) + np.random.randint(1, 5), 1, 10)
-            
-            # Required skills based on indicators
-            if province_nutrition['stunting_percentage'] > 25:
-                primary_need = "Specialist Gizi Anak"
-            elif province_nutrition['wasting_percentage'] > 12:
-                primary_need = "Nutritionist Klinis"
-            elif province_nutrition['obesity_percentage'] > 20:
-                primary_need = "Edukator Gizi"
-            elif province_nutrition['anemia_percentage'] > 30:
-                primary_need = "Specialist Gizi Maternal"
-            else:
-                primary_need = "Public Health Nutritionist"
-            
-            # Create prediction entry
-            predictions.append({
-                'province': province,
-                'region': province_nutrition['region'],
-                'formasi_needed': formasi_needed,
-                'current_placements': current_placements,
-                'gap': gap,
-                'primary_need': primary_need,
-                'priority_level': province_nutrition['priority_level'],
-                'private_sector_opportunity': private_opportunity
-            })
-        
-        return pd.DataFrame(predictions)
-    
-    prediction_data = generate_prediction_data()
-    
-    # Metrics overview
-    st.header("Ringkasan Prediksi Kebutuhan")
-    
-    total_needed = prediction_data['formasi_needed'].sum()
-    total_gap = prediction_data['gap'].sum()
-    high_priority_provinces = len(prediction_data[prediction_data['priority_level'] >= 4])
-    
-    metrics_col1, metrics_col2, metrics_col3, metrics_col4 = st.columns(4)
-    
-    with metrics_col1:
-        st.metric("Total Kebutuhan Formasi", f"{total_needed:,}")
-    
-    with metrics_col2:
-        st.metric("Gap Penempatan Saat Ini", f"{total_gap:,}")
-    
-    with metrics_col3:
-        st.metric("Provinsi Prioritas Tinggi", f"{high_priority_provinces}")
-    
-    with metrics_col4:
-        avg_opportunity = prediction_data['private_sector_opportunity'].mean()
-        st.metric("Rata-rata Skor Peluang Swasta", f"{avg_opportunity:.1f}/10")
-    
-    # Prediction map
-    st.header("Peta Prediksi Kebutuhan Formasi")
-    
+# Placement statistics pre-aggregated once and shared by all sessions
+@st.cache_resource
+def get_placement_cube():
+    return PlacementCube(load_placement_opportunities())
+
+# Stunted children per village, binned server-side and shared by all sessions
+@st.cache_resource
+def get_stunting_renderer():
+    villages = load_village_points()
+    renderer = DensityRenderer(
+        villages['longitude'],
+        villages['latitude'],
+        columns={'stunted_children': villages['stunted_children']}
+    )
+    return renderer, villages['region'].to_numpy()
+
+# Predicted formasi needs per province on a map
+@figure_cache
+def create_prediction_map(prediction_data):
     # Create a scatter map with prediction data
     fig = px.scatter_geo(
         prediction_data,
@@ -165,176 +76,304 @@ def main():
     
     fig.update_layout(height=600)
     
-    st.plotly_chart(fig, use_container_width=True)
+    return apply_large_data_mode(fig)
+
+# Current placements and gap per region
+@figure_cache
+def create_region_needs_chart(region_needs):
+    # Create horizontal bar chart for regions
+    fig = px.bar(
+        region_needs,
+        y='region',
+        x=['current_placements', 'gap'],
+        orientation='h',
+        title='Kebutuhan Formasi dan Gap berdasarkan Region',
+        labels={
+            'value': 'Jumlah Formasi',
+            'region': 'Region',
+            'variable': 'Kategori'
+        },
+        color_discrete_map={
+            'current_placements': '#0066cc',
+            'gap': '#ff9900'
+        },
+        barmode='stack'
+    )
     
-    # Regional analysis
-    st.header("Analisis Kebutuhan berdasarkan Wilayah")
+    fig.update_layout(
+        legend=dict(
+            title='',
+            orientation='h',
+            yanchor='bottom',
+            y=1.02,
+            xanchor='right',
+            x=1
+        ),
+        yaxis_title='',
+        xaxis_title='Jumlah Formasi',
+        height=400
+    )
     
-    region_tab1, region_tab2 = st.tabs(["Kebutuhan per Region", "Distribusi Keahlian"])
+    # Update legend labels
+    newnames = {'current_placements': 'Penempatan Saat Ini', 'gap': 'Gap Kebutuhan'}
+    fig.for_each_trace(lambda t: t.update(name = newnames[t.name]))
     
-    with region_tab1:
-        # Group by region
-        region_needs = prediction_data.groupby('region')[['formasi_needed', 'current_placements', 'gap']].sum().reset_index()
-        
-        # Create horizontal bar chart for regions
-        fig = px.bar(
-            region_needs,
-            y='region',
-            x=['current_placements', 'gap'],
+    return fig
+
+# Primary skill needs per region
+@figure_cache
+def create_need_distribution_chart(prediction_data):
+    # Count primary needs by region
+    need_counts = pd.crosstab(
+        prediction_data['region'], 
+        prediction_data['primary_need']
+    ).reset_index()
+    
+    # Melt for plotting
+    need_counts_melted = pd.melt(
+        need_counts, 
+        id_vars=['region'], 
+        var_name='keahlian', 
+        value_name='jumlah'
+    )
+    
+    # Create stacked bar chart
+    fig = px.bar(
+        need_counts_melted,
+        x='region',
+        y='jumlah',
+        color='keahlian',
+        title='Distribusi Kebutuhan Keahlian berdasarkan Region',
+        labels={
+            'region': 'Region',
+            'jumlah': 'Jumlah Provinsi',
+            'keahlian': 'Keahlian Utama Dibutuhkan'
+        },
+        color_discrete_sequence=px.colors.qualitative.Set2
+    )
+    
+    fig.update_layout(
+        legend=dict(
+            title='Keahlian:',
             orientation='h',
-            title='Kebutuhan Formasi dan Gap berdasarkan Region',
-            labels={
-                'value': 'Jumlah Formasi',
-                'region': 'Region',
-                'variable': 'Kategori'
-            },
-            color_discrete_map={
-                'current_placements': '#0066cc',
-                'gap': '#ff9900'
-            },
-            barmode='stack'
-        )
-        
-        fig.update_layout(
-            legend=dict(
-                title='',
-                orientation='h',
-                yanchor='bottom',
-                y=1.02,
-                xanchor='right',
-                x=1
-            ),
-            yaxis_title='',
-            xaxis_title='Jumlah Formasi',
-            height=400
-        )
-        
-        # Update legend labels
-        newnames = {'current_placements': 'Penempatan Saat Ini', 'gap': 'Gap Kebutuhan'}
-        fig.for_each_trace(lambda t: t.update(name = newnames[t.name]))
-        
-        st.plotly_chart(fig, use_container_width=True)
-        
-        # Add explanation
-        st.markdown("""
-        **Insight:**
-        
-        Grafik di atas menunjukkan perbandingan antara penempatan saat ini dan gap kebutuhan di setiap region.
-        Region dengan gap besar memerlukan fokus lebih dalam alokasi formasi SPPI 2025 dan berpotensi untuk kolaborasi dengan sektor swasta.
-        """)
+            yanchor='bottom',
+            y=1.02,
+            xanchor='right',
+            x=1
+        ),
+        xaxis_title='',
+        height=400
+    )
     
-    with region_tab2:
-        # Count primary needs by region
-        need_counts = pd.crosstab(
-            prediction_data['region'], 
-            prediction_data['primary_need']
-        ).reset_index()
-        
-        # Melt for plotting
-        need_counts_melted = pd.melt(
-            need_counts, 
-            id_vars=['region'], 
-            var_name='keahlian', 
-            value_name='jumlah'
-        )
-        
-        # Create stacked bar chart
-        fig = px.bar(
-            need_counts_melted,
-            x='region',
-            y='jumlah',
-            color='keahlian',
-            title='Distribusi Kebutuhan Keahlian berdasarkan Region',
-            labels={
-                'region': 'Region',
-                'jumlah': 'Jumlah Provinsi',
-                'keahlian': 'Keahlian Utama Dibutuhkan'
-            },
-            color_discrete_sequence=px.colors.qualitative.Set2
+    return fig
+
+# Provinces with the largest gap
+@figure_cache
+def create_top_gap_chart(prediction_data):
+    # Sort by gap
+    top_gap = prediction_data.sort_values('gap', ascending=False).head(10)
+    
+    # Create bar chart for top 10 provinces with highest gap
+    fig = px.bar(
+        top_gap,
+        x='province',
+        y='gap',
+        color='priority_level',
+        color_continuous_scale='Reds',
+        title='10 Provinsi dengan Gap Terbesar',
+        labels={
+            'province': 'Provinsi',
+            'gap': 'Gap Kebutuhan',
+            'priority_level': 'Tingkat Prioritas'
+        }
+    )
+    
+    fig.update_layout(
+        xaxis_tickangle=-45,
+        height=400
+    )
+    
+    return fig
+
+# Private sector opportunity against the gap
+@figure_cache
+def create_gap_opportunity_chart(prediction_data):
+    # Compare gap with private sector opportunity
+    fig = px.scatter(
+        prediction_data,
+        x='gap',
+        y='private_sector_opportunity',
+        size='formasi_needed',
+        color='priority_level',
+        hover_name='province',
+        color_continuous_scale='Viridis',
+        title='Peluang Kolaborasi Sektor Swasta berdasarkan Gap',
+        labels={
+            'gap': 'Gap Kebutuhan Formasi',
+            'private_sector_opportunity': 'Skor Peluang Sektor Swasta (1-10)',
+            'priority_level': 'Tingkat Prioritas'
+        }
+    )
+    
+    fig.update_layout(height=400)
+    
+    return apply_large_data_mode(fig)
+
+# Allocated formasi and remaining gap per province
+@figure_cache
+def create_allocation_chart(allocation_df):
+    allocation_chart_data = allocation_df.sort_values('allocated_formasi', ascending=False)
+    
+    fig = px.bar(
+        allocation_chart_data,
+        x='province',
+        y=['allocated_formasi', 'unmet_gap'],
+        title='Alokasi Formasi Optimal per Provinsi',
+        labels={
+            'province': 'Provinsi',
+            'value': 'Jumlah Formasi',
+            'variable': 'Kategori'
+        },
+        color_discrete_map={
+            'allocated_formasi': '#0066cc',
+            'unmet_gap': '#ff9900'
+        },
+        barmode='stack'
+    )
+    
+    fig.update_layout(
+        xaxis_tickangle=-45,
+        height=450
+    )
+    
+    newnames = {'allocated_formasi': 'Formasi Dialokasikan', 'unmet_gap': 'Gap Tersisa'}
+    fig.for_each_trace(lambda t: t.update(name = newnames[t.name]))
+    
+    return fig
+
+# Impact areas of collaboration
+@figure_cache
+def create_impact_area_chart():
+    # Create donut chart for impact areas
+    impact_labels = ['Kesehatan', 'Edukasi', 'Teknologi', 'Penelitian', 'Infrastruktur', 'Lainnya']
+    impact_values = [30, 25, 20, 15, 7, 3]
+    
+    fig = go.Figure(data=[go.Pie(
+        labels=impact_labels,
+        values=impact_values,
+        hole=.4,
+        textinfo='label+percent',
+        marker_colors=px.colors.qualitative.Pastel
+    )])
+    
+    fig.update_layout(
+        title_text='Area Dampak Kolaborasi',
+        height=350
+    )
+    
+    return fig
+
+# Changing the region reruns only the density map
+@profiled_fragment
+def display_stunting_density():
+    """
+    Village-level density of stunted children for a selected region
+    """
+    renderer, village_regions = get_stunting_renderer()
+    density_region = st.selectbox(
+        "Wilayah",
+        options=["Seluruh Indonesia"] + sorted(set(village_regions)),
+        key="stunting_density_region"
+    )
+    in_view = None if density_region == "Seluruh Indonesia" else village_regions == density_region
+    raster = renderer.render(renderer.bounds(in_view), width=800, height=450, how="sum", column="stunted_children")
+    
+    fig = create_density_map_figure(raster, f"Jumlah Balita Stunting per Piksel ({raster['points']:,} desa)")
+    st.plotly_chart(fig, use_container_width=True)
+    st.caption("Warna lebih gelap menunjukkan konsentrasi balita stunting yang lebih tinggi (skala ekualisasi histogram).")
+
+# Allocation inputs rerun only the optimizer
+@profiled_fragment
+def display_allocation_optimizer(prediction_data, placement_cube):
+    """
+    Formasi allocation optimizer with its inputs, summary and chart
+    """
+    st.markdown("""
+    Alokasi di bawah ini membagi formasi ke setiap provinsi untuk meminimalkan gap kebutuhan 
+    yang tertimbang tingkat prioritas, dengan memperhatikan anggaran tunjangan, kapasitas akomodasi, 
+    dan jumlah minimum formasi per region.
+    """)
+    
+    program_info = load_program_info()
+    
+    alloc_col1, alloc_col2, alloc_col3 = st.columns(3)
+    
+    with alloc_col1:
+        total_positions = st.number_input(
+            "Jumlah Formasi yang Dialokasikan",
+            min_value=0,
+            max_value=program_info['estimated_positions'],
+            value=program_info['nutrition_focus_positions'],
+            step=50,
+            key="allocation_total_positions"
         )
-        
-        fig.update_layout(
-            legend=dict(
-                title='Keahlian:',
-                orientation='h',
-                yanchor='bottom',
-                y=1.02,
-                xanchor='right',
-                x=1
-            ),
-            xaxis_title='',
-            height=400
+    
+    with alloc_col2:
+        budget = st.number_input(
+            "Anggaran Tunjangan (juta Rp/tahun)",
+            min_value=0,
+            value=30000,
+            step=1000,
+            key="allocation_budget"
         )
-        
-        st.plotly_chart(fig, use_container_width=True)
-        
-        st.markdown("""
-        **Insight:**
-        
-        Grafik di atas menampilkan distribusi kebutuhan keahlian di setiap region. Perbedaan ini menunjukkan:
-        - Daerah dengan prevalensi stunting tinggi membutuhkan lebih banyak specialist gizi anak
-        - Daerah dengan prevalensi wasting tinggi memerlukan nutritionist klinis
-        - Daerah dengan tingkat obesitas tinggi membutuhkan edukator gizi
-        
-        Informasi ini dapat membantu dalam perencanaan pelatihan dan kolaborasi dengan institusi pendidikan.
-        """)
     
-    # Gap analysis and projection
-    st.header("Analisis Gap dan Proyeksi")
+    with alloc_col3:
+        region_floor = st.number_input(
+            "Formasi Minimum per Region",
+            min_value=0,
+            value=100,
+            step=10,
+            key="allocation_region_floor"
+        )
     
-    gap_col1, gap_col2 = st.columns(2)
+    allocation_units = prepare_allocation_units(prediction_data, placement_cube)
+    floors = {region: region_floor for region in allocation_units['region'].unique()}
     
-    with gap_col1:
-        # Sort by gap
-        top_gap = prediction_data.sort_values('gap', ascending=False).head(10)
-        
-        # Create bar chart for top 10 provinces with highest gap
-        fig = px.bar(
-            top_gap,
-            x='province',
-            y='gap',
-            color='priority_level',
-            color_continuous_scale='Reds',
-            title='10 Provinsi dengan Gap Terbesar',
-            labels={
-                'province': 'Provinsi',
-                'gap': 'Gap Kebutuhan',
-                'priority_level': 'Tingkat Prioritas'
-            }
+    try:
+        allocation_df, allocation_summary = allocate_formasi(
+            allocation_units,
+            total_positions=total_positions,
+            budget=budget,
+            floors=floors
         )
+    except ValueError:
+        st.warning("Batasan alokasi tidak dapat dipenuhi. Kurangi formasi minimum per region atau tambah anggaran.")
+    else:
+        summary_col1, summary_col2, summary_col3 = st.columns(3)
         
-        fig.update_layout(
-            xaxis_tickangle=-45,
-            height=400
-        )
+        with summary_col1:
+            st.metric("Formasi Teralokasi", f"{allocation_summary['allocated']:,}")
         
-        st.plotly_chart(fig, use_container_width=True)
-    
-    with gap_col2:
-        # Compare gap with private sector opportunity
-        fig = px.scatter(
-            prediction_data,
-            x='gap',
-            y='private_sector_opportunity',
-            size='formasi_needed',
-            color='priority_level',
-            hover_name='province',
-            color_continuous_scale='Viridis',
-            title='Peluang Kolaborasi Sektor Swasta berdasarkan Gap',
-            labels={
-                'gap': 'Gap Kebutuhan Formasi',
-                'private_sector_opportunity': 'Skor Peluang Sektor Swasta (1-10)',
-                'priority_level': 'Tingkat Prioritas'
-            }
-        )
+        with summary_col2:
+            st.metric("Gap Tersisa", f"{int(allocation_df['unmet_gap'].sum()):,}")
         
-        fig.update_layout(height=400)
+        with summary_col3:
+            st.metric("Anggaran Terpakai", f"Rp {allocation_summary['budget_used']:,.0f} juta")
         
+        fig = create_allocation_chart(allocation_df)
         st.plotly_chart(fig, use_container_width=True)
-    
-    # Detailed forecast table
-    st.header("Tabel Prediksi Detail")
-    
+        
+        st.caption(
+            f"Metode: {allocation_summary['method']} · "
+            f"waktu komputasi {allocation_summary['elapsed_seconds'] * 1000:.0f} ms"
+        )
+
+# Table filters rerun only the forecast table
+@profiled_fragment
+def display_prediction_table(prediction_data):
+    """
+    Filterable table of the provincial forecasts
+    """
     # Add filters for table
     st.sidebar.header("Filter Tabel Prediksi")
     
@@ -343,7 +382,8 @@ def main():
     selected_regions = st.sidebar.multiselect(
         "Region",
         options=regions,
-        default=regions
+        default=regions,
+        key="prediction_table_region_filter"
     )
     
     # Minimum gap filter
@@ -351,7 +391,8 @@ def main():
         "Gap Minimum",
         min_value=0,
         max_value=int(prediction_data['gap'].max()),
-        value=0
+        value=0,
+        key="prediction_table_gap_filter"
     )
     
     # Priority level filter
@@ -359,40 +400,179 @@ def main():
         "Tingkat Prioritas Minimum",
         min_value=1,
         max_value=5,
-        value=1
+        value=1,
+        key="prediction_table_priority_filter"
     )
     
-    # Apply filters
-    filtered_pred = prediction_data.copy()
-    
-    if selected_regions:
-        filtered_pred = filtered_pred[filtered_pred['region'].isin(selected_regions)]
-    
-    filtered_pred = filtered_pred[filtered_pred['gap'] >= min_gap]
-    filtered_pred = filtered_pred[filtered_pred['priority_level'] >= min_priority]
+    # Apply filters (row positions into prediction_data, no copies)
+    rows = select_rows(
+        prediction_data,
+        isin={'region': selected_regions},
+        at_least={'gap': min_gap, 'priority_level': min_priority}
+    )
     
     # Format data for display
-    display_pred = filtered_pred.copy()
-    display_pred.columns = [
-        'Provinsi',
-        'Region',
-        'Formasi Dibutuhkan',
-        'Penempatan Saat Ini',
-        'Gap',
-        'Kebutuhan Utama',
-        'Tingkat Prioritas',
-        'Skor Peluang Swasta'
-    ]
+    display_columns = {
+        'province': 'Provinsi',
+        'region': 'Region',
+        'formasi_needed': 'Formasi Dibutuhkan',
+        'current_placements': 'Penempatan Saat Ini',
+        'gap': 'Gap',
+        'primary_need': 'Kebutuhan Utama',
+        'priority_level': 'Tingkat Prioritas',
+        'private_sector_opportunity': 'Skor Peluang Swasta'
+    }
     
     # Show table
-    if not display_pred.empty:
-        st.write(f"Menampilkan {len(display_pred)} dari {len(prediction_data)} provinsi")
-        st.dataframe(display_pred.sort_values('Gap', ascending=False), height=400)
+    if len(rows):
+        st.write(f"Menampilkan {len(rows)} dari {len(prediction_data)} provinsi")
+        display_table_page(
+            prediction_data,
+            sort_rows(prediction_data, rows, 'gap', ascending=False),
+            display_columns,
+            key="prediction_table"
+        )
     else:
         st.warning("Tidak ada data yang sesuai dengan filter yang dipilih")
+
+# Only the selected tab is computed; switching tabs reruns just this section
+@profiled_fragment
+def display_region_tabs(hierarchy, prediction_data):
+    """
+    Regional needs and skill distribution, one tab at a time
+    """
+    region_tab1, region_tab2 = st.tabs(
+        ["Kebutuhan per Region", "Distribusi Keahlian"],
+        key="formasi_region_tabs",
+        on_change="rerun"
+    )
+    
+    if region_tab1.open:
+        with region_tab1:
+            # Regional totals from the reconciled hierarchy
+            region_needs = get_level(hierarchy, 'region')
+            
+            fig = create_region_needs_chart(region_needs)
+            st.plotly_chart(fig, use_container_width=True)
+            
+            # Add explanation
+            st.markdown("""
+            **Insight:**
+            
+            Grafik di atas menunjukkan perbandingan antara penempatan saat ini dan gap kebutuhan di setiap region.
+            Region dengan gap besar memerlukan fokus lebih dalam alokasi formasi SPPI 2025 dan berpotensi untuk kolaborasi dengan sektor swasta.
+            """)
+    
+    if region_tab2.open:
+        with region_tab2:
+            fig = create_need_distribution_chart(prediction_data)
+            st.plotly_chart(fig, use_container_width=True)
+            
+            st.markdown("""
+            **Insight:**
+            
+            Grafik di atas menampilkan distribusi kebutuhan keahlian di setiap region. Perbedaan ini menunjukkan:
+            - Daerah dengan prevalensi stunting tinggi membutuhkan lebih banyak specialist gizi anak
+            - Daerah dengan prevalensi wasting tinggi memerlukan nutritionist klinis
+            - Daerah dengan tingkat obesitas tinggi membutuhkan edukator gizi
+            
+            Informasi ini dapat membantu dalam perencanaan pelatihan dan kolaborasi dengan institusi pendidikan.
+            """)
+
+def main():
+    # Header
+    st.title("Prediksi Kebutuhan Formasi SPPI 2025")
+    
+    # Introduction
+    st.markdown("""
+    # Sistem Prediksi Kebutuhan Formasi SPPI 2025 - Fokus Kesehatan Gizi
+    
+    Halaman ini menyajikan model prediktif untuk kebutuhan formasi Program SPPI 2025 dalam bidang kesehatan gizi
+    berdasarkan data demografis, kesehatan, dan pendidikan. Proyeksi ini dapat membantu pemerintah dan sektor swasta
+    untuk merencanakan kolaborasi dalam mengatasi tantangan gizi nasional.
+    
+    > **Catatan:** Model prediksi ini menggunakan kombinasi data historis dan proyeksi berdasarkan indikator kesehatan terkini.
+    """)
+    
+    # Load data
+    placement_cube = get_placement_cube()
+    
+    # Predicted needs per province (seeded, cached and shared across sessions)
+    prediction_data = load_formasi_predictions()
+    
+    # Reconcile national, regional and provincial totals in one pass so every
+    # chart below reads from the same coherent hierarchy
+    # (add 'district' to the levels once district-level forecasts exist)
+    hierarchy = reconcile_hierarchy(
+        prediction_data,
+        levels=['region', 'province'],
+        value_columns=['formasi_needed', 'current_placements', 'gap']
+    )
+    national_totals = get_level(hierarchy, 'national').iloc[0]
+    
+    # Metrics overview
+    section_header("Ringkasan Prediksi Kebutuhan")
+    
+    total_needed = int(national_totals['formasi_needed'])
+    total_gap = int(national_totals['gap'])
+    high_priority_provinces = len(prediction_data[prediction_data['priority_level'] >= 4])
+    
+    metrics_col1, metrics_col2, metrics_col3, metrics_col4 = st.columns(4)
+    
+    with metrics_col1:
+        st.metric("Total Kebutuhan Formasi", f"{total_needed:,}")
+    
+    with metrics_col2:
+        st.metric("Gap Penempatan Saat Ini", f"{total_gap:,}")
+    
+    with metrics_col3:
+        st.metric("Provinsi Prioritas Tinggi", f"{high_priority_provinces}")
+    
+    with metrics_col4:
+        avg_opportunity = prediction_data['private_sector_opportunity'].mean()
+        st.metric("Rata-rata Skor Peluang Swasta", f"{avg_opportunity:.1f}/10")
+    
+    # Prediction map
+    section_header("Peta Prediksi Kebutuhan Formasi")
+    
+    fig = create_prediction_map(prediction_data)
+    st.plotly_chart(fig, use_container_width=True)
+    
+    # Village-level need behind the provincial predictions, rendered as one image
+    st.subheader("Sebaran Balita Stunting per Desa")
+    
+    display_stunting_density()
+    
+    # Regional analysis
+    section_header("Analisis Kebutuhan berdasarkan Wilayah")
+    
+    display_region_tabs(hierarchy, prediction_data)
+    
+    # Gap analysis and projection
+    section_header("Analisis Gap dan Proyeksi")
+    
+    gap_col1, gap_col2 = st.columns(2)
+    
+    with gap_col1:
+        fig = create_top_gap_chart(prediction_data)
+        st.plotly_chart(fig, use_container_width=True)
+    
+    with gap_col2:
+        fig = create_gap_opportunity_chart(prediction_data)
+        st.plotly_chart(fig, use_container_width=True)
+    
+    # Formasi allocation optimizer
+    section_header("Optimasi Alokasi Formasi")
+    
+    display_allocation_optimizer(prediction_data, placement_cube)
+    
+    # Detailed forecast table
+    section_header("Tabel Prediksi Detail")
+    
+    display_prediction_table(prediction_data)
     
     # Recommendations for private sector
-    st.header("Rekomendasi Kolaborasi Sektor Swasta")
+    section_header("Rekomendasi Kolaborasi Sektor Swasta")
     
     # Create recommendation cards
     recom_col1, recom_col2, recom_col3 = st.columns(3)
@@ -457,23 +637,7 @@ def main():
     benefit_col1, benefit_col2 = st.columns(2)
     
     with benefit_col1:
-        # Create donut chart for impact areas
-        impact_labels = ['Kesehatan', 'Edukasi', 'Teknologi', 'Penelitian', 'Infrastruktur', 'Lainnya']
-        impact_values = [30, 25, 20, 15, 7, 3]
-        
-        fig = go.Figure(data=[go.Pie(
-            labels=impact_labels,
-            values=impact_values,
-            hole=.4,
-            textinfo='label+percent',
-            marker_colors=px.colors.qualitative.Pastel
-        )])
-        
-        fig.update_layout(
-            title_text='Area Dampak Kolaborasi',
-            height=350
-        )
-        
+        fig = create_impact_area_chart()
         st.plotly_chart(fig, use_container_width=True)
     
     with benefit_col2:
@@ -493,8 +657,18 @@ def main():
         6. **Riset & Data**: Kesempatan memperoleh data nyata untuk penelitian dan pengembangan
         """)
     
+    display_figure_payloads([
+        create_prediction_map,
+        create_region_needs_chart,
+        create_need_distribution_chart,
+        create_top_gap_chart,
+        create_gap_opportunity_chart,
+        create_allocation_chart,
+        create_impact_area_chart
+    ])
+    
     # Next steps
-    st.header("Langkah Kolaborasi Selanjutnya")
+    section_header("Langkah Kolaborasi Selanjutnya")
     
     st.markdown("""
     ### Jalur Kemitraan SPPI 2025:
@@ -527,4 +701,4 @@ def main():
     """)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    run_profiled(main, "6_Prediksi_Kebutuhan_Formasi")
\ No newline at end of file
@@ -4,6 +4,8 @@ import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 from utils.data_utils import load_nutrition_data, load_placement_opportunities
+from utils.figure_cache import figure_cache
+from utils.profiling import section_header, run_profiled
 
 # Page configuration
 st.set_page_config(
@@ -12,6 +14,292 @@ st.set_page_config(
     layout="wide"
 )
 
+# Quality indicators of the data sources
+@figure_cache
+def create_data_quality_chart():
+    # Create data quality indicator chart
+    data_sources = ['Demografis', 'Kesehatan Gizi', 'Infrastruktur', 'Pendidikan', 'Sosial Ekonomi']
+    data_completeness = [95, 87, 78, 82, 75]
+    data_reliability = [92, 85, 75, 80, 70]
+    data_recency = [90, 88, 72, 85, 68]
+    
+    fig = go.Figure()
+    
+    fig.add_trace(go.Bar(
+        x=data_sources,
+        y=data_completeness,
+        name='Kelengkapan Data (%)',
+        marker_color='#0066cc'
+    ))
+    
+    fig.add_trace(go.Bar(
+        x=data_sources,
+        y=data_reliability,
+        name='Reliabilitas Data (%)',
+        marker_color='#00cc66'
+    ))
+    
+    fig.add_trace(go.Bar(
+        x=data_sources,
+        y=data_recency,
+        name='Kebaruan Data (%)',
+        marker_color='#cc6600'
+    ))
+    
+    fig.update_layout(
+        title='Indikator Kualitas Data',
+        xaxis_title='Sumber Data',
+        yaxis_title='Persentase (%)',
+        barmode='group',
+        height=400
+    )
+    
+    return fig
+
+# Performance of the candidate models
+@figure_cache
+def create_model_performance_chart():
+    # Create model performance comparison
+    models = ['Random Forest', 'Gradient Boosting', 'Neural Network', 'Ensemble Model']
+    precision = [0.82, 0.85, 0.79, 0.89]
+    recall = [0.80, 0.83, 0.76, 0.87]
+    f1_score = [0.81, 0.84, 0.77, 0.88]
+    
+    fig = go.Figure()
+    
+    fig.add_trace(go.Scatter(
+        x=models,
+        y=precision,
+        mode='lines+markers',
+        name='Precision',
+        line=dict(color='blue', width=2)
+    ))
+    
+    fig.add_trace(go.Scatter(
+        x=models,
+        y=recall,
+        mode='lines+markers',
+        name='Recall',
+        line=dict(color='green', width=2)
+    ))
+    
+    fig.add_trace(go.Scatter(
+        x=models,
+        y=f1_score,
+        mode='lines+markers',
+        name='F1-Score',
+        line=dict(color='red', width=2)
+    ))
+    
+    fig.update_layout(
+        title='Performa Model Prediksi',
+        xaxis_title='Model',
+        yaxis_title='Skor',
+        yaxis=dict(range=[0.7, 0.95]),
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="right",
+            x=1
+        ),
+        height=400
+    )
+    
+    return fig
+
+# Correlation between the model variables
+@figure_cache
+def create_variable_correlation_heatmap():
+    # Create correlation heatmap data
+    variables = [
+        'Stunting', 'Wasting', 'Obesitas', 'Anemia', 'ASI Eksklusif', 
+        'Ketahanan Pangan', 'Tenaga Kesehatan', 'Pusat Gizi', 
+        'Kemiskinan', 'Pendidikan Ibu', 'Akses Air Bersih'
+    ]
+    
+    # Generate a random but realistic correlation matrix
+    np.random.seed(42)  # for reproducibility
+    corr_matrix = np.zeros((len(variables), len(variables)))
+    
+    for i in range(len(variables)):
+        for j in range(len(variables)):
+            if i == j:
+                corr_matrix[i][j] = 1.0
+            else:
+                # Generate a realistic correlation value
+                if i < j:
+                    # Some pairs have strong positive correlations
+                    if (i, j) in [(0, 1), (0, 3), (1, 3), (5, 6), (8, 9)]:
+                        corr_matrix[i][j] = 0.6 + np.random.uniform(0, 0.3)
+                    # Some have strong negative correlations
+                    elif (i, j) in [(0, 4), (1, 4), (3, 4), (8, 10)]:
+                        corr_matrix[i][j] = -0.6 - np.random.uniform(0, 0.3)
+                    # Others have moderate or weak correlations
+                    else:
+                        corr_matrix[i][j] = np.random.uniform(-0.5, 0.5)
+                    corr_matrix[j][i] = corr_matrix[i][j]  # make it symmetric
+    
+    # Create heatmap
+    fig = go.Figure(data=go.Heatmap(
+        z=corr_matrix,
+        x=variables,
+        y=variables,
+        colorscale='RdBu_r',
+        zmin=-1,
+        zmax=1,
+        colorbar=dict(title='Korelasi')
+    ))
+    
+    fig.update_layout(
+        title='Korelasi antar Variabel dalam Model Prediksi',
+        height=600,
+        width=800
+    )
+    
+    return fig
+
+# Feature importance in the prediction model
+@figure_cache
+def create_feature_importance_chart():
+    # Create feature importance chart
+    features = [
+        'Tingkat Stunting', 'Rasio Tenaga Kesehatan', 'Tingkat Kemiskinan',
+        'Akses Puskesmas', 'ASI Eksklusif', 'Tingkat Anemia', 
+        'Akses Air Bersih', 'Tingkat Pendidikan', 'Ketahanan Pangan',
+        'Urbanisasi', 'Infrastruktur Kesehatan'
+    ]
+    
+    importance = [0.23, 0.18, 0.15, 0.12, 0.09, 0.08, 0.06, 0.04, 0.03, 0.01, 0.01]
+    
+    fig = px.bar(
+        x=importance,
+        y=features,
+        orientation='h',
+        title='Kepentingan Variabel dalam Model Prediksi',
+        labels={'x': 'Skor Kepentingan', 'y': 'Variabel'},
+        color=importance,
+        color_continuous_scale='Viridis'
+    )
+    
+    fig.update_layout(
+        yaxis=dict(categoryorder='total ascending'),
+        height=500
+    )
+    
+    return fig
+
+# Prediction uncertainty ranges for high-need provinces
+@figure_cache
+def create_uncertainty_chart():
+    # Create uncertainty range visualization
+    provinces = ['Papua', 'NTT', 'Maluku', 'Sulawesi Tengah', 'Kalimantan Barat']
+    central_estimates = [75, 65, 55, 45, 40]
+    
+    # Create lower and upper bounds with varying ranges to show different uncertainty levels
+    lower_bounds = [max(0, central_estimates[i] - int(10 + i*2)) for i in range(len(central_estimates))]
+    upper_bounds = [central_estimates[i] + int(10 + i*2) for i in range(len(central_estimates))]
+    
+    # Ensure no negative values
+    lower_bounds = [max(0, lb) for lb in lower_bounds]
+    
+    fig = go.Figure()
+    
+    # Add central estimates
+    fig.add_trace(go.Scatter(
+        x=provinces,
+        y=central_estimates,
+        mode='markers',
+        marker=dict(size=10, color='blue'),
+        name='Estimasi Tengah'
+    ))
+    
+    # Add error bars
+    for i in range(len(provinces)):
+        fig.add_trace(go.Scatter(
+            x=[provinces[i], provinces[i]],
+            y=[lower_bounds[i], upper_bounds[i]],
+            mode='lines',
+            line=dict(color='blue', width=1),
+            showlegend=False
+        ))
+    
+        # Add caps to the error bars
+        fig.add_trace(go.Scatter(
+            x=[provinces[i], provinces[i]],
+            y=[lower_bounds[i], lower_bounds[i]],
+            mode='lines',
+            line=dict(color='blue', width=1),
+            showlegend=False
+        ))
+    
+        fig.add_trace(go.Scatter(
+            x=[provinces[i], provinces[i]],
+            y=[upper_bounds[i], upper_bounds[i]],
+            mode='lines',
+            line=dict(color='blue', width=1),
+            showlegend=False
+        ))
+    
+    fig.update_layout(
+        title='Rentang Ketidakpastian Prediksi untuk Provinsi Terpilih',
+        xaxis_title='Provinsi',
+        yaxis_title='Formasi yang Dibutuhkan',
+        height=400
+    )
+    
+    return fig
+
+# Validation metrics of the ensemble model
+@figure_cache
+def create_validation_chart():
+    # Create validation metric chart
+    metrics = ['Accuracy', 'Precision', 'Recall', 'F1-Score', 'ROC-AUC']
+    values = [0.87, 0.85, 0.84, 0.84, 0.91]
+    
+    fig = go.Figure()
+    
+    fig.add_trace(go.Bar(
+        x=metrics,
+        y=values,
+        marker_color='#0066cc'
+    ))
+    
+    # Add threshold line for acceptable performance
+    fig.add_shape(
+        type='line',
+        x0=-0.5,
+        x1=4.5,
+        y0=0.8,
+        y1=0.8,
+        line=dict(
+            color='red',
+            width=2,
+            dash='dash'
+        )
+    )
+    
+    fig.update_layout(
+        title='Metrik Validasi Model',
+        xaxis_title='Metrik',
+        yaxis_title='Skor',
+        yaxis=dict(range=[0.7, 1.0]),
+        height=400,
+        annotations=[
+            dict(
+                x=2,
+                y=0.78,
+                xref='x',
+                yref='y',
+                text='Threshold Performa Minimum (0.8)',
+                showarrow=False,
+                font=dict(color='red')
+            )
+        ]
+    )
+    
+    return fig
+
 def main():
     # Header
     st.title("Model Prediksi dan Algoritma")
@@ -28,7 +316,7 @@ def main():
     """)
     
     # Data sources section
-    st.header("Sumber Data")
+    section_header("Sumber Data")
     
     data_col1, data_col2 = st.columns(2)
     
@@ -59,47 +347,11 @@ def main():
         """)
     
     with data_col2:
-        # Create data quality indicator chart
-        data_sources = ['Demografis', 'Kesehatan Gizi', 'Infrastruktur', 'Pendidikan', 'Sosial Ekonomi']
-        data_completeness = [95, 87, 78, 82, 75]
-        data_reliability = [92, 85, 75, 80, 70]
-        data_recency = [90, 88, 72, 85, 68]
-        
-        fig = go.Figure()
-        
-        fig.add_trace(go.Bar(
-            x=data_sources,
-            y=data_completeness,
-            name='Kelengkapan Data (%)',
-            marker_color='#0066cc'
-        ))
-        
-        fig.add_trace(go.Bar(
-            x=data_sources,
-            y=data_reliability,
-            name='Reliabilitas Data (%)',
-            marker_color='#00cc66'
-        ))
-        
-        fig.add_trace(go.Bar(
-            x=data_sources,
-            y=data_recency,
-            name='Kebaruan Data (%)',
-            marker_color='#cc6600'
-        ))
-        
-        fig.update_layout(
-            title='Indikator Kualitas Data',
-            xaxis_title='Sumber Data',
-            yaxis_title='Persentase (%)',
-            barmode='group',
-            height=400
-        )
-        
+        fig = create_data_quality_chart()
         st.plotly_chart(fig, use_container_width=True)
     
     # Model methodology
-    st.header("Metodologi Model Prediksi")
+    section_header("Metodologi Model Prediksi")
     
     st.markdown("""
     ### Pendekatan Multi-Metode
@@ -142,104 +394,13 @@ def main():
         """)
     
     with method_col2:
-        # Create model performance comparison
-        models = ['Random Forest', 'Gradient Boosting', 'Neural Network', 'Ensemble Model']
-        precision = [0.82, 0.85, 0.79, 0.89]
-        recall = [0.80, 0.83, 0.76, 0.87]
-        f1_score = [0.81, 0.84, 0.77, 0.88]
-        
-        fig = go.Figure()
-        
-        fig.add_trace(go.Scatter(
-            x=models,
-            y=precision,
-            mode='lines+markers',
-            name='Precision',
-            line=dict(color='blue', width=2)
-        ))
-        
-        fig.add_trace(go.Scatter(
-            x=models,
-            y=recall,
-            mode='lines+markers',
-            name='Recall',
-            line=dict(color='green', width=2)
-        ))
-        
-        fig.add_trace(go.Scatter(
-            x=models,
-            y=f1_score,
-            mode='lines+markers',
-            name='F1-Score',
-            line=dict(color='red', width=2)
-        ))
-        
-        fig.update_layout(
-            title='Performa Model Prediksi',
-            xaxis_title='Model',
-            yaxis_title='Skor',
-            yaxis=dict(range=[0.7, 0.95]),
-            legend=dict(
-                orientation="h",
-                yanchor="bottom",
-                y=1.02,
-                xanchor="right",
-                x=1
-            ),
-            height=400
-        )
-        
+        fig = create_model_performance_chart()
         st.plotly_chart(fig, use_container_width=True)
     
     # Key variables
-    st.header("Variabel Kunci dalam Model")
-    
-    # Create correlation heatmap data
-    variables = [
-        'Stunting', 'Wasting', 'Obesitas', 'Anemia', 'ASI Eksklusif', 
-        'Ketahanan Pangan', 'Tenaga Kesehatan', 'Pusat Gizi', 
-        'Kemiskinan', 'Pendidikan Ibu', 'Akses Air Bersih'
-    ]
-    
-    # Generate a random but realistic correlation matrix
-    np.random.seed(42)  # for reproducibility
-    corr_matrix = np.zeros((len(variables), len(variables)))
-    
-    for i in range(len(variables)):
-        for j in range(len(variables)):
-            if i == j:
-                corr_matrix[i][j] = 1.0
-            else:
-                # Generate a realistic correlation value
-                if i < j:
-                    # Some pairs have strong positive correlations
-                    if (i, j) in [(0, 1), (0, 3), (1, 3), (5, 6), (8, 9)]:
-                        corr_matrix[i][j] = 0.6 + np.random.uniform(0, 0.3)
-                    # Some have strong negative correlations
-                    elif (i, j) in [(0, 4), (1, 4), (3, 4), (8, 10)]:
-                        corr_matrix[i][j] = -0.6 - np.random.uniform(0, 0.3)
-                    # Others have moderate or weak correlations
-                    else:
-                        corr_matrix[i][j] = np.random.uniform(-0.5, 0.5)
-                    corr_matrix[j][i] = corr_matrix[i][j]  # make it symmetric
-    
-    # Create heatmap
-    fig = go.Figure(data=go.Heatmap(
-        z=corr_matrix,
-        x=variables,
-        y=variables,
-        colorscale='RdBu_r',
-        zmin=-1,
-        zmax=1,
-        colorbar=dict(title='Korelasi')
-    ))
-    
-    fig.update_layout(
-        title='Korelasi antar Variabel dalam Model Prediksi',
-        height=600,
-        width=800
-    )
+    section_header("Variabel Kunci dalam Model")
     
+    fig = create_variable_correlation_heatmap()
     st.plotly_chart(fig, use_container_width=True)
     
     st.markdown("""
@@ -253,33 +414,9 @@ def main():
     """)
     
     # Feature importance
-    st.header("Kepentingan Variabel dalam Prediksi")
-    
-    # Create feature importance chart
-    features = [
-        'Tingkat Stunting', 'Rasio Tenaga Kesehatan', 'Tingkat Kemiskinan',
-        'Akses Puskesmas', 'ASI Eksklusif', 'Tingkat Anemia', 
-        'Akses Air Bersih', 'Tingkat Pendidikan', 'Ketahanan Pangan',
-        'Urbanisasi', 'Infrastruktur Kesehatan'
-    ]
-    
-    importance = [0.23, 0.18, 0.15, 0.12, 0.09, 0.08, 0.06, 0.04, 0.03, 0.01, 0.01]
-    
-    fig = px.bar(
-        x=importance,
-        y=features,
-        orientation='h',
-        title='Kepentingan Variabel dalam Model Prediksi',
-        labels={'x': 'Skor Kepentingan', 'y': 'Variabel'},
-        color=importance,
-        color_continuous_scale='Viridis'
-    )
-    
-    fig.update_layout(
-        yaxis=dict(categoryorder='total ascending'),
-        height=500
-    )
+    section_header("Kepentingan Variabel dalam Prediksi")
     
+    fig = create_feature_importance_chart()
     st.plotly_chart(fig, use_container_width=True)
     
     st.markdown("""
@@ -294,7 +431,7 @@ def main():
     """)
     
     # Uncertainty analysis
-    st.header("Analisis Ketidakpastian")
+    section_header("Analisis Ketidakpastian")
     
     uncertainty_col1, uncertainty_col2 = st.columns(2)
     
@@ -324,62 +461,7 @@ def main():
         """)
     
     with uncertainty_col2:
-        # Create uncertainty range visualization
-        provinces = ['Papua', 'NTT', 'Maluku', 'Sulawesi Tengah', 'Kalimantan Barat']
-        central_estimates = [75, 65, 55, 45, 40]
-        
-        # Create lower and upper bounds with varying ranges to show different uncertainty levels
-        lower_bounds = [max(0, central_estimates[i] - int(10 + i*2)) for i in range(len(central_estimates))]
-        upper_bounds = [central_estimates[i] + int(10 + i*2) for i in range(len(central_estimates))]
-        
-        # Ensure no negative values
-        lower_bounds = [max(0, lb) for lb in lower_bounds]
-        
-        fig = go.Figure()
-        
-        # Add central estimates
-        fig.add_trace(go.Scatter(
-            x=provinces,
-            y=central_estimates,
-            mode='markers',
-            marker=dict(size=10, color='blue'),
-            name='Estimasi Tengah'
-        ))
-        
-        # Add error bars
-        for i in range(len(provinces)):
-            fig.add_trace(go.Scatter(
-                x=[provinces[i], provinces[i]],
-                y=[lower_bounds[i], upper_bounds[i]],
-                mode='lines',
-                line=dict(color='blue', width=1),
-                showlegend=False
-            ))
-            
-            # Add caps to the error bars
-            fig.add_trace(go.Scatter(
-                x=[provinces[i], provinces[i]],
-                y=[lower_bounds[i], lower_bounds[i]],
-                mode='lines',
-                line=dict(color='blue', width=1),
-                showlegend=False
-            ))
-            
-            fig.add_trace(go.Scatter(
-                x=[provinces[i], provinces[i]],
-                y=[upper_bounds[i], upper_bounds[i]],
-                mode='lines',
-                line=dict(color='blue', width=1),
-                showlegend=False
-            ))
-        
-        fig.update_layout(
-            title='Rentang Ketidakpastian Prediksi untuk Provinsi Terpilih',
-            xaxis_title='Provinsi',
-            yaxis_title='Formasi yang Dibutuhkan',
-            height=400
-        )
-        
+        fig = create_uncertainty_chart()
         st.plotly_chart(fig, use_container_width=True)
         
         st.markdown("""
@@ -391,7 +473,7 @@ def main():
         """)
     
     # Model validation
-    st.header("Validasi Model")
+    section_header("Validasi Model")
     
     st.markdown("""
     ### Pendekatan Validasi Model Prediksi:
@@ -425,55 +507,11 @@ def main():
         """)
     
     with validation_col2:
-        # Create validation metric chart
-        metrics = ['Accuracy', 'Precision', 'Recall', 'F1-Score', 'ROC-AUC']
-        values = [0.87, 0.85, 0.84, 0.84, 0.91]
-        
-        fig = go.Figure()
-        
-        fig.add_trace(go.Bar(
-            x=metrics,
-            y=values,
-            marker_color='#0066cc'
-        ))
-        
-        # Add threshold line for acceptable performance
-        fig.add_shape(
-            type='line',
-            x0=-0.5,
-            x1=4.5,
-            y0=0.8,
-            y1=0.8,
-            line=dict(
-                color='red',
-                width=2,
-                dash='dash'
-            )
-        )
-        
-        fig.update_layout(
-            title='Metrik Validasi Model',
-            xaxis_title='Metrik',
-            yaxis_title='Skor',
-            yaxis=dict(range=[0.7, 1.0]),
-            height=400,
-            annotations=[
-                dict(
-                    x=2,
-                    y=0.78,
-                    xref='x',
-                    yref='y',
-                    text='Threshold Performa Minimum (0.8)',
-                    showarrow=False,
-                    font=dict(color='red')
-                )
-            ]
-        )
-        
+        fig = create_validation_chart()
         st.plotly_chart(fig, use_container_width=True)
     
     # Continous improvement
-    st.header("Peningkatan Model Berkelanjutan")
+    section_header("Peningkatan Model Berkelanjutan")
     
     st.markdown("""
     ### Strategi Pengembangan Model:
@@ -502,7 +540,7 @@ def main():
     """)
     
     # Next steps
-    st.header("Arah Pengembangan Selanjutnya")
+    section_header("Arah Pengembangan Selanjutnya")
     
     next_col1, next_col2, next_col3 = st.columns(3)
     
@@ -540,7 +578,7 @@ def main():
         """)
     
     # References
-    st.header("Referensi dan Sumber Daya")
+    section_header("Referensi dan Sumber Daya")
     
     st.markdown("""
     ### Dokumen Teknis dan Publikasi:
@@ -569,4 +607,4 @@ def main():
     """)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    run_profiled(main, "7_Model_Prediksi_dan_Algoritma")
\ No newline at end of file
@@ -0,0 +1,106 @@
+import streamlit as st
+import pandas as pd
+from utils.figure_cache import figure_cache_stats
+from utils.memory import session_memory, cache_memory
+from utils.profiling import profiling_mode, display_profile, profile_dumps, top_functions, dump_bytes, PROFILE_PARAM
+
+# Page configuration
+st.set_page_config(
+    page_title="SPPI 2025 - Diagnostik",
+    page_icon="🩺",
+    layout="wide"
+)
+
+def main():
+    # Header
+    st.title("Diagnostik Kinerja")
+    
+    # Hidden unless profiling is on for this session
+    if profiling_mode() is None:
+        st.info(f"Halaman ini hanya untuk pengembang. Aktifkan dengan parameter URL `?{PROFILE_PARAM}=1`.")
+        return
+    
+    st.markdown(f"""
+    Profil eksekusi aktif untuk sesi ini. Gunakan `?{PROFILE_PARAM}=1` untuk waktu per bagian,
+    `?{PROFILE_PARAM}=cprofile` untuk menyimpan dump cProfile, dan `?{PROFILE_PARAM}=0` untuk mematikan.
+    """)
+    
+    # Breakdowns of this session's reruns
+    st.header("Riwayat Rerun Sesi Ini")
+    
+    history = st.session_state.get("_profile_history", [])
+    if not history:
+        st.info("Belum ada rerun yang diprofilkan. Buka halaman lain untuk merekam waktunya.")
+    else:
+        runs = pd.DataFrame([
+            {"page": profile["page"], "time": profile["time"], "total_ms": round(profile["total_ms"], 1)}
+            for profile in reversed(history)
+        ])
+        st.dataframe(runs, hide_index=True, use_container_width=True)
+        
+        selected_run = st.selectbox(
+            "Pilih Rerun",
+            options=range(len(runs)),
+            format_func=lambda index: f"{runs['page'][index]} - {runs['time'][index]:%H:%M:%S}"
+        )
+        display_profile(list(reversed(history))[selected_run])
+    
+    # Figure cache shared by all sessions
+    st.header("Cache Grafik")
+    
+    stats = figure_cache_stats()
+    cache_col1, cache_col2, cache_col3, cache_col4 = st.columns(4)
+    cache_col1.metric("Hit", stats["hits"])
+    cache_col2.metric("Miss", stats["misses"])
+    cache_col3.metric("Eviction", stats["evictions"])
+    cache_col4.metric("Grafik Tersimpan", stats["figures"])
+    
+    # Bytes held by each session's state
+    st.header("Memori per Sesi")
+    
+    sessions = session_memory()
+    st.metric("Total Session State", f"{sessions['bytes'].sum() / 2 ** 20:,.1f} MiB")
+    st.dataframe(sessions, hide_index=True, use_container_width=True)
+    
+    # Bytes held by the caches shared by all sessions
+    st.header("Memori Cache")
+    
+    caches = cache_memory()
+    totals = caches.groupby("cache")["bytes"].agg(["count", "sum"]).rename(columns={"count": "entries", "sum": "bytes"})
+    st.dataframe(totals.sort_values("bytes", ascending=False), use_container_width=True)
+    st.dataframe(caches, hide_index=True, use_container_width=True)
+    
+    # cProfile dumps from every session of this process
+    st.header("Dump cProfile")
+    
+    dumps = profile_dumps()
+    if not dumps:
+        st.info(f"Belum ada dump. Buka halaman dengan `?{PROFILE_PARAM}=cprofile` untuk merekamnya.")
+        return
+    
+    selected_dump = st.selectbox(
+        "Pilih Dump",
+        options=range(len(dumps)),
+        format_func=lambda index: (
+            f"{dumps[index]['page']} - {dumps[index]['time']:%H:%M:%S} ({dumps[index]['total_ms']:,.0f} ms)"
+        )
+    )
+    dump = dumps[selected_dump]
+    
+    sort = st.radio("Urutkan", options=["cumulative", "total"], horizontal=True)
+    st.dataframe(
+        top_functions(dump, sort=sort).round({"total_ms": 1, "cumulative_ms": 1}),
+        hide_index=True,
+        use_container_width=True
+    )
+    
+    st.download_button(
+        "Unduh Dump (.prof)",
+        data=dump_bytes(dump),
+        file_name=f"{dump['page']}_{dump['time']:%Y%m%d_%H%M%S}.prof",
+        mime="application/octet-stream",
+        help="Buka dengan snakeviz atau viewer flame graph lain yang membaca format pstats"
+    )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+import streamlit as st
+from utils.data_utils import load_nutrition_data, load_placement_opportunities, load_private_sector_opportunities
+from utils.data_products import load_formasi_predictions
+from utils.report_service import ReportService, report_filename
+from utils.profiling import section_header, run_profiled
+
+# Page configuration
+st.set_page_config(
+    page_title="SPPI 2025 - Laporan Provinsi",
+    page_icon="📄",
+    layout="wide"
+)
+
+# One pool of report workers, and the packs it rendered, shared by all sessions
+@st.cache_resource
+def get_report_service():
+    return ReportService()
+
+def main():
+    # Header
+    st.title("Laporan Ringkasan per Provinsi")
+    
+    st.markdown("""
+    Unduh paket ringkasan (briefing pack) untuk setiap provinsi. Setiap paket berisi indikator gizi
+    dibandingkan rata-rata nasional, prediksi kebutuhan formasi, peluang penempatan, dan peluang
+    kolaborasi sektor swasta di region provinsi tersebut.
+    
+    > **Catatan:** Laporan dibuat di latar belakang. Paket berformat HTML dan dapat dicetak ke PDF
+    melalui menu cetak browser.
+    """)
+    
+    tables = {
+        "nutrition": load_nutrition_data(),
+        "placements": load_placement_opportunities(),
+        "predictions": load_formasi_predictions(),
+        "collaborations": load_private_sector_opportunities()
+    }
+    provinces = sorted(tables["nutrition"]["province"])
+    
+    # Queues only the packs not yet rendered for this data version and returns immediately
+    service = get_report_service()
+    version = service.submit(provinces, tables)
+    progress = service.progress(version)
+    
+    section_header("Status Pembuatan Laporan")
+    
+    status_col1, status_col2 = st.columns([3, 1])
+    
+    with status_col1:
+        st.progress(
+            progress["done"] / max(progress["total"], 1),
+            text=f"{progress['done']} dari {progress['total']} laporan selesai (versi data {version})"
+        )
+        if progress["failed"]:
+            st.warning(f"{progress['failed']} laporan gagal dibuat.")
+    
+    with status_col2:
+        st.button("Perbarui Status")
+    
+    # Single province download
+    section_header("Unduh Laporan Provinsi")
+    
+    selected_province = st.selectbox("Pilih Provinsi", options=provinces)
+    
+    try:
+        report = service.report(version, selected_province)
+    except Exception as error:
+        # Any render error or a dead worker (BrokenProcessPool) fails only this
+        # province, the same way progress() counts it
+        st.error(f"Laporan {selected_province} gagal dibuat: {type(error).__name__}: {error}")
+    else:
+        if report is None:
+            st.info(f"Laporan {selected_province} sedang dibuat. Klik **Perbarui Status** untuk memeriksa kembali.")
+        else:
+            st.download_button(
+                f"Unduh Laporan {selected_province} (HTML)",
+                data=report,
+                file_name=report_filename(selected_province),
+                mime="text/html"
+            )
+    
+    # All packs at once
+    section_header("Unduh Semua Laporan")
+    
+    if progress["done"] < progress["total"]:
+        st.info("Arsip semua laporan tersedia setelah seluruh laporan selesai dibuat.")
+    else:
+        st.download_button(
+            f"Unduh {progress['done'] - progress['failed']} Laporan (ZIP)",
+            data=service.bundle(version),
+            file_name=f"laporan_provinsi_sppi_2025_{version}.zip",
+            mime="application/zip"
+        )
+
+if __name__ == "__main__":
+    run_profiled(main, "9_Laporan_Provinsi")
@@ -0,0 +1,258 @@
+import heapq
+import time
+import numpy as np
+from scipy import sparse
+from utils.cube import PlacementCube
+
+# Annual stipend cost per position (juta Rupiah) by stipend level
+STIPEND_COSTS = {"Basic": 36, "Medium": 42, "Enhanced": 54}
+
+def _heap_key(i, remaining_need, weight, cost):
+    # Units with unmet need are ranked by weighted gap closed per Rupiah;
+    # units whose need is already covered only serve to reach a floor, cheapest first
+    ratio = weight[i] / cost[i] if remaining_need[i] > 0 else 0.0
+    return (-ratio, cost[i], i)
+
+def greedy_allocation(need, weight, cost, capacity, total_positions,
+                      budget=None, group=None, floors=None):
+    """
+    Allocate integer positions with a heap-based greedy method
+
+    Positions go in batches to the unit with the largest weighted gap
+    reduction. Group floors are filled first, then the remaining positions
+    are distributed nationally. Cost only matters when the budget binds:
+    units are ranked by weight alone first, and only when that allocation
+    runs out of budget is it redone ranking by weight per unit of cost.
+
+    Parameters:
+    - need, weight, cost, capacity: numpy arrays with one entry per unit
+    - total_positions: int, number of positions to distribute
+    - budget: optional total stipend budget, in the same unit as cost
+    - group: optional array of group labels (e.g. region) per unit
+    - floors: optional dict mapping group label to minimum positions
+
+    Returns:
+    - tuple (allocation, budget_bound): integer numpy array and whether the
+      budget bound, i.e. the allocation was ranked by cost and may not be optimal
+    """
+    n = len(need)
+
+    # A budget that does not bind leaves the unbudgeted optimum, where only the weight ranks units
+    allocation, budget_bound = _greedy_pass(need, weight, cost, np.ones(n), capacity, total_positions,
+                                            budget, group, floors)
+    if budget_bound:
+        # The budget shapes this allocation even if the cost-ranked pass no longer hits it
+        allocation, _ = _greedy_pass(need, weight, cost, np.asarray(cost, dtype=float), capacity,
+                                     total_positions, budget, group, floors)
+    return allocation, budget_bound
+
+def _greedy_pass(need, weight, cost, rank_cost, capacity, total_positions, budget, group, floors):
+    # One greedy run ranking units by weight / rank_cost; see greedy_allocation
+    n = len(need)
+    allocation = np.zeros(n, dtype=int)
+    remaining_need = np.maximum(np.asarray(need), 0).astype(int)
+    remaining_capacity = np.asarray(capacity).astype(int).copy()
+    positions_left = int(total_positions)
+    budget_left = float(budget) if budget is not None else np.inf
+    budget_bound = False
+
+    def run(candidates, quota, need_only):
+        nonlocal positions_left, budget_left, budget_bound
+        heap = [
+            _heap_key(i, remaining_need, weight, rank_cost) for i in candidates
+            if remaining_capacity[i] > 0 and (remaining_need[i] > 0 or not need_only)
+        ]
+        heapq.heapify(heap)
+
+        while heap and quota > 0 and positions_left > 0:
+            _, _, i = heapq.heappop(heap)
+            limit = remaining_need[i] if remaining_need[i] > 0 else remaining_capacity[i]
+            amount = min(limit, remaining_capacity[i], quota, positions_left)
+
+            if np.isfinite(budget_left):
+                affordable = int(budget_left // cost[i])
+                if affordable < amount:
+                    budget_bound = True
+                    amount = affordable
+                if amount <= 0:
+                    continue
+
+            allocation[i] += amount
+            remaining_need[i] -= min(amount, remaining_need[i])
+            remaining_capacity[i] -= amount
+            positions_left -= amount
+            budget_left -= amount * cost[i]
+            quota -= amount
+
+            if remaining_capacity[i] > 0 and (remaining_need[i] > 0 or not need_only):
+                heapq.heappush(heap, _heap_key(i, remaining_need, weight, rank_cost))
+
+        return quota
+
+    if floors:
+        for label, floor in floors.items():
+            members = np.flatnonzero(np.asarray(group) == label)
+            run(members, int(floor), need_only=False)
+
+    run(range(n), positions_left, need_only=True)
+
+    return allocation, budget_bound
+
+def exact_allocation(need, weight, cost, capacity, total_positions,
+                     budget=None, group=None, floors=None):
+    """
+    Solve the allocation exactly as a mixed-integer linear program
+
+    Minimizes sum(weight * unmet_gap) with integer positions, subject to the
+    position total, the stipend budget, group floors and unit capacities.
+
+    Parameters:
+    - same as greedy_allocation
+
+    Returns:
+    - integer numpy array with the optimal allocation
+    """
+    # scipy.optimize is slow to import and only needed by the exact method
+    from scipy.optimize import milp, LinearConstraint, Bounds
+
+    n = len(need)
+    need = np.maximum(np.asarray(need, dtype=float), 0)
+
+    # Variables: x (positions per unit) followed by u (unmet gap per unit)
+    objective = np.concatenate([np.zeros(n), np.asarray(weight, dtype=float)])
+    integrality = np.concatenate([np.ones(n), np.zeros(n)])
+    bounds = Bounds(
+        np.zeros(2 * n),
+        np.concatenate([np.asarray(capacity, dtype=float), need])
+    )
+
+    identity = sparse.identity(n, format="csr")
+    constraints = [
+        # u_i + x_i >= need_i
+        LinearConstraint(sparse.hstack([identity, identity], format="csr"), need, np.inf),
+        LinearConstraint(np.concatenate([np.ones(n), np.zeros(n)]), 0, total_positions)
+    ]
+    if budget is not None:
+        constraints.append(LinearConstraint(
+            np.concatenate([np.asarray(cost, dtype=float), np.zeros(n)]), 0, budget
+        ))
+    if floors:
+        labels = np.asarray(group)
+        for label, floor in floors.items():
+            row = np.concatenate([(labels == label).astype(float), np.zeros(n)])
+            constraints.append(LinearConstraint(row, floor, np.inf))
+
+    result = milp(objective, constraints=constraints, integrality=integrality, bounds=bounds)
+    if not result.success:
+        raise ValueError(f"Allocation problem is infeasible: {result.message}")
+
+    return np.round(result.x[:n]).astype(int)
+
+def allocate_formasi(units_df, total_positions, budget=None, floors=None,
+                     need_column="gap", weight_column="priority_level",
+                     cost_column="stipend_cost", capacity_column="housing_capacity",
+                     group_column="region", method="auto"):
+    """
+    Distribute formasi across provinces or districts to minimize weighted unmet gap
+
+    Parameters:
+    - units_df: Pandas DataFrame with one row per province or district
+    - total_positions: int, e.g. program_info['nutrition_focus_positions']
+    - budget: optional total stipend budget (juta Rupiah)
+    - floors: optional dict mapping group label (e.g. region) to minimum positions
+    - need_column, weight_column, cost_column, capacity_column, group_column: column names
+    - method: 'greedy', 'exact' or 'auto' (greedy, with the exact solver as
+      fallback when floors are not met or the budget makes greedy inexact)
+
+    Returns:
+    - tuple (allocation_df, summary): copy of units_df with 'allocated_formasi'
+      and 'unmet_gap' columns, and a dict describing the solution
+    """
+    start = time.perf_counter()
+
+    need = units_df[need_column].clip(lower=0).to_numpy(dtype=int)
+    weight = units_df[weight_column].to_numpy(dtype=float)
+    cost = (
+        units_df[cost_column].to_numpy(dtype=float)
+        if cost_column in units_df else np.ones(len(units_df))
+    )
+    capacity = (
+        units_df[capacity_column].to_numpy(dtype=int)
+        if capacity_column in units_df else np.full(len(units_df), int(total_positions))
+    )
+    group = units_df[group_column].to_numpy() if group_column in units_df else None
+
+    args = (need, weight, cost, capacity, total_positions, budget, group, floors)
+
+    if method == "exact":
+        allocation = exact_allocation(*args)
+        used_method = "exact"
+    elif method in ("greedy", "auto"):
+        allocation, budget_bound = greedy_allocation(*args)
+        used_method = "greedy"
+
+        floors_met = all(
+            allocation[group == label].sum() >= floor for label, floor in (floors or {}).items()
+        )
+        if method == "auto" and (budget_bound or not floors_met):
+            allocation = exact_allocation(*args)
+            used_method = "exact"
+        elif not floors_met:
+            raise ValueError("Greedy allocation could not satisfy the group floors")
+    else:
+        raise ValueError(f"Unknown allocation method: {method}")
+
+    allocation_df = units_df.copy()
+    allocation_df["allocated_formasi"] = allocation
+    allocation_df["unmet_gap"] = np.maximum(need - allocation, 0)
+
+    summary = {
+        "method": used_method,
+        "allocated": int(allocation.sum()),
+        "weighted_unmet_gap": float((weight * allocation_df["unmet_gap"]).sum()),
+        "budget_used": float((cost * allocation).sum()),
+        "elapsed_seconds": time.perf_counter() - start
+    }
+
+    return allocation_df, summary
+
+def prepare_allocation_units(prediction_data, placement_data, unit_column="province"):
+    """
+    Attach stipend cost and housing capacity to the prediction units
+
+    Parameters:
+    - prediction_data: Pandas DataFrame with gap and priority per unit
+    - placement_data: Pandas DataFrame with placement opportunities, or a
+      PlacementCube over them (only for units that are cube dimensions)
+    - unit_column: column identifying a unit ('province' or 'district')
+
+    Returns:
+    - Pandas DataFrame ready for allocate_formasi
+    """
+    if isinstance(placement_data, PlacementCube):
+        # Read the per-unit figures from the cube cells instead of scanning placements
+        cells = placement_data.rollup([unit_column, "stipend_level"])
+        cells["stipend_total"] = cells["stipend_level"].map(STIPEND_COSTS) * cells["locations"]
+        per_unit = cells.groupby(unit_column).agg(
+            stipend_total=("stipend_total", "sum"),
+            locations=("locations", "sum"),
+            housing_capacity=("housing_positions", "sum")
+        ).reset_index()
+        per_unit["stipend_cost"] = per_unit["stipend_total"] / per_unit["locations"]
+        per_unit = per_unit[[unit_column, "stipend_cost", "housing_capacity"]]
+    else:
+        placements = placement_data.assign(
+            stipend_cost=placement_data["stipend_level"].map(STIPEND_COSTS),
+            housing_slots=placement_data["positions_available"].where(placement_data["housing_provided"], 0)
+        )
+
+        per_unit = placements.groupby(unit_column).agg(
+            stipend_cost=("stipend_cost", "mean"),
+            housing_capacity=("housing_slots", "sum")
+        ).reset_index()
+
+    units = prediction_data.merge(per_unit, on=unit_column, how="left")
+    units["stipend_cost"] = units["stipend_cost"].fillna(STIPEND_COSTS["Medium"])
+    units["housing_capacity"] = units["housing_capacity"].fillna(0).astype(int)
+
+    return units
@@ -0,0 +1,159 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+# Dimensions the placement cube is pre-aggregated over
+CUBE_DIMENSIONS = [
+    "province", "specialization", "priority_level", "remote_area", "housing_provided", "stipend_level"
+]
+
+class PlacementCube:
+    """
+    In-memory cube of placement statistics
+
+    Placements are aggregated once into one cell per combination of the
+    cube dimensions. Filters and group-bys are then answered by summing
+    cells, so the cost depends on the number of cells, not on the number
+    of placements. Distinct district counts are kept exact through a
+    sparse cell-by-district incidence matrix.
+    """
+
+    def __init__(self, placements_df, dimensions=CUBE_DIMENSIONS, district_column="district"):
+        self.dimensions = list(dimensions)
+        self.n_rows = len(placements_df)
+
+        cell_codes, cells = pd.MultiIndex.from_frame(placements_df[self.dimensions]).factorize()
+        self.cells = cells.to_frame(index=False, name=self.dimensions)
+        n_cells = len(self.cells)
+
+        positions = placements_df["positions_available"].to_numpy(dtype=np.int64)
+
+        self.locations = np.bincount(cell_codes, minlength=n_cells)
+        self.positions = np.bincount(cell_codes, weights=positions, minlength=n_cells).astype(np.int64)
+
+        # Integer codes per dimension make filtering a handful of vectorized lookups
+        self._codes = {}
+        self._labels = {}
+        for dimension in self.dimensions:
+            codes, labels = pd.factorize(self.cells[dimension], sort=True)
+            self._codes[dimension] = codes
+            self._labels[dimension] = labels
+
+        district_codes, self.districts = pd.factorize(placements_df[district_column])
+        self._cell_districts = sparse.csr_matrix(
+            (np.ones(len(cell_codes), dtype=bool), (cell_codes, district_codes)),
+            shape=(n_cells, len(self.districts))
+        )
+
+    def values(self, dimension):
+        """
+        Return the sorted distinct values of a dimension
+        """
+        return list(self._labels[dimension])
+
+    def _mask(self, filters):
+        """
+        Boolean mask of the cells selected by a filter dict
+        """
+        mask = np.ones(len(self.cells), dtype=bool)
+
+        for dimension, selected in (filters or {}).items():
+            if selected is None:
+                continue
+            if not isinstance(selected, (list, tuple, set, range, np.ndarray, pd.Index)):
+                selected = [selected]
+            # An empty selection means "no filter", as with the sidebar multiselects
+            if len(selected) == 0:
+                continue
+
+            labels = self._labels[dimension]
+            allowed = np.zeros(len(labels) + 1, dtype=bool)
+            allowed[labels.get_indexer(list(selected))] = True
+            allowed[-1] = False
+            mask &= allowed[self._codes[dimension]]
+
+        return mask
+
+    def rollup(self, by=None, filters=None):
+        """
+        Aggregate the selected cells, optionally grouped by dimensions
+
+        Parameters:
+        - by: dimension name or list of dimension names (None for a single total row)
+        - filters: dict of dimension -> allowed value(s); missing or empty means all
+
+        Returns:
+        - Pandas DataFrame with the group columns and positions_available,
+          locations, districts, mean_priority, remote_locations and
+          housing_positions
+        """
+        by = [by] if isinstance(by, str) else list(by or [])
+        selected = np.flatnonzero(self._mask(filters))
+
+        if by:
+            group_codes = np.zeros(len(selected), dtype=np.int64)
+            for dimension in by:
+                group_codes = group_codes * len(self._labels[dimension]) + self._codes[dimension][selected]
+            group_keys, group_of_cell = np.unique(group_codes, return_inverse=True)
+        else:
+            group_keys = np.zeros(1, dtype=np.int64)
+            group_of_cell = np.zeros(len(selected), dtype=np.int64)
+        n_groups = len(group_keys)
+
+        locations = self.locations[selected]
+        positions = self.positions[selected]
+        priority = self.cells["priority_level"].to_numpy(dtype=float)[selected]
+        remote = self.cells["remote_area"].to_numpy(dtype=bool)[selected]
+        housing = self.cells["housing_provided"].to_numpy(dtype=bool)[selected]
+
+        def total(weights):
+            return np.bincount(group_of_cell, weights=weights, minlength=n_groups)
+
+        result = {}
+        remaining = group_keys
+        for dimension in reversed(by):
+            size = len(self._labels[dimension])
+            result[dimension] = np.asarray(self._labels[dimension])[remaining % size]
+            remaining = remaining // size
+        result = pd.DataFrame({dimension: result[dimension] for dimension in by})
+
+        group_locations = total(locations)
+        result["positions_available"] = total(positions).astype(np.int64)
+        result["locations"] = group_locations.astype(np.int64)
+
+        # Distinct districts per group: (group x cell) @ (cell x district), then count non-empty columns
+        membership = sparse.csr_matrix(
+            (np.ones(len(selected), dtype=bool), (group_of_cell, selected)),
+            shape=(n_groups, len(self.cells))
+        )
+        result["districts"] = np.asarray(((membership @ self._cell_districts) > 0).sum(axis=1)).ravel()
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            result["mean_priority"] = total(priority * locations) / group_locations
+        result["remote_locations"] = total(np.where(remote, locations, 0)).astype(np.int64)
+        result["housing_positions"] = total(np.where(housing, positions, 0)).astype(np.int64)
+
+        return result
+
+    def totals(self, filters=None):
+        """
+        Headline statistics for a filter selection
+
+        Parameters:
+        - filters: dict of dimension -> allowed value(s)
+
+        Returns:
+        - dict with positions, locations, provinces, districts, remote_share (%)
+          and mean_priority
+        """
+        row = self.rollup(filters=filters).iloc[0]
+        provinces = self.rollup("province", filters=filters)
+
+        return {
+            "positions": int(row["positions_available"]),
+            "locations": int(row["locations"]),
+            "provinces": int((provinces["locations"] > 0).sum()),
+            "districts": int(row["districts"]),
+            "remote_share": float(row["remote_locations"] / row["locations"] * 100) if row["locations"] else 0.0,
+            "mean_priority": float(row["mean_priority"])
+        }
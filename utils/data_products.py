@@ -0,0 +1,18 @@
+from core import products
+from utils.data_utils import streamlit_cached
+
+# Streamlit adapter over core.products (see utils.data_utils)
+load_sector_simulation = streamlit_cached(products.load_sector_simulation)
+load_regional_opportunities = streamlit_cached(products.load_regional_opportunities)
+load_case_studies = streamlit_cached(products.load_case_studies)
+load_formasi_predictions = streamlit_cached(products.load_formasi_predictions)
+simulate_formasi_intervals = streamlit_cached(products.simulate_formasi_intervals)
+
+# Registry of the simulated data products, by name
+DATA_PRODUCTS = {
+    "sector_simulation": load_sector_simulation,
+    "regional_opportunities": load_regional_opportunities,
+    "case_studies": load_case_studies,
+    "formasi_predictions": load_formasi_predictions,
+    "formasi_intervals": simulate_formasi_intervals
+}
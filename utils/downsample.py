@@ -0,0 +1,143 @@
+import numpy as np
+
+def lttb(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets downsampling of a line
+
+    Keeps the first and last point and, per bucket, the point forming the
+    largest triangle with the previously kept point and the average of the
+    next bucket, which preserves peaks and the visual shape of the line.
+
+    Parameters:
+    - x, y: numeric arrays in drawing order (datetimes are accepted for x)
+    - n_out: number of points to keep
+
+    Returns:
+    - sorted integer numpy array of the kept indices
+    """
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        x = x.astype("datetime64[ns]").astype(np.int64)
+    x = x.astype(np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+
+    if n_out >= n:
+        return np.arange(n)
+    if n_out < 3:
+        return np.array([0, n - 1][:n_out], dtype=np.int64)
+
+    # n_out - 2 buckets between the fixed first and last point
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    kept = np.empty(n_out, dtype=np.int64)
+    kept[0], kept[-1] = 0, n - 1
+
+    previous = 0
+    for i in range(n_out - 2):
+        start, stop = edges[i], edges[i + 1]
+        next_start, next_stop = (edges[i + 1], edges[i + 2]) if i + 2 < len(edges) else (n - 1, n)
+        next_x = x[next_start:next_stop].mean()
+        next_y = y[next_start:next_stop].mean()
+
+        area = np.abs(
+            (x[previous] - next_x) * (y[start:stop] - y[previous]) -
+            (x[previous] - x[start:stop]) * (next_y - y[previous])
+        )
+        previous = start + int(np.argmax(area))
+        kept[i + 1] = previous
+
+    return kept
+
+def allocate_budget(sizes, budget):
+    """
+    Split a point budget over groups proportionally to their size
+
+    Every non-empty group keeps at least one point when the budget allows;
+    remainders go to the groups with the largest fractional share.
+
+    Parameters:
+    - sizes: array of group sizes
+    - budget: total number of points to keep
+
+    Returns:
+    - integer numpy array of points to keep per group
+    """
+    sizes = np.asarray(sizes, dtype=np.int64)
+    if sizes.sum() <= budget:
+        return sizes.copy()
+
+    non_empty = sizes > 0
+    floor = np.minimum(sizes, non_empty.astype(np.int64)) if budget >= non_empty.sum() else np.zeros_like(sizes)
+    share = (sizes - floor) / max((sizes - floor).sum(), 1) * (budget - floor.sum())
+    allocation = floor + np.floor(share).astype(np.int64)
+
+    remainder = budget - allocation.sum()
+    if remainder > 0:
+        order = np.argsort(-(share - np.floor(share)), kind="stable")
+        allocation[order[:remainder]] += 1
+
+    return np.minimum(allocation, sizes)
+
+def stratified_sample(strata, n_out, seed=0):
+    """
+    Sample points proportionally from each stratum
+
+    Parameters:
+    - strata: array with the stratum of each point
+    - n_out: number of points to keep
+    - seed: random seed, so the same data always shows the same points
+
+    Returns:
+    - sorted integer numpy array of the kept indices
+    """
+    codes, _ = _codes(strata)
+    if n_out >= len(codes):
+        return np.arange(len(codes))
+
+    rng = np.random.default_rng(seed)
+    order = np.argsort(codes, kind="stable")
+    sizes = np.bincount(codes)
+    starts = np.r_[0, np.cumsum(sizes)[:-1]]
+
+    kept = [
+        order[start + rng.choice(size, take, replace=False)]
+        for start, size, take in zip(starts, sizes, allocate_budget(sizes, n_out)) if take
+    ]
+    return np.sort(np.concatenate(kept)) if kept else np.array([], dtype=np.int64)
+
+def grid_strata(x, y, bins=16):
+    """
+    Stratum per point from a bins x bins grid over the x/y extent
+
+    Sparse regions and outliers get their own cells, so a stratified sample
+    keeps them visible. Non-numeric axes use their categories instead.
+
+    Parameters:
+    - x, y: point coordinates
+    - bins: grid cells per numeric axis
+
+    Returns:
+    - integer numpy array of cell codes
+    """
+    cells = np.zeros(len(x), dtype=np.int64)
+    for axis in (x, y):
+        axis = np.asarray(axis)
+        if np.issubdtype(axis.dtype, np.number) or np.issubdtype(axis.dtype, np.datetime64):
+            values = axis.astype(np.float64) if not np.issubdtype(axis.dtype, np.datetime64) else axis.astype(np.int64)
+            low, high = np.nanmin(values), np.nanmax(values)
+            span = high - low if high > low else 1
+            code = np.nan_to_num(np.clip((values - low) / span * bins, 0, bins - 1), nan=0).astype(np.int64)
+            size = bins
+        else:
+            code, labels = _codes(axis)
+            size = max(len(labels), 1)
+        cells = cells * size + code
+
+    return cells
+
+def _codes(values):
+    values = np.asarray(values)
+    if not np.issubdtype(values.dtype, np.integer):
+        values = values.astype(str)
+    labels, codes = np.unique(values, return_inverse=True)
+    return codes.ravel(), labels
@@ -0,0 +1,186 @@
+import os
+import time
+import numpy as np
+import pandas as pd
+
+# Vectorized comparison for each rule operator; missing values always fail
+OPERATORS = {
+    ">=": lambda values, target: values >= target,
+    "<=": lambda values, target: values <= target,
+    ">": lambda values, target: values > target,
+    "<": lambda values, target: values < target,
+    "==": lambda values, target: values == target,
+    "!=": lambda values, target: values != target,
+    "in": lambda values, target: values.isin(target),
+    "not_in": lambda values, target: ~values.isin(target)
+}
+
+def compile_rules(rules, track=None):
+    """
+    Compile screening rules into vectorized column predicates
+
+    Parameters:
+    - rules: list of rule dicts with code, column, op and value
+      (see load_eligibility_criteria()['screening_rules'])
+    - track: optional track name; rules bound to another track are skipped
+
+    Returns:
+    - list of (code, column, predicate) tuples, where predicate maps a
+      Pandas Series to a boolean numpy array of passing rows
+    """
+    compiled = []
+
+    for rule in rules:
+        if rule.get("track") and rule["track"] != track:
+            continue
+        if rule["op"] not in OPERATORS:
+            raise ValueError(f"Unknown operator '{rule['op']}' in rule {rule['code']}")
+
+        compare = OPERATORS[rule["op"]]
+        target = rule["value"]
+
+        def predicate(values, compare=compare, target=target):
+            passed = compare(values, target)
+            return (passed & values.notna()).to_numpy(dtype=bool)
+
+        compiled.append((rule["code"], rule["column"], predicate))
+
+    if len(compiled) > 62:
+        raise ValueError("At most 62 screening rules are supported")
+
+    return compiled
+
+def screen_chunk(chunk, compiled_rules, id_column="applicant_id"):
+    """
+    Screen one chunk of applicants against compiled rules
+
+    Each failed rule sets one bit of a reason mask, so the whole chunk is
+    evaluated with one vectorized pass per rule.
+
+    Parameters:
+    - chunk: Pandas DataFrame of applicants
+    - compiled_rules: output of compile_rules
+    - id_column: column identifying an applicant
+
+    Returns:
+    - Pandas DataFrame with id, eligible, reason_mask and reason_codes columns
+    """
+    mask = np.zeros(len(chunk), dtype=np.int64)
+
+    for bit, (code, column, predicate) in enumerate(compiled_rules):
+        if column in chunk:
+            failed = ~predicate(chunk[column])
+        else:
+            # A missing column means the requirement cannot be verified
+            failed = np.ones(len(chunk), dtype=bool)
+        mask |= failed.astype(np.int64) << bit
+
+    # Only a handful of distinct masks occur, so decode each one once
+    unique_masks, inverse = np.unique(mask, return_inverse=True)
+    decoded = np.array([
+        ";".join(code for bit, (code, _, _) in enumerate(compiled_rules) if value >> bit & 1)
+        for value in unique_masks
+    ], dtype=object)
+
+    return pd.DataFrame({
+        id_column: chunk[id_column].to_numpy() if id_column in chunk else np.arange(len(chunk)),
+        "eligible": mask == 0,
+        "reason_mask": mask,
+        "reason_codes": decoded[inverse]
+    })
+
+def iter_applicant_chunks(source, chunksize=250000, columns=None):
+    """
+    Read an applicant file in chunks
+
+    Parameters:
+    - source: path or file-like object of a CSV or Parquet file, or a DataFrame
+    - chunksize: number of rows per chunk
+    - columns: optional list of columns to read
+
+    Returns:
+    - generator of Pandas DataFrames
+    """
+    if isinstance(source, pd.DataFrame):
+        for start in range(0, len(source), chunksize):
+            yield source.iloc[start:start + chunksize]
+        return
+
+    name = getattr(source, "name", source)
+    if str(name).lower().endswith(".parquet"):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Reading Parquet applicant files requires pyarrow")
+
+        parquet_file = pq.ParquetFile(source)
+        if columns is not None:
+            columns = [c for c in columns if c in parquet_file.schema_arrow.names]
+        for batch in parquet_file.iter_batches(batch_size=chunksize, columns=columns):
+            yield batch.to_pandas()
+    else:
+        usecols = (lambda c: c in columns) if columns is not None else None
+        yield from pd.read_csv(source, chunksize=chunksize, usecols=usecols)
+
+def screen_applicants(source, rules, track=None, chunksize=250000,
+                      id_column="applicant_id", output_path=None):
+    """
+    Stream eligibility results for an applicant file, chunk by chunk
+
+    Parameters:
+    - source: CSV/Parquet path or file-like object, or a DataFrame
+    - rules: list of rule dicts (see load_eligibility_criteria()['screening_rules'])
+    - track: optional track name, e.g. 'nutrition'
+    - chunksize: number of rows per chunk
+    - id_column: column identifying an applicant
+    - output_path: optional CSV path; results are appended as they are produced
+
+    Returns:
+    - generator of result DataFrames, one per chunk
+    """
+    compiled = compile_rules(rules, track=track)
+    columns = [id_column] + [column for _, column, _ in compiled]
+
+    if output_path is not None and os.path.exists(output_path):
+        os.remove(output_path)
+
+    for chunk in iter_applicant_chunks(source, chunksize=chunksize, columns=columns):
+        result = screen_chunk(chunk, compiled, id_column=id_column)
+        if output_path is not None:
+            result.to_csv(output_path, mode="a", header=not os.path.exists(output_path), index=False)
+        yield result
+
+def summarize_screening(results, rules, track=None):
+    """
+    Collect streamed screening results into totals per reason code
+
+    Parameters:
+    - results: iterable of result DataFrames from screen_applicants
+    - rules: the rule list used for screening
+    - track: the track used for screening
+
+    Returns:
+    - tuple (results_df, summary): all results concatenated, and a dict with
+      totals, failures per rule code and elapsed time
+    """
+    start = time.perf_counter()
+    compiled = compile_rules(rules, track=track)
+
+    frames = list(results)
+    results_df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(
+        columns=["eligible", "reason_mask", "reason_codes"]
+    )
+
+    mask = results_df["reason_mask"].to_numpy(dtype=np.int64)
+    failures = {
+        code: int((mask >> bit & 1).sum()) for bit, (code, _, _) in enumerate(compiled)
+    }
+
+    summary = {
+        "screened": len(results_df),
+        "eligible": int(results_df["eligible"].sum()),
+        "failures": failures,
+        "elapsed_seconds": time.perf_counter() - start
+    }
+
+    return results_df, summary
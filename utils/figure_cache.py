@@ -0,0 +1,334 @@
+import functools
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import plotly.io as pio
+from utils.profiling import profile_block
+
+# Bump to invalidate every cached figure, e.g. after a styling change
+FIGURE_CACHE_VERSION = "2"
+
+# Upper bound on the serialized figures held in memory (bytes)
+FIGURE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# Significant digits kept for plotted values when figures are compacted
+FIGURE_SIGNIFICANT_DIGITS = 6
+
+# Attributes (last path component) holding plotted numbers that are safe to
+# send as float32; text, hovertext, customdata and ids are left untouched
+COMPACT_ATTRIBUTES = {
+    "x", "y", "z", "lat", "lon", "r", "theta", "values", "size", "color",
+    "open", "high", "low", "close", "base", "width"
+}
+
+# Arrays shorter than this stay as they are (the base64 overhead is not worth it)
+COMPACT_MIN_LENGTH = 8
+
+# Smallest integer types first, as understood by plotly.js typed arrays
+_INTEGER_TYPES = [np.int8, np.uint8, np.int16, np.uint16, np.int32, np.uint32]
+
+# Serialized figures shared by every session of the process, least recently used first
+_figures = OrderedDict()
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "evictions": 0, "bytes": 0}
+
+# Payload bytes per figure builder, before and after compaction
+_payloads = {}
+
+def fingerprint(value):
+    """
+    Stable digest of a chart argument
+
+    DataFrames and Series are hashed by content, so a new data version
+    produces a new key even when the object is passed under the same name.
+
+    Parameters:
+    - value: any chart argument
+
+    Returns:
+    - hex digest string
+    """
+    digest = hashlib.blake2b(digest_size=16)
+
+    def feed(item):
+        if isinstance(item, pd.DataFrame):
+            digest.update(b"frame")
+            digest.update(repr((list(item.columns), [str(t) for t in item.dtypes])).encode("utf-8"))
+            digest.update(pd.util.hash_pandas_object(item, index=True).to_numpy().tobytes())
+        elif isinstance(item, (pd.Series, pd.Index)):
+            digest.update(b"series")
+            digest.update(repr((item.name, str(item.dtype))).encode("utf-8"))
+            digest.update(pd.util.hash_pandas_object(item).to_numpy().tobytes())
+        elif isinstance(item, np.ndarray):
+            digest.update(b"array")
+            digest.update(repr((item.shape, str(item.dtype))).encode("utf-8"))
+            digest.update(np.ascontiguousarray(item).tobytes() if item.dtype != object else repr(item.tolist()).encode("utf-8"))
+        elif isinstance(item, dict):
+            digest.update(b"dict")
+            for key in sorted(item, key=repr):
+                feed(key)
+                feed(item[key])
+        elif isinstance(item, (list, tuple)):
+            digest.update(b"list")
+            for element in item:
+                feed(element)
+        else:
+            digest.update(repr(item).encode("utf-8"))
+
+    feed(value)
+    return digest.hexdigest()
+
+def figure_cache(function):
+    """
+    Decorator caching the Plotly figure a function builds
+
+    The figure is compacted (see compact_figure) and stored as JSON, keyed
+    by the function, its arguments and FIGURE_CACHE_VERSION, in a
+    byte-bounded LRU shared across sessions.
+    Every call returns a fresh Figure, so callers may still update it.
+    Building and (de)serializing are timed as 'chart' and 'serialize' in
+    the rerun profile (see utils.profiling).
+
+    Parameters:
+    - function: function returning a Plotly figure
+
+    Returns:
+    - wrapped function
+    """
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        # Page scripts all run as __main__, so the file name is part of the key
+        key = (
+            function.__code__.co_filename,
+            function.__qualname__,
+            FIGURE_CACHE_VERSION,
+            fingerprint((args, kwargs))
+        )
+
+        with _lock:
+            serialized = _figures.get(key)
+            if serialized is not None:
+                _figures.move_to_end(key)
+                _stats["hits"] += 1
+
+        if serialized is None:
+            with profile_block("chart", function.__name__):
+                fig = function(*args, **kwargs)
+            with profile_block("serialize", function.__name__):
+                raw_bytes = len(fig.to_json())
+                serialized = compact_figure(fig).to_json()
+            _store(key, serialized)
+            with _lock:
+                _payloads[(function.__code__.co_filename, function.__qualname__)] = {
+                    "raw_bytes": raw_bytes,
+                    "compact_bytes": len(serialized)
+                }
+
+        with profile_block("serialize", function.__name__):
+            return pio.from_json(serialized)
+
+    return wrapper
+
+def _store(key, serialized):
+    size = len(serialized)
+    with _lock:
+        _stats["misses"] += 1
+        if size > FIGURE_CACHE_MAX_BYTES:
+            return
+        if key in _figures:
+            _stats["bytes"] -= len(_figures.pop(key))
+        _figures[key] = serialized
+        _stats["bytes"] += size
+
+        while _stats["bytes"] > FIGURE_CACHE_MAX_BYTES:
+            _, evicted = _figures.popitem(last=False)
+            _stats["bytes"] -= len(evicted)
+            _stats["evictions"] += 1
+
+def figure_cache_stats():
+    """
+    Return hit, miss and eviction counts and the current size of the figure cache
+    """
+    with _lock:
+        return dict(_stats, figures=len(_figures))
+
+def figure_cache_entries():
+    """
+    Return (builder, bytes) for every figure in the cache, least recently used first
+    """
+    with _lock:
+        return [(key[1], len(serialized)) for key, serialized in _figures.items()]
+
+def clear_figure_cache():
+    """
+    Drop every cached figure
+    """
+    with _lock:
+        _figures.clear()
+        _stats["bytes"] = 0
+
+def _compact_array(values, significant_digits):
+    """
+    Return a smaller typed copy of a numeric array, or None to keep it as is
+    """
+    values = np.asarray(values)
+    if values.dtype == object:
+        # Plain Python lists of numbers, as built by go.* traces
+        if not all(isinstance(v, (int, float, np.number)) and not isinstance(v, bool) for v in values.ravel()):
+            return None
+        values = values.astype(np.float64)
+    if not np.issubdtype(values.dtype, np.number) or values.dtype == bool or values.size < COMPACT_MIN_LENGTH:
+        return None
+
+    finite = np.isfinite(values) if np.issubdtype(values.dtype, np.floating) else np.ones(values.shape, dtype=bool)
+    if finite.all() and np.array_equal(values, np.round(values)):
+        low, high = values.min(), values.max()
+        for dtype in _INTEGER_TYPES:
+            limits = np.iinfo(dtype)
+            if limits.min <= low and high <= limits.max:
+                return values.astype(dtype)
+
+    if np.abs(values[finite]).max(initial=0) > np.finfo(np.float32).max:
+        return None
+
+    # Round every value to its own significant digits, which also helps
+    # compression; rounding relative to the largest value would flatten the
+    # small values of wide-range data (log axes, long tails) to zero
+    values = values.astype(np.float64)
+    magnitude = np.abs(values)
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        exponent = np.floor(np.log10(np.where(finite & (magnitude > 0), magnitude, 1)))
+        scale = 10.0 ** (significant_digits - 1 - exponent)
+        rounded = np.round(values * scale) / scale
+    return np.where(np.isfinite(rounded), rounded, values).astype(np.float32)
+
+def _compact_trace(properties, significant_digits, path=""):
+    compacted = {}
+    float_paths = []
+    for key, value in properties.items():
+        name = f"{path}.{key}" if path else key
+        if isinstance(value, dict):
+            compacted[key], nested = _compact_trace(value, significant_digits, name)
+            float_paths.extend(nested)
+            continue
+        if key in COMPACT_ATTRIBUTES and isinstance(value, (list, tuple, np.ndarray)):
+            compact = _compact_array(value, significant_digits)
+            if compact is not None:
+                compacted[key] = compact
+                if compact.dtype == np.float32:
+                    float_paths.append(name)
+                continue
+        compacted[key] = value
+    return compacted, float_paths
+
+def _dedupe_hover(trace):
+    """
+    Inline hovertext and customdata columns that are constant over a trace into its hovertemplate
+    """
+    template = trace.get("hovertemplate")
+    if not isinstance(template, str):
+        return trace
+
+    hovertext = trace.get("hovertext")
+    if isinstance(hovertext, (list, tuple, np.ndarray)) and len(hovertext) > 1 and "%{hovertext}" in template:
+        values = {str(value) for value in hovertext}
+        if len(values) == 1 and "%{" not in next(iter(values)):
+            template = template.replace("%{hovertext}", next(iter(values)))
+            trace = {key: value for key, value in trace.items() if key != "hovertext"}
+
+    customdata = trace.get("customdata")
+    if customdata is not None and not isinstance(customdata, dict):
+        customdata = np.asarray(customdata, dtype=object)
+        if customdata.ndim == 2 and len(customdata) > 1:
+            keep = []
+            for column in range(customdata.shape[1]):
+                values = {str(value) for value in customdata[:, column]}
+                placeholder = f"%{{customdata[{column}]}}"
+                formatted = f"%{{customdata[{column}]:" in template
+                if len(values) == 1 and not formatted and "%{" not in next(iter(values)):
+                    template = template.replace(placeholder, next(iter(values)))
+                else:
+                    keep.append(column)
+
+            if len(keep) < customdata.shape[1]:
+                # Renumber the remaining columns in the template
+                for new_index, column in enumerate(keep):
+                    template = template.replace(f"%{{customdata[{column}]", f"%{{customdata[@{new_index}]")
+                template = template.replace("customdata[@", "customdata[")
+                trace = dict(trace)
+                if keep:
+                    trace["customdata"] = customdata[:, keep]
+                else:
+                    trace.pop("customdata")
+
+    return dict(trace, hovertemplate=template)
+
+def compact_figure(fig, significant_digits=FIGURE_SIGNIFICANT_DIGITS):
+    """
+    Shrink the JSON payload of a Plotly figure
+
+    Plotted numeric arrays are sent as typed binary arrays (base64 'bdata'):
+    integer-valued data in the smallest integer type, other values each
+    rounded to their own significant_digits and stored as float32. Hover
+    placeholders reading a compacted float get a '~g' format so hovers do
+    not show float32 noise.
+    Hover text and customdata columns that are the same for every point of
+    a trace are written once into its hovertemplate instead.
+
+    Parameters:
+    - fig: Plotly figure
+    - significant_digits: precision kept for float values
+
+    Returns:
+    - new Plotly figure
+    """
+    traces = []
+    for trace in fig.data:
+        properties, float_paths = _compact_trace(trace.to_plotly_json(), significant_digits)
+        properties = _dedupe_hover(properties)
+
+        for attribute in ("hovertemplate", "texttemplate"):
+            template = properties.get(attribute)
+            if isinstance(template, str):
+                for name in float_paths:
+                    template = re.sub(r"%\{" + re.escape(name) + r"\}", f"%{{{name}:.{significant_digits}~g}}", template)
+                properties[attribute] = template
+
+        traces.append(properties)
+
+    return go.Figure(data=traces, layout=fig.layout)
+
+def payload_size(fig):
+    """
+    Size in bytes of the JSON Streamlit sends for a figure
+    """
+    return len(pio.to_json(fig, validate=False))
+
+def figure_payload_report(builders=None):
+    """
+    Payload sizes of the cached figure builders, before and after compaction
+
+    Parameters:
+    - builders: optional list of figure_cache-decorated functions to report on
+
+    Returns:
+    - Pandas DataFrame with one row per builder that has rendered at least once
+    """
+    with _lock:
+        payloads = dict(_payloads)
+
+    rows = []
+    for (filename, qualname), sizes in payloads.items():
+        rows.append({"file": filename, "figure": qualname, **sizes})
+    report = pd.DataFrame(rows, columns=["file", "figure", "raw_bytes", "compact_bytes"])
+
+    if builders is not None:
+        wanted = {(b.__wrapped__.__code__.co_filename, b.__wrapped__.__qualname__) for b in builders}
+        report = report[[(f, q) in wanted for f, q in zip(report["file"], report["figure"])]]
+
+    report = report.assign(ratio=report["raw_bytes"] / report["compact_bytes"])
+    return report.sort_values("raw_bytes", ascending=False).reset_index(drop=True)
@@ -0,0 +1,287 @@
+import hashlib
+import math
+import os
+import queue
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+
+# Default location of the application intake database
+DEFAULT_INTAKE_DB = os.environ.get("SPPI_INTAKE_DB", os.path.join("data", "intake.sqlite3"))
+
+APPLICATION_FIELDS = [
+    "nik", "full_name", "email", "phone", "university", "degree_level",
+    "degree_field", "ipk", "birth_date", "preferred_province", "specialization"
+]
+
+DOCUMENT_FIELDS = ["doc_type", "file_name", "size_bytes", "sha256"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS applications (
+    id INTEGER PRIMARY KEY,
+    nik TEXT NOT NULL,
+    full_name TEXT,
+    email TEXT,
+    phone TEXT,
+    university TEXT,
+    degree_level TEXT,
+    degree_field TEXT,
+    ipk REAL,
+    birth_date TEXT,
+    preferred_province TEXT,
+    specialization TEXT,
+    submitted_at REAL NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_applications_nik ON applications (nik);
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    nik TEXT NOT NULL REFERENCES applications (nik),
+    doc_type TEXT NOT NULL,
+    file_name TEXT,
+    size_bytes INTEGER,
+    sha256 TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_documents_nik ON documents (nik);
+"""
+
+NIK_PATTERN = re.compile(r"^\d{16}$")
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings
+
+    Answers "definitely not seen" without touching the database, so only
+    possible duplicates pay for an index lookup.
+    """
+
+    def __init__(self, expected_items=1_000_000, false_positive_rate=0.001):
+        self.size = max(8, int(-expected_items * math.log(false_positive_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / expected_items * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item):
+        # Double hashing: k positions derived from two 64-bit halves of one digest
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, item):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+class ApplicationIntakeStore:
+    """
+    Persist applications and document metadata to SQLite through a batching write queue
+
+    submit() validates and deduplicates on NIK, then hands the record to a
+    single writer thread which commits queued records in batches inside one
+    WAL-mode transaction. Each submission returns a Future that resolves
+    once its batch is durable.
+    """
+
+    def __init__(self, db_path=DEFAULT_INTAKE_DB, batch_size=1000, flush_interval=0.05,
+                 expected_applications=1_000_000):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._pending = set()
+        self._queue = queue.Queue()
+        self._bloom = BloomFilter(expected_items=expected_applications)
+        self.stats = {"submitted": 0, "duplicates": 0, "committed": 0, "batches": 0}
+
+        self._reader = self._connect()
+        self._reader.executescript(SCHEMA)
+        for (nik,) in self._reader.execute("SELECT nik FROM applications"):
+            self._bloom.add(nik)
+
+        self._writer = threading.Thread(target=self._write_loop, name="intake-writer", daemon=True)
+        self._closed = False
+        self._writer.start()
+
+    def _connect(self):
+        connection = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute("PRAGMA busy_timeout=5000")
+        return connection
+
+    def is_duplicate(self, nik):
+        """
+        Check whether an application with this NIK exists or is queued
+
+        Parameters:
+        - nik: 16-digit KTP number
+
+        Returns:
+        - bool
+        """
+        with self._lock:
+            return self._is_duplicate_locked(nik)
+
+    def _is_duplicate_locked(self, nik):
+        # The Bloom filter rules out most new NIKs; only possible hits reach the index
+        if nik not in self._bloom:
+            return False
+        if nik in self._pending:
+            return True
+        row = self._reader.execute("SELECT 1 FROM applications WHERE nik = ?", (nik,)).fetchone()
+        return row is not None
+
+    def submit(self, application, documents=()):
+        """
+        Queue one application and its document metadata for writing
+
+        Parameters:
+        - application: dict with the APPLICATION_FIELDS keys (nik is required)
+        - documents: iterable of dicts with the DOCUMENT_FIELDS keys
+
+        Returns:
+        - concurrent.futures.Future resolving to 'accepted' once committed;
+          invalid or duplicate submissions resolve immediately with 'invalid'
+          or 'duplicate'
+        """
+        if self._closed:
+            raise RuntimeError("Intake store is closed")
+
+        future = Future()
+        nik = str(application.get("nik", "")).strip()
+
+        if not NIK_PATTERN.match(nik):
+            future.set_result("invalid")
+            return future
+
+        with self._lock:
+            self.stats["submitted"] += 1
+            if self._is_duplicate_locked(nik):
+                self.stats["duplicates"] += 1
+                future.set_result("duplicate")
+                return future
+
+            self._bloom.add(nik)
+            self._pending.add(nik)
+
+        row = tuple(nik if field == "nik" else application.get(field) for field in APPLICATION_FIELDS)
+        document_rows = [
+            (nik,) + tuple(document.get(field) for field in DOCUMENT_FIELDS) for document in documents
+        ]
+        self._queue.put((row, document_rows, future))
+
+        return future
+
+    def _write_loop(self):
+        connection = self._connect()
+        application_sql = (
+            f"INSERT OR IGNORE INTO applications ({', '.join(APPLICATION_FIELDS)}, submitted_at) "
+            f"VALUES ({', '.join('?' * len(APPLICATION_FIELDS))}, ?)"
+        )
+        document_sql = (
+            f"INSERT INTO documents (nik, {', '.join(DOCUMENT_FIELDS)}) "
+            f"VALUES (?, {', '.join('?' * len(DOCUMENT_FIELDS))})"
+        )
+
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+
+            # Gather everything already queued, waiting briefly for a fuller batch
+            batch = [item]
+            deadline = time.monotonic() + self.flush_interval
+            stop = False
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=max(timeout, 0)) if timeout > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+
+            self._commit_batch(connection, application_sql, document_sql, batch)
+            if stop:
+                break
+
+        connection.close()
+
+    def _commit_batch(self, connection, application_sql, document_sql, batch):
+        # Flush markers carry no row; they resolve once everything before them is written
+        records = [entry for entry in batch if entry[0] is not None]
+        markers = [future for row, _, future in batch if row is None]
+        submitted_at = time.time()
+
+        try:
+            if records:
+                connection.execute("BEGIN IMMEDIATE")
+                connection.executemany(application_sql, [row + (submitted_at,) for row, _, _ in records])
+                connection.executemany(document_sql, [doc for _, docs, _ in records for doc in docs])
+                connection.execute("COMMIT")
+        except Exception as error:
+            # BEGIN itself may have failed (e.g. database is locked), leaving
+            # nothing to roll back; the futures must be resolved either way,
+            # or their submitters wait forever
+            if connection.in_transaction:
+                try:
+                    connection.execute("ROLLBACK")
+                except sqlite3.Error:
+                    pass
+            for _, _, future in records:
+                future.set_exception(error)
+        else:
+            self.stats["committed"] += len(records)
+            self.stats["batches"] += 1 if records else 0
+            for _, _, future in records:
+                future.set_result("accepted")
+        finally:
+            with self._lock:
+                self._pending.difference_update(row[0] for row, _, _ in records)
+            for future in markers:
+                future.set_result("flushed")
+
+    def flush(self, timeout=None):
+        """
+        Block until every submission queued so far has been committed
+
+        Parameters:
+        - timeout: optional maximum wait in seconds
+        """
+        marker = Future()
+        self._queue.put((None, [], marker))
+        marker.result(timeout=timeout)
+
+    def count(self):
+        """
+        Return the number of committed applications
+        """
+        with self._lock:
+            return self._reader.execute("SELECT COUNT(*) FROM applications").fetchone()[0]
+
+    def close(self):
+        """
+        Flush pending writes and stop the writer thread
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._writer.join()
+        self._reader.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
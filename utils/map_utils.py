@@ -1,54 +1,14 @@
 import streamlit as st
 import pandas as pd
-import folium
-from streamlit_folium import folium_static
 import numpy as np
-from folium.plugins import MarkerCluster, HeatMap
+from core.geo import generate_indonesia_coordinates
+from utils.profiling import timed, profiled_fragment
+from utils.views import select_rows
 
-def generate_indonesia_coordinates():
-    """
-    Generate approximate coordinates for Indonesian provinces for the map
-    In a real application, these would be actual coordinates
-    """
-    provinces = {
-        "Aceh": [4.695135, 96.749397],
-        "Sumatera Utara": [2.1153547, 99.5450974],
-        "Sumatera Barat": [-0.7399397, 100.8000051],
-        "Riau": [0.2933469, 101.7068294],
-        "Jambi": [-1.4851831, 102.4380581],
-        "Sumatera Selatan": [-3.3194374, 103.914399],
-        "Bengkulu": [-3.5778471, 102.3463875],
-        "Lampung": [-4.5585849, 105.4068079],
-        "Kepulauan Bangka Belitung": [-2.7410513, 106.4405872],
-        "Kepulauan Riau": [3.9456514, 108.1428669],
-        "DKI Jakarta": [-6.1744651, 106.822745],
-        "Jawa Barat": [-6.8895721, 107.6400872],
-        "Jawa Tengah": [-7.1562833, 110.1402594],
-        "DI Yogyakarta": [-7.7955798, 110.3694896],
-        "Jawa Timur": [-7.5360639, 112.2384017],
-        "Banten": [-6.4058172, 106.0640179],
-        "Bali": [-8.4095178, 115.188916],
-        "Nusa Tenggara Barat": [-8.6529334, 117.3616476],
-        "Nusa Tenggara Timur": [-8.6573819, 121.0793705],
-        "Kalimantan Barat": [-0.2787808, 111.4752851],
-        "Kalimantan Tengah": [-1.6814878, 113.3823545],
-        "Kalimantan Selatan": [-3.0926415, 115.2837585],
-        "Kalimantan Timur": [0.5386586, 116.419389],
-        "Kalimantan Utara": [3.0730929, 116.0413889],
-        "Sulawesi Utara": [0.6246932, 123.9750018],
-        "Sulawesi Tengah": [-1.4300254, 121.4456179],
-        "Sulawesi Selatan": [-3.6687994, 119.9740534],
-        "Sulawesi Tenggara": [-4.14491, 122.174605],
-        "Gorontalo": [0.6999372, 122.4467238],
-        "Sulawesi Barat": [-2.8441371, 119.2320784],
-        "Maluku": [-3.2384616, 130.1452734],
-        "Maluku Utara": [1.5709993, 127.8087693],
-        "Papua Barat": [-1.3361154, 133.1747162],
-        "Papua": [-4.269928, 138.0803529]
-    }
-    
-    return provinces
+# folium and streamlit_folium are imported inside the functions that draw a
+# map, so pages without a map do not pay for loading them
 
+@timed("map")
 def create_placement_map(opportunities_df):
     """
     Create an interactive map showing SPPI placement opportunities across Indonesia
@@ -59,6 +19,9 @@ def create_placement_map(opportunities_df):
     Returns:
     - folium map object
     """
+    import folium
+    from folium.plugins import MarkerCluster
+    
     # Create a base map centered on Indonesia
     m = folium.Map(location=[-2.5, 118], zoom_start=5, tiles="OpenStreetMap")
     
@@ -122,6 +85,7 @@ def create_placement_map(opportunities_df):
     
     return m
 
+@timed("map")
 def create_nutrition_heatmap(nutrition_data):
     """
     Create a heatmap showing nutrition priority areas across Indonesia
@@ -132,6 +96,9 @@ def create_nutrition_heatmap(nutrition_data):
     Returns:
     - folium map object
     """
+    import folium
+    from folium.plugins import HeatMap
+    
     # Create a base map centered on Indonesia
     m = folium.Map(location=[-2.5, 118], zoom_start=5, tiles="OpenStreetMap")
     
@@ -192,13 +159,83 @@ def create_nutrition_heatmap(nutrition_data):
     
     return m
 
-def display_map_with_filters(opportunities_df, key_prefix="placement"):
+@timed("map")
+def create_density_overlay_map(raster, opacity=0.85):
+    """
+    Create a map showing a server-side rendered density image instead of raw points
+    
+    Parameters:
+    - raster: dict returned by DensityRenderer.render
+    - opacity: opacity of the density image
+    
+    Returns:
+    - folium map object
+    """
+    import folium
+    
+    west, south, east, north = raster["extent"]
+    bounds = [[south, west], [north, east]]
+    
+    m = folium.Map(location=[(south + north) / 2, (west + east) / 2], tiles="OpenStreetMap")
+    folium.raster_layers.ImageOverlay(
+        image=raster["image"],
+        bounds=bounds,
+        opacity=opacity,
+        name="Kepadatan"
+    ).add_to(m)
+    m.fit_bounds(bounds)
+    
+    return m
+
+@timed("render")
+def folium_static(fig, width=700, height=500):
+    """
+    Render a folium map in the page, importing streamlit_folium on first use
+    
+    Parameters:
+    - fig: folium map object
+    - width, height: size of the map in pixels
+    """
+    from streamlit_folium import folium_static as render
+    
+    return render(fig, width=width, height=height)
+
+def filter_placements(opportunities_df, provinces=None, specializations=None, min_priority=1,
+                      remote_area=None, housing_provided=None):
+    """
+    Select the placement opportunities matching the map filters
+    
+    Parameters:
+    - opportunities_df: Pandas DataFrame with placement opportunities
+    - provinces, specializations: lists of allowed values (empty or None for all)
+    - min_priority: minimum priority level
+    - remote_area, housing_provided: True or False to keep only those rows, None for all
+    
+    Returns:
+    - Pandas DataFrame with only the matching rows
+    """
+    # One combined mask and a single take, instead of a copy per filter
+    rows = select_rows(
+        opportunities_df,
+        isin={'province': provinces, 'specialization': specializations},
+        at_least={'priority_level': min_priority},
+        equals={'remote_area': remote_area, 'housing_provided': housing_provided}
+    )
+    return opportunities_df.iloc[rows]
+
+@profiled_fragment
+def display_map_with_filters(opportunities_df, key_prefix="placement", cube=None):
     """
     Display a map with various filters for SPPI placement opportunities
     
+    Runs as a fragment: changing one of its filters reruns only the map and
+    its metrics, not the page around it.
+    
     Parameters:
     - opportunities_df: Pandas DataFrame with placement opportunities
     - key_prefix: String prefix for session state keys to avoid conflicts
+    - cube: optional PlacementCube over the same opportunities; when given, the
+      summary metrics are read from the cube instead of the filtered rows
     """
     st.subheader("Peta Peluang Penempatan SPPI 2025")
     
@@ -249,25 +286,16 @@ def display_map_with_filters(opportunities_df, key_prefix="placement"):
     )
     
     # Apply filters
-    filtered_df = opportunities_df.copy()
-    
-    if selected_provinces:
-        filtered_df = filtered_df[filtered_df['province'].isin(selected_provinces)]
-        
-    if selected_specializations:
-        filtered_df = filtered_df[filtered_df['specialization'].isin(selected_specializations)]
-        
-    filtered_df = filtered_df[filtered_df['priority_level'] >= min_priority]
-    
-    if remote_filter == "Hanya Area Terpencil":
-        filtered_df = filtered_df[filtered_df['remote_area'] == True]
-    elif remote_filter == "Kecuali Area Terpencil":
-        filtered_df = filtered_df[filtered_df['remote_area'] == False]
-        
-    if housing_filter == "Ya":
-        filtered_df = filtered_df[filtered_df['housing_provided'] == True]
-    elif housing_filter == "Tidak":
-        filtered_df = filtered_df[filtered_df['housing_provided'] == False]
+    remote_area = {"Hanya Area Terpencil": True, "Kecuali Area Terpencil": False}.get(remote_filter)
+    housing_provided = {"Ya": True, "Tidak": False}.get(housing_filter)
+    filtered_df = filter_placements(
+        opportunities_df,
+        provinces=selected_provinces,
+        specializations=selected_specializations,
+        min_priority=min_priority,
+        remote_area=remote_area,
+        housing_provided=housing_provided
+    )
     
     # Display map
     if not filtered_df.empty:
@@ -279,16 +307,29 @@ def display_map_with_filters(opportunities_df, key_prefix="placement"):
         
     # Show stats about the filtered opportunities
     if not filtered_df.empty:
+        if cube is not None:
+            stats = cube.totals({
+                "province": selected_provinces,
+                "specialization": selected_specializations,
+                "priority_level": range(min_priority, 6),
+                "remote_area": remote_area,
+                "housing_provided": housing_provided
+            })
+            total_positions = stats["positions"]
+            total_districts = stats["districts"]
+            avg_priority = stats["mean_priority"]
+        else:
+            total_positions = filtered_df['positions_available'].sum()
+            total_districts = filtered_df['district'].nunique()
+            avg_priority = filtered_df['priority_level'].mean()
+        
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            total_positions = filtered_df['positions_available'].sum()
             st.metric("Total Posisi", f"{total_positions}")
             
         with col2:
-            total_districts = filtered_df['district'].nunique()
             st.metric("Total Kabupaten/Kota", f"{total_districts}")
             
         with col3:
-            avg_priority = filtered_df['priority_level'].mean()
             st.metric("Rata-rata Prioritas", f"{avg_priority:.1f}/5")
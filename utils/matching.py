@@ -0,0 +1,263 @@
+import time
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from core.geo import unit_vectors, great_circle_km
+
+def build_preferences(applicants_df, placements_df, max_choices=10, chunk_size=8192):
+    """
+    Build sparse applicant preference lists over placement locations
+
+    An applicant only ranks placements in their own specialization, and
+    only ranks remote areas when willing to be placed there. Acceptable
+    placements are ranked by distance from home, nearest first.
+
+    Parameters:
+    - applicants_df: Pandas DataFrame with specialization, willing_remote, latitude, longitude
+    - placements_df: Pandas DataFrame with specialization, remote_area, latitude, longitude
+    - max_choices: maximum length of each preference list
+    - chunk_size: number of applicants scored at once, to bound memory
+
+    Returns:
+    - scipy CSR matrix of shape (n_applicants, n_placements) where the stored
+      value is the preference rank (1 = first choice)
+    """
+    n_applicants = len(applicants_df)
+    n_placements = len(placements_df)
+
+    spec_codes, _ = pd.factorize(
+        pd.concat([applicants_df["specialization"], placements_df["specialization"]])
+    )
+    applicant_spec = spec_codes[:n_applicants]
+    placement_spec = spec_codes[n_applicants:]
+
+    willing_remote = applicants_df["willing_remote"].to_numpy(dtype=bool)
+    remote_area = placements_df["remote_area"].to_numpy(dtype=bool)
+
+    applicant_xyz = unit_vectors(applicants_df["latitude"], applicants_df["longitude"])
+    placement_xyz = unit_vectors(placements_df["latitude"], placements_df["longitude"])
+
+    rows, cols, ranks = [], [], []
+
+    # Only placements of the same specialization are acceptable, so each
+    # specialization is scored as its own much smaller block
+    for code in np.unique(applicant_spec):
+        group_applicants = np.flatnonzero(applicant_spec == code)
+        group_placements = np.flatnonzero(placement_spec == code)
+        if len(group_placements) == 0:
+            continue
+
+        k = min(max_choices, len(group_placements))
+        group_remote = remote_area[group_placements]
+
+        for start in range(0, len(group_applicants), chunk_size):
+            chunk = group_applicants[start:start + chunk_size]
+
+            similarity = applicant_xyz[chunk] @ placement_xyz[group_placements].T
+            similarity[np.ix_(~willing_remote[chunk], group_remote)] = -np.inf
+
+            # Partial sort to the k nearest, then order those k by distance
+            if k < len(group_placements):
+                nearest = np.argpartition(-similarity, k - 1, axis=1)[:, :k]
+            else:
+                nearest = np.tile(np.arange(len(group_placements)), (len(chunk), 1))
+            nearest_similarity = np.take_along_axis(similarity, nearest, axis=1)
+            order = np.argsort(-nearest_similarity, axis=1, kind="stable")
+            nearest = np.take_along_axis(nearest, order, axis=1)
+            valid = np.isfinite(np.take_along_axis(nearest_similarity, order, axis=1))
+
+            rows.append(np.broadcast_to(chunk[:, None], nearest.shape)[valid])
+            cols.append(group_placements[nearest[valid]])
+            # valid entries are a prefix of each sorted row, so ranks are 1..count
+            ranks.append(np.cumsum(valid, axis=1)[valid].astype(np.int16))
+
+    if rows:
+        rows, cols, ranks = np.concatenate(rows), np.concatenate(cols), np.concatenate(ranks)
+    else:
+        rows, cols, ranks = (np.zeros(0, dtype=np.int64),) * 2 + (np.zeros(0, dtype=np.int16),)
+
+    return sparse.csr_matrix((ranks, (rows, cols)), shape=(n_applicants, n_placements))
+
+def ranked_choices(preferences):
+    """
+    Return the placement indices of every preference list in rank order
+
+    Parameters:
+    - preferences: CSR matrix from build_preferences
+
+    Returns:
+    - numpy array aligned with preferences.indptr, holding each row's placements by rank
+    """
+    rows = np.repeat(np.arange(preferences.shape[0]), np.diff(preferences.indptr))
+    return preferences.indices[np.lexsort((preferences.data, rows))]
+
+def deferred_acceptance(preferences, applicant_scores, capacities):
+    """
+    Run applicant-proposing deferred acceptance with placement capacities
+
+    Each round every unmatched applicant proposes to their next choice, and
+    every placement keeps its highest-scoring proposers up to capacity. The
+    rounds are vectorized, so the number of Python iterations is bounded by
+    the preference list length rather than the number of applicants.
+
+    Parameters:
+    - preferences: CSR matrix from build_preferences
+    - applicant_scores: array of placement-side priority per applicant (higher is better)
+    - capacities: array of positions available per placement
+
+    Returns:
+    - numpy array with the matched placement index per applicant (-1 when unmatched)
+    """
+    n_applicants = preferences.shape[0]
+    indptr = preferences.indptr
+    indices = ranked_choices(preferences)
+    row_length = np.diff(indptr)
+
+    scores = np.asarray(applicant_scores, dtype=float)
+    capacities = np.asarray(capacities, dtype=np.int64)
+
+    next_choice = np.zeros(n_applicants, dtype=np.int64)
+    held = np.full(n_applicants, -1, dtype=np.int64)
+
+    while True:
+        proposers = np.flatnonzero((held == -1) & (next_choice < row_length))
+        if len(proposers) == 0:
+            break
+
+        targets = indices[indptr[proposers] + next_choice[proposers]]
+        next_choice[proposers] += 1
+
+        holders = np.flatnonzero(held >= 0)
+        candidates = np.concatenate([holders, proposers])
+        candidate_targets = np.concatenate([held[holders], targets])
+
+        # Group candidates by placement, best score first (ties by applicant index)
+        order = np.lexsort((candidates, -scores[candidates], candidate_targets))
+        candidates = candidates[order]
+        candidate_targets = candidate_targets[order]
+
+        group_start = np.r_[0, np.flatnonzero(np.diff(candidate_targets)) + 1]
+        group_sizes = np.diff(np.r_[group_start, len(candidates)])
+        position_in_group = np.arange(len(candidates)) - np.repeat(group_start, group_sizes)
+
+        accepted = position_in_group < capacities[candidate_targets]
+
+        held[candidates] = -1
+        held[candidates[accepted]] = candidate_targets[accepted]
+
+    return held
+
+def min_cost_assignment(preferences, capacities, unassigned_cost=None):
+    """
+    Assign applicants to placements minimizing the total preference rank
+
+    Placements are expanded into one column per position and solved as a
+    sparse minimum-weight bipartite matching. Every applicant also gets a
+    private "unassigned" column, so a full matching always exists.
+
+    Parameters:
+    - preferences: CSR matrix from build_preferences (values are the costs)
+    - capacities: array of positions available per placement
+    - unassigned_cost: cost of leaving an applicant unmatched (defaults to max rank + 1)
+
+    Returns:
+    - numpy array with the matched placement index per applicant (-1 when unmatched)
+    """
+    # Imported on first use, as the csgraph module is slow to load
+    from scipy.sparse.csgraph import min_weight_full_bipartite_matching
+
+    n_applicants, n_placements = preferences.shape
+    capacities = np.asarray(capacities, dtype=np.int64)
+    if unassigned_cost is None:
+        unassigned_cost = float(preferences.data.max()) + 1 if preferences.nnz else 1.0
+
+    coo = preferences.tocoo()
+    slot_offset = np.r_[0, np.cumsum(capacities)]
+    total_slots = int(slot_offset[-1])
+
+    # Repeat every preference edge once per position of its placement
+    copies = capacities[coo.col]
+    rows = np.repeat(coo.row, copies)
+    edge_start = np.repeat(slot_offset[coo.col], copies)
+    within = np.arange(len(rows)) - np.repeat(np.r_[0, np.cumsum(copies)[:-1]], copies)
+    cols = edge_start + within
+    costs = np.repeat(coo.data.astype(float), copies)
+
+    dummy = np.arange(n_applicants)
+    biadjacency = sparse.csr_matrix(
+        (
+            np.concatenate([costs, np.full(n_applicants, float(unassigned_cost))]),
+            (np.concatenate([rows, dummy]), np.concatenate([cols, total_slots + dummy]))
+        ),
+        shape=(n_applicants, total_slots + n_applicants)
+    )
+
+    matched_columns = min_weight_full_bipartite_matching(biadjacency)[1] \
+        if n_applicants else np.zeros(0, dtype=np.int64)
+
+    assignment = np.full(n_applicants, -1, dtype=np.int64)
+    real = matched_columns < total_slots
+    assignment[real] = np.searchsorted(slot_offset, matched_columns[real], side="right") - 1
+
+    return assignment
+
+def match_applicants(applicants_df, placements_df, method="deferred_acceptance", max_choices=10):
+    """
+    Match applicants to placement slots
+
+    Parameters:
+    - applicants_df: Pandas DataFrame of applicants (see load_applicant_pool)
+    - placements_df: Pandas DataFrame of placement opportunities
+    - method: 'deferred_acceptance' (stable matching) or 'min_cost' (minimum total preference rank)
+    - max_choices: preference list length per applicant
+
+    Returns:
+    - tuple (matches_df, summary): one row per applicant with the matched
+      placement and its preference rank, and a dict of match statistics
+    """
+    start = time.perf_counter()
+
+    placements = placements_df.reset_index(drop=True)
+    preferences = build_preferences(applicants_df, placements, max_choices=max_choices)
+    capacities = placements["positions_available"].to_numpy()
+
+    if method == "deferred_acceptance":
+        assignment = deferred_acceptance(preferences, applicants_df["selection_score"].to_numpy(), capacities)
+    elif method == "min_cost":
+        assignment = min_cost_assignment(preferences, capacities)
+    else:
+        raise ValueError(f"Unknown matching method: {method}")
+
+    matched = assignment >= 0
+    rank = np.zeros(len(assignment), dtype=np.int64)
+    if matched.any():
+        rank[matched] = np.asarray(
+            preferences[np.flatnonzero(matched), assignment[matched]]
+        ).ravel()
+
+    matches_df = pd.DataFrame({
+        "applicant_id": applicants_df["applicant_id"].to_numpy(),
+        "placement_index": assignment,
+        "preference_rank": np.where(matched, rank, np.nan)
+    })
+    for column in ["province", "district", "specialization"]:
+        matches_df[column] = placements[column].to_numpy()[np.where(matched, assignment, 0)]
+        matches_df.loc[~matched, column] = None
+
+    distance = great_circle_km(
+        unit_vectors(applicants_df["latitude"], applicants_df["longitude"])[matched],
+        unit_vectors(placements["latitude"], placements["longitude"])[assignment[matched]]
+    )
+
+    summary = {
+        "method": method,
+        "applicants": len(assignment),
+        "matched": int(matched.sum()),
+        "positions": int(capacities.sum()),
+        "first_choice_share": float((rank[matched] == 1).mean()) if matched.any() else 0.0,
+        "mean_rank": float(rank[matched].mean()) if matched.any() else float("nan"),
+        "mean_distance_km": float(distance.mean()) if matched.any() else float("nan"),
+        "elapsed_seconds": time.perf_counter() - start
+    }
+
+    return matches_df, summary
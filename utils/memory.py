@@ -0,0 +1,145 @@
+import sys
+import types
+import numpy as np
+import pandas as pd
+import streamlit as st
+from streamlit import runtime
+from streamlit.runtime.caching import cache_data_api, cache_resource_api
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+from core.cache import memoized_functions
+from utils.figure_cache import figure_cache_entries
+
+# Streamlit keeps the sessions and cache entries in private attributes; a
+# release that renames them makes the affected rows "unavailable" instead
+# of breaking the page
+_INTERNAL_ERRORS = (AttributeError, KeyError, TypeError)
+
+# Objects not followed when sizing: code, modules and classes are shared
+# by everything and are not data held by the object being sized
+_OPAQUE_TYPES = (types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType, type)
+
+def object_bytes(value, seen=None):
+    """
+    Approximate bytes held by an object and everything it references
+
+    DataFrames, Series and Index count their deep memory usage and numpy
+    arrays their buffer; containers and plain objects are followed
+    recursively. Objects reachable twice are counted once.
+
+    Parameters:
+    - value: any object
+    - seen: ids already counted (internal)
+
+    Returns:
+    - int bytes
+    """
+    if seen is None:
+        seen = set()
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+
+    if isinstance(value, (pd.DataFrame, pd.Series, pd.Index)):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum()) if isinstance(usage, pd.Series) else int(usage)
+    if isinstance(value, np.ndarray):
+        return sys.getsizeof(value) if value.base is not None else int(value.nbytes) + sys.getsizeof(value)
+    if isinstance(value, _OPAQUE_TYPES):
+        return 0
+
+    size = sys.getsizeof(value, 0)
+    if isinstance(value, dict):
+        size += sum(object_bytes(key, seen) + object_bytes(item, seen) for key, item in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(object_bytes(item, seen) for item in value)
+    elif hasattr(value, "__dict__") and not isinstance(value, (str, bytes)):
+        size += object_bytes(vars(value), seen)
+    return size
+
+def session_memory():
+    """
+    Bytes held in session state by every active session
+
+    Outside a running server (e.g. in AppTest), or when Streamlit's session
+    manager cannot be read, only the current session is reported.
+
+    Returns:
+    - Pandas DataFrame with session, keys, bytes and current, largest first
+    """
+    ctx = get_script_run_ctx()
+    current_id = ctx.session_id if ctx is not None else "-"
+    states = []
+    # The runtime does not expose the sessions publicly; its own session
+    # state stats provider reads them the same way
+    try:
+        if runtime.exists():
+            for info in runtime.get_instance()._session_mgr.list_active_sessions():
+                states.append((info.session.id, dict(info.session.session_state.filtered_state)))
+    except _INTERNAL_ERRORS:
+        states = []
+    if not states:
+        states = [(current_id, st.session_state.to_dict())]
+
+    rows = []
+    for session_id, state in states:
+        rows.append({
+            "session": session_id,
+            "keys": len(state),
+            "bytes": object_bytes(dict(state)),
+            "current": session_id == current_id
+        })
+    return pd.DataFrame(rows, columns=["session", "keys", "bytes", "current"]).sort_values("bytes", ascending=False)
+
+def _cache_data_rows():
+    # Streamlit keeps one cache per decorated function, keyed by function and then by cache key
+    provider = cache_data_api.get_data_cache_stats_provider()
+    with provider._caches_lock:
+        caches = [cache for caches in provider._function_caches.values() for cache in caches.values()]
+    return [
+        {"cache": "st.cache_data", "function": stat.cache_name, "bytes": stat.byte_length}
+        for cache in caches for stats in cache.get_stats().values() for stat in stats
+    ]
+
+def _cache_resource_rows():
+    provider = cache_resource_api.get_resource_cache_stats_provider()
+    with provider._caches_lock:
+        caches = [cache for caches in provider._function_caches.values() for cache in caches.values()]
+    rows = []
+    for cache in caches:
+        with cache._mem_cache_lock:
+            entries = list(cache._mem_cache.values())
+        rows.extend(
+            {"cache": "st.cache_resource", "function": cache.display_name, "bytes": object_bytes(entry.value)}
+            for entry in entries
+        )
+    return rows
+
+def cache_memory():
+    """
+    Bytes held per cache entry by the caches of this process, shared by all sessions
+
+    st.cache_data entries are counted as Streamlit stores them (pickled),
+    st.cache_resource, core.cache.memoize and figure cache entries by their
+    in-memory size. A Streamlit cache whose internals cannot be read gets a
+    single "unavailable" row without bytes.
+
+    Returns:
+    - Pandas DataFrame with cache, function and bytes, one row per entry, largest first
+    """
+    rows = []
+
+    for cache_name, read_rows in (("st.cache_data", _cache_data_rows), ("st.cache_resource", _cache_resource_rows)):
+        try:
+            rows.extend(read_rows())
+        except _INTERNAL_ERRORS:
+            rows.append({"cache": cache_name, "function": "unavailable", "bytes": None})
+
+    for function in memoized_functions():
+        rows.extend(
+            {"cache": "memoize", "function": f"{function.__module__}.{function.__qualname__}", "bytes": object_bytes(value)}
+            for value in function.cache_values()
+        )
+
+    rows.extend({"cache": "figure_cache", "function": builder, "bytes": size} for builder, size in figure_cache_entries())
+
+    return pd.DataFrame(rows, columns=["cache", "function", "bytes"]).sort_values("bytes", ascending=False)
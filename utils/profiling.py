@@ -0,0 +1,299 @@
+import cProfile
+import functools
+import marshal
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+import pandas as pd
+import streamlit as st
+
+# Query parameter switching profiling on for a session: ?profile=1 (timings),
+# ?profile=cprofile (timings plus a cProfile dump), ?profile=0 (off)
+PROFILE_PARAM = "profile"
+PROFILE_MODES = {"1": "timing", "true": "timing", "timing": "timing", "cprofile": "cprofile"}
+
+# cProfile dumps kept per process, newest last
+MAX_PROFILE_DUMPS = 20
+
+# Rerun breakdowns kept per session for the diagnostics page
+MAX_PROFILE_HISTORY = 20
+
+# Timings of the rerun running in this thread (Streamlit runs each session's script in its own thread);
+# records is None whenever profiling is off, which is all the instrumentation checks
+_local = threading.local()
+
+_dumps = deque(maxlen=MAX_PROFILE_DUMPS)
+_dumps_lock = threading.Lock()
+
+# Streamlit commands that serialize figures and tables, timed as 'render'
+RENDER_COMMANDS = ("plotly_chart", "pyplot", "dataframe")
+
+# The st module is shared by every session, so its render commands are only
+# replaced while at least one profiled rerun is running
+_element_timers = {"reruns": 0, "originals": {}}
+_element_timers_lock = threading.Lock()
+
+def profiling_mode():
+    """
+    Profiling mode of the current session
+
+    The query parameter is remembered in session state, so the mode sticks
+    when navigating to pages whose URL does not carry it.
+
+    Returns:
+    - None (off), 'timing' or 'cprofile'
+    """
+    value = st.query_params.get(PROFILE_PARAM)
+    if value is not None:
+        st.session_state["_profiling_mode"] = PROFILE_MODES.get(value.lower())
+    return st.session_state.get("_profiling_mode")
+
+def _enter():
+    _local.stack.append(0.0)
+    return time.perf_counter()
+
+def _exit(category, name, start):
+    duration = time.perf_counter() - start
+    children = _local.stack.pop()
+    _local.stack[-1] += duration
+    _local.records.append({
+        "category": category,
+        "name": name,
+        "depth": len(_local.stack) - 1,
+        "start": start,
+        "ms": duration * 1000,
+        "self_ms": (duration - children) * 1000
+    })
+
+def timed(category, name=None):
+    """
+    Decorator recording a function's run time in the current rerun's profile
+
+    When profiling is off the wrapper costs one attribute lookup per call.
+
+    Parameters:
+    - category: 'loader', 'map', 'chart', 'serialize', 'render', 'fragment' or 'section'
+    - name: label in the breakdown (default: the function name)
+    """
+    def decorate(function):
+        label = name or function.__name__
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if getattr(_local, "records", None) is None:
+                return function(*args, **kwargs)
+            start = _enter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                _exit(category, label, start)
+
+        return wrapper
+
+    return decorate
+
+@contextmanager
+def profile_block(category, name):
+    """
+    Context manager recording a block's run time in the current rerun's profile
+    """
+    if getattr(_local, "records", None) is None:
+        yield
+        return
+    start = _enter()
+    try:
+        yield
+    finally:
+        _exit(category, name, start)
+
+def mark_section(name):
+    """
+    Start a named page section
+
+    The section runs until the next mark_section call or the end of the
+    rerun, so a page marks its parts with one line instead of indenting
+    them into blocks. Pages use section_header, which also shows the header.
+
+    Parameters:
+    - name: section label in the breakdown
+    """
+    if getattr(_local, "records", None) is None:
+        return
+    _close_section()
+    _local.section = (name, _enter())
+
+def section_header(title):
+    """
+    Show a page header and start the profile section of the same name
+
+    Parameters:
+    - title: header text, also the section label in the breakdown
+    """
+    mark_section(title)
+    st.header(title)
+
+def _close_section():
+    section = getattr(_local, "section", None)
+    if section is not None:
+        _local.section = None
+        _exit("section", *section)
+
+@contextmanager
+def _timed_render_commands():
+    """
+    Time the Streamlit render commands as 'render' for the duration of a profiled rerun
+
+    The commands are patched on the st module when the first profiled rerun
+    starts and restored when the last one ends; other sessions' reruns in
+    the meantime only pay the wrapper's attribute lookup.
+    """
+    with _element_timers_lock:
+        if _element_timers["reruns"] == 0:
+            for command in RENDER_COMMANDS:
+                original = getattr(st, command)
+                _element_timers["originals"][command] = original
+                setattr(st, command, timed("render", command)(original))
+        _element_timers["reruns"] += 1
+    try:
+        yield
+    finally:
+        with _element_timers_lock:
+            _element_timers["reruns"] -= 1
+            if _element_timers["reruns"] == 0:
+                for command, original in _element_timers["originals"].items():
+                    setattr(st, command, original)
+                _element_timers["originals"].clear()
+
+def run_profiled(main, page):
+    """
+    Run a page's main() and, when profiling is on for the session, show its breakdown
+
+    Parameters:
+    - main: the page's main function
+    - page: page name for the breakdown and dumps
+    """
+    mode = profiling_mode()
+    if mode is None:
+        main()
+        return
+
+    _local.records, _local.stack, _local.section = [], [0.0], None
+    profiler = cProfile.Profile() if mode == "cprofile" else None
+    start = time.perf_counter()
+    try:
+        with _timed_render_commands():
+            if profiler is not None:
+                try:
+                    profiler.enable()
+                except ValueError:
+                    # Python 3.12+ allows one cProfile per process (sys.monitoring); when
+                    # another session's rerun holds it, this one is timed only
+                    profiler = None
+            main()
+            _close_section()
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        total_ms = (time.perf_counter() - start) * 1000
+        records, _local.records = _local.records, None
+
+    profile = {"page": page, "time": datetime.now(), "total_ms": total_ms, "records": records}
+    history = st.session_state.setdefault("_profile_history", [])
+    history.append(profile)
+    del history[:-MAX_PROFILE_HISTORY]
+
+    if profiler is not None:
+        profiler.create_stats()
+        with _dumps_lock:
+            _dumps.append({"page": page, "time": profile["time"], "total_ms": total_ms, "stats": profiler.stats})
+
+    display_profile(profile)
+
+def profiled_fragment(function):
+    """
+    st.fragment whose own reruns are profiled like a page run
+
+    Within a profiled page run the fragment is timed as 'fragment'; when
+    only the fragment reruns, that rerun gets its own breakdown and entry in
+    the session's history, labelled with the function name.
+
+    Parameters:
+    - function: fragment function, as for st.fragment
+
+    Returns:
+    - the fragment
+    """
+    timed_function = timed("fragment", function.__name__)(function)
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        if getattr(_local, "records", None) is not None:
+            return timed_function(*args, **kwargs)
+        run_profiled(functools.partial(function, *args, **kwargs), f"{function.__name__} (fragment)")
+
+    return st.fragment(wrapper)
+
+def profile_breakdown(profile):
+    """
+    Per-category totals of a rerun profile, by self time so nested timings are not counted twice
+
+    Returns:
+    - Pandas DataFrame with category, calls and ms, including 'other' for uninstrumented time
+    """
+    records = pd.DataFrame(profile["records"], columns=["category", "name", "depth", "start", "ms", "self_ms"])
+    breakdown = records.groupby("category").agg(calls=("name", "size"), ms=("self_ms", "sum")).reset_index()
+    other = pd.DataFrame([{"category": "other", "calls": 0, "ms": max(profile["total_ms"] - breakdown["ms"].sum(), 0)}])
+    return pd.concat([breakdown, other], ignore_index=True).sort_values("ms", ascending=False)
+
+def display_profile(profile):
+    """
+    Display the breakdown of one rerun in an expander
+    """
+    with st.expander(f"Profil Eksekusi: {profile['total_ms']:,.0f} ms", expanded=True):
+        breakdown = profile_breakdown(profile)
+        st.dataframe(breakdown.round({"ms": 1}), hide_index=True, use_container_width=True)
+
+        records = pd.DataFrame(profile["records"], columns=["category", "name", "depth", "start", "ms", "self_ms"])
+        if not records.empty:
+            # Records are appended when they finish; order them by start for a call-tree view
+            records = records.sort_values("start")
+            records["name"] = ["  " * depth + name for depth, name in zip(records["depth"], records["name"])]
+            st.dataframe(
+                records[["category", "name", "ms", "self_ms"]].round({"ms": 1, "self_ms": 1}),
+                hide_index=True,
+                use_container_width=True,
+                height=300
+            )
+
+def profile_dumps():
+    """
+    cProfile dumps recorded in this process, newest first
+    """
+    with _dumps_lock:
+        return list(reversed(_dumps))
+
+def dump_bytes(dump):
+    """
+    A cProfile dump in the .prof format of pstats.dump_stats, for snakeviz or other flame graph viewers
+    """
+    return marshal.dumps(dump["stats"])
+
+def top_functions(dump, limit=30, sort="cumulative"):
+    """
+    Slowest functions of a cProfile dump
+
+    Returns:
+    - Pandas DataFrame with function, calls, total and cumulative ms
+    """
+    rows = []
+    for (filename, line, function), (_, calls, total, cumulative, _) in dump["stats"].items():
+        rows.append({
+            "function": f"{function} ({filename}:{line})",
+            "calls": calls,
+            "total_ms": total * 1000,
+            "cumulative_ms": cumulative * 1000
+        })
+    column = "cumulative_ms" if sort == "cumulative" else "total_ms"
+    return pd.DataFrame(rows).sort_values(column, ascending=False).head(limit)
@@ -0,0 +1,277 @@
+import base64
+import struct
+import threading
+import zlib
+from collections import OrderedDict
+import numpy as np
+
+# Latitude limit of the Web Mercator projection used by folium and Plotly maps
+MAX_LATITUDE = 85.05112878
+
+# Default colour ramp for shaded densities, light to dark
+DENSITY_COLORS = ["#fff5eb", "#fdd0a2", "#fd8d3c", "#d94801", "#7f2704"]
+
+REDUCTIONS = ("count", "sum", "mean")
+
+def mercator_y(lat):
+    """
+    Project latitudes to Web Mercator y (in degree-like units, equal to lon at the equator)
+    """
+    lat = np.radians(np.clip(np.asarray(lat, dtype=np.float64), -MAX_LATITUDE, MAX_LATITUDE))
+    return np.degrees(np.log(np.tan(np.pi / 4 + lat / 2)))
+
+def inverse_mercator_y(y):
+    """
+    Latitude of a Web Mercator y
+    """
+    return np.degrees(2 * np.arctan(np.exp(np.radians(np.asarray(y, dtype=np.float64)))) - np.pi / 2)
+
+def tile_extent(z, x, y):
+    """
+    Longitude/latitude extent (west, south, east, north) of an XYZ map tile
+    """
+    n = 2 ** z
+    west, east = x / n * 360 - 180, (x + 1) / n * 360 - 180
+    north = float(inverse_mercator_y(180 - y / n * 360))
+    south = float(inverse_mercator_y(180 - (y + 1) / n * 360))
+    return west, south, east, north
+
+def aggregate(x, y, extent, width, height, values=None, how="count"):
+    """
+    Bin points into a width x height canvas covering an extent
+
+    Parameters:
+    - x, y: arrays of point coordinates, in the units of the extent
+    - extent: (x_min, y_min, x_max, y_max)
+    - width, height: canvas size in pixels
+    - values: array of point values (needed for 'sum' and 'mean')
+    - how: 'count', 'sum' or 'mean'
+
+    Returns:
+    - float numpy array of shape (height, width), row 0 at the top (y_max);
+      empty pixels are 0 for count and sum and NaN for mean
+    """
+    if how not in REDUCTIONS:
+        raise ValueError(f"Unknown reduction: {how}")
+    if how != "count" and values is None:
+        raise ValueError(f"Reduction '{how}' needs values")
+
+    x_min, y_min, x_max, y_max = extent
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    inside = (x >= x_min) & (x < x_max) & (y > y_min) & (y <= y_max)
+    col = ((x[inside] - x_min) / (x_max - x_min) * width).astype(np.int64)
+    row = ((y_max - y[inside]) / (y_max - y_min) * height).astype(np.int64)
+    pixel = np.minimum(row, height - 1) * width + np.minimum(col, width - 1)
+
+    counts = np.bincount(pixel, minlength=width * height).astype(np.float64)
+    if how == "count":
+        canvas = counts
+    else:
+        sums = np.bincount(pixel, weights=np.asarray(values, dtype=np.float64)[inside], minlength=width * height)
+        if how == "sum":
+            canvas = sums
+        else:
+            with np.errstate(invalid="ignore", divide="ignore"):
+                canvas = sums / counts
+
+    return canvas.reshape(height, width)
+
+def shade(canvas, colors=DENSITY_COLORS, how="eq_hist", alpha=210, span=None):
+    """
+    Map an aggregated canvas to an RGBA image
+
+    Parameters:
+    - canvas: array from aggregate
+    - colors: list of hex colours from low to high
+    - how: 'linear', 'log' or 'eq_hist' (histogram equalization, as in datashader)
+    - alpha: opacity (0-255) of non-empty pixels; empty pixels are transparent
+    - span: optional (low, high) value range for 'linear' and 'log'
+
+    Returns:
+    - uint8 numpy array of shape (height, width, 4)
+    """
+    filled = np.isfinite(canvas) & (canvas != 0)
+    levels = np.zeros(canvas.shape)
+
+    if filled.any():
+        data = canvas[filled]
+        if how == "eq_hist":
+            # Rank of each pixel among the distinct values, so every colour step holds similar pixel counts
+            distinct, inverse = np.unique(data, return_inverse=True)
+            cumulative = np.cumsum(np.bincount(inverse))
+            levels[filled] = (cumulative[inverse] - cumulative[0]) / max(cumulative[-1] - cumulative[0], 1)
+        else:
+            if how == "log":
+                data = np.log1p(np.maximum(data, 0))
+                span = None if span is None else tuple(np.log1p(np.maximum(span, 0)))
+            low, high = span if span is not None else (data.min(), data.max())
+            levels[filled] = np.clip((data - low) / (high - low), 0, 1) if high > low else 1.0
+
+    ramp = np.array([[int(c[i:i + 2], 16) for i in (1, 3, 5)] for c in colors], dtype=np.float64)
+    positions = np.linspace(0, 1, len(ramp))
+
+    image = np.zeros(canvas.shape + (4,), dtype=np.uint8)
+    for channel in range(3):
+        image[..., channel] = np.interp(levels, positions, ramp[:, channel]).round().astype(np.uint8)
+    image[..., 3] = np.where(filled, alpha, 0)
+
+    return image
+
+def encode_png(image):
+    """
+    Encode an RGBA uint8 image as PNG bytes (standard library only)
+    """
+    height, width = image.shape[:2]
+    # Every scanline starts with filter type 0
+    raw = np.hstack([np.zeros((height, 1), dtype=np.uint8), image.reshape(height, width * 4)]).tobytes()
+
+    def chunk(kind, payload):
+        return struct.pack(">I", len(payload)) + kind + payload + struct.pack(">I", zlib.crc32(kind + payload))
+
+    return (
+        b"\x89PNG\r\n\x1a\n" +
+        chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0)) +
+        chunk(b"IDAT", zlib.compress(raw, 6)) +
+        chunk(b"IEND", b"")
+    )
+
+def to_data_url(png):
+    """
+    Data URL of PNG bytes, for folium ImageOverlay and Plotly image layers
+    """
+    return "data:image/png;base64," + base64.b64encode(png).decode("ascii")
+
+class DensityRenderer:
+    """
+    Server-side density rendering of large point sets
+
+    Points are binned into a pixel canvas for the requested extent with a
+    count, sum or mean reduction and shaded to a PNG, so the browser only
+    receives one image however many points there are. Binning happens in
+    Web Mercator space, so images line up with folium and Plotly base maps.
+    Rendered images (views and XYZ tiles) are kept in an LRU cache.
+    """
+
+    def __init__(self, lon, lat, columns=None, max_images=256):
+        lon = np.asarray(lon, dtype=np.float64)
+        # Sorted by longitude, so an extent is cut with two binary searches
+        self.order = np.argsort(lon, kind="stable")
+        self.lon = lon[self.order]
+        self.y = mercator_y(np.asarray(lat)[self.order])
+        self.columns = {name: np.asarray(values, dtype=np.float64)[self.order] for name, values in (columns or {}).items()}
+
+        self.max_images = max_images
+        self._images = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.lon)
+
+    def bounds(self, mask=None, padding=0.02):
+        """
+        Longitude/latitude extent (west, south, east, north) of all or of the masked points
+
+        Parameters:
+        - mask: optional boolean array in the original point order
+        - padding: fraction of the width and height added on each side
+        """
+        lon, y = self.lon, self.y
+        if mask is not None:
+            mask = np.asarray(mask)[self.order]
+            lon, y = lon[mask], y[mask]
+        west, east = lon.min(), lon.max()
+        south, north = y.min(), y.max()
+        pad_x = (east - west) * padding or 0.1
+        pad_y = (north - south) * padding or 0.1
+        return (
+            float(west - pad_x), float(inverse_mercator_y(south - pad_y)),
+            float(east + pad_x), float(inverse_mercator_y(north + pad_y))
+        )
+
+    def aggregate(self, extent, width=512, height=512, how="count", column=None):
+        """
+        Aggregate the points inside a longitude/latitude extent
+
+        Parameters:
+        - extent: (west, south, east, north) in degrees
+        - width, height: canvas size in pixels
+        - how: 'count', 'sum' or 'mean'
+        - column: value column for 'sum' and 'mean'
+
+        Returns:
+        - float numpy array of shape (height, width)
+        """
+        west, south, east, north = extent
+        start, stop = np.searchsorted(self.lon, [west, east])
+        values = self.columns[column][start:stop] if column is not None else None
+
+        return aggregate(
+            self.lon[start:stop], self.y[start:stop],
+            (west, float(mercator_y(south)), east, float(mercator_y(north))),
+            width, height, values=values, how=how
+        )
+
+    def render(self, extent, width=512, height=512, how="count", column=None, shade_how="eq_hist",
+               colors=DENSITY_COLORS):
+        """
+        Render the points inside an extent to a PNG image (cached)
+
+        Parameters:
+        - extent: (west, south, east, north) in degrees
+        - width, height: image size in pixels
+        - how, column: reduction and value column, as in aggregate
+        - shade_how: 'linear', 'log' or 'eq_hist'
+        - colors: colour ramp from low to high
+
+        Returns:
+        - dict with 'image' (PNG data URL), 'extent', 'max' (largest pixel value)
+          and 'points' (points inside the extent)
+        """
+        extent = tuple(round(float(edge), 6) for edge in extent)
+        key = (extent, width, height, how, column, shade_how, tuple(colors))
+
+        with self._lock:
+            if key in self._images:
+                self._images.move_to_end(key)
+                return self._images[key]
+
+        canvas = self.aggregate(extent, width, height, how, column)
+        start, stop = np.searchsorted(self.lon, [extent[0], extent[2]])
+        y = self.y[start:stop]
+        points = int(((y > mercator_y(extent[1])) & (y <= mercator_y(extent[3]))).sum())
+        result = {
+            "image": to_data_url(encode_png(shade(canvas, colors, shade_how))),
+            "extent": extent,
+            "max": float(np.nanmax(canvas)) if np.isfinite(canvas).any() else 0.0,
+            "points": points
+        }
+
+        with self._lock:
+            self._images[key] = result
+            while len(self._images) > self.max_images:
+                self._images.popitem(last=False)
+
+        return result
+
+    def tile(self, z, x, y, size=256, **options):
+        """
+        Render one XYZ map tile (cached), e.g. for a tile layer endpoint
+
+        Parameters:
+        - z, x, y: tile coordinates
+        - size: tile size in pixels
+        - options: how, column, shade_how and colors as in render
+
+        Returns:
+        - dict as returned by render
+        """
+        return self.render(tile_extent(z, x, y), size, size, **options)
+
+    @property
+    def cached_images(self):
+        """
+        Number of rendered images currently cached
+        """
+        return len(self._images)
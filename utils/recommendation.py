@@ -0,0 +1,161 @@
+import numpy as np
+import pandas as pd
+
+# How strongly each business sector leans towards each opportunity type (0-1)
+SECTOR_AFFINITY = {
+    "Makanan & Minuman": {"Distribusi Produk Gizi": 1.0, "Riset & Pengembangan": 0.5, "Pendanaan Program": 0.3},
+    "Farmasi & Suplemen": {"Distribusi Produk Gizi": 0.9, "Riset & Pengembangan": 0.8},
+    "Teknologi Kesehatan": {"Teknologi & Inovasi": 1.0, "Riset & Pengembangan": 0.6},
+    "Retail & Distribusi": {"Distribusi Produk Gizi": 1.0, "Infrastruktur": 0.4},
+    "Pendidikan & Pelatihan": {"Pelatihan & Pemberdayaan": 1.0, "Riset & Pengembangan": 0.4},
+    "Logistik & Supply Chain": {"Distribusi Produk Gizi": 0.8, "Infrastruktur": 0.8},
+    "Konsultan Kesehatan": {"Pelatihan & Pemberdayaan": 0.7, "Riset & Pengembangan": 0.7},
+    "Manufaktur": {"Infrastruktur": 0.9, "Distribusi Produk Gizi": 0.5},
+    "Teknologi Informasi": {"Teknologi & Inovasi": 1.0, "Pelatihan & Pemberdayaan": 0.3},
+    "Asuransi Kesehatan": {"Pendanaan Program": 1.0, "Teknologi & Inovasi": 0.4}
+}
+
+# Weight of the sector prior relative to interests the partner selected explicitly
+SECTOR_PRIOR_WEIGHT = 0.5
+
+# "Nasional" opportunities are relevant to partners of any region, at this weight
+NATIONAL_REGION_WEIGHT = 0.5
+
+def encode_items(items_df, type_column="opportunity_type", region_column="region"):
+    """
+    Encode opportunities as feature vectors
+
+    Columns are one-hot opportunity type, one-hot region, then the
+    normalized need level and business potential.
+
+    Parameters:
+    - items_df: Pandas DataFrame such as the regional opportunity data on page 8
+    - type_column, region_column: categorical columns to one-hot encode
+
+    Returns:
+    - tuple (matrix, type_categories, region_categories)
+    """
+    types = pd.Categorical(items_df[type_column])
+    regions = pd.Categorical(items_df[region_column])
+
+    type_onehot = np.eye(len(types.categories), dtype=np.float32)[types.codes]
+    region_onehot = np.eye(len(regions.categories), dtype=np.float32)[regions.codes]
+
+    # A national opportunity partially serves every region
+    if "Nasional" in regions.categories:
+        national = np.asarray(regions == "Nasional")
+        region_onehot[national] = NATIONAL_REGION_WEIGHT
+
+    numeric = np.column_stack([
+        items_df["need_level"].to_numpy(dtype=np.float32) / 100,
+        items_df["business_potential"].to_numpy(dtype=np.float32) / 100
+    ])
+
+    matrix = np.hstack([type_onehot, region_onehot, numeric])
+
+    return matrix, list(types.categories), list(regions.categories)
+
+def encode_partners(partners_df, type_categories, region_categories):
+    """
+    Encode partner profiles in the same feature space as the opportunities
+
+    Parameters:
+    - partners_df: Pandas DataFrame with sector, interest_areas, preferred_regions and impact_weight
+    - type_categories, region_categories: category order from encode_items
+
+    Returns:
+    - float32 numpy array of shape (n_partners, n_features)
+    """
+    n = len(partners_df)
+    type_index = {name: i for i, name in enumerate(type_categories)}
+    region_index = {name: i for i, name in enumerate(region_categories)}
+
+    interests = np.zeros((n, len(type_categories)), dtype=np.float32)
+    regions = np.zeros((n, len(region_categories)), dtype=np.float32)
+
+    for row, (sector, areas, preferred) in enumerate(zip(
+        partners_df["sector"], partners_df["interest_areas"], partners_df["preferred_regions"]
+    )):
+        for name, weight in SECTOR_AFFINITY.get(sector, {}).items():
+            if name in type_index:
+                interests[row, type_index[name]] += SECTOR_PRIOR_WEIGHT * weight
+        for name in areas:
+            if name in type_index:
+                interests[row, type_index[name]] += 1.0
+        for name in preferred:
+            if name in region_index:
+                regions[row, region_index[name]] = 1.0
+
+    # Partners without a regional preference are open to all regions
+    regions[regions.sum(axis=1) == 0] = 1.0
+
+    impact = partners_df["impact_weight"].to_numpy(dtype=np.float32)
+    numeric = np.column_stack([impact, 1 - impact])
+
+    return np.hstack([interests, regions, numeric])
+
+class RecommendationIndex:
+    """
+    Precomputed partner-to-opportunity recommendations
+
+    All partners are scored against all opportunities in a single matrix
+    multiply; only the top-k per partner is kept for instant lookups.
+    """
+
+    def __init__(self, items_df, partners_df, k=5, id_column="partner_id"):
+        self.items = items_df.reset_index(drop=True)
+        self.id_column = id_column
+        self.k = min(k, len(self.items))
+
+        self.item_matrix, self.type_categories, self.region_categories = encode_items(self.items)
+        partner_matrix = encode_partners(partners_df, self.type_categories, self.region_categories)
+
+        scores = partner_matrix @ self.item_matrix.T
+
+        if self.k < scores.shape[1]:
+            top = np.argpartition(-scores, self.k - 1, axis=1)[:, :self.k]
+        else:
+            top = np.tile(np.arange(scores.shape[1]), (scores.shape[0], 1))
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind="stable")
+
+        self.top_items = np.take_along_axis(top, order, axis=1)
+        self.top_scores = np.take_along_axis(top_scores, order, axis=1)
+        self.row_of = pd.Series(np.arange(len(partners_df)), index=partners_df[id_column].to_numpy())
+
+    def recommend(self, partner_id):
+        """
+        Return the precomputed top-k opportunities for one partner
+
+        Parameters:
+        - partner_id: id of a partner the index was built with
+
+        Returns:
+        - Pandas DataFrame of opportunities with rank and score columns
+        """
+        row = self.row_of[partner_id]
+        recommendations = self.items.iloc[self.top_items[row]].copy()
+        recommendations.insert(0, "rank", np.arange(1, len(recommendations) + 1))
+        recommendations["score"] = self.top_scores[row]
+
+        return recommendations.reset_index(drop=True)
+
+    def recommend_for_profile(self, profile):
+        """
+        Score a single ad-hoc profile (e.g. from the request form) on the fly
+
+        Parameters:
+        - profile: dict with sector, interest_areas, preferred_regions and impact_weight
+
+        Returns:
+        - Pandas DataFrame of the top-k opportunities with rank and score columns
+        """
+        vector = encode_partners(pd.DataFrame([profile]), self.type_categories, self.region_categories)
+        scores = (vector @ self.item_matrix.T)[0]
+        top = np.argsort(-scores, kind="stable")[:self.k]
+
+        recommendations = self.items.iloc[top].copy()
+        recommendations.insert(0, "rank", np.arange(1, len(recommendations) + 1))
+        recommendations["score"] = scores[top]
+
+        return recommendations.reset_index(drop=True)
@@ -0,0 +1,187 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.sparse.linalg import spsolve
+
+# Name used for the single top-level node of every hierarchy
+NATIONAL_LABEL = "Nasional"
+
+def build_summing_matrix(bottom_df, levels):
+    """
+    Build the sparse summing matrix S for a forecast hierarchy
+
+    Rows of S are ordered top-down (national first, then each level in turn)
+    and the bottom level rows follow the order of bottom_df, so that
+    S @ bottom_values gives every node total in a single product.
+
+    Parameters:
+    - bottom_df: Pandas DataFrame with one row per bottom-level series
+    - levels: list of hierarchy columns from top to bottom, e.g. ['region', 'province', 'district']
+
+    Returns:
+    - tuple (S, nodes): scipy CSR matrix of shape (n_nodes, n_bottom) and a
+      DataFrame describing each row of S (level name plus hierarchy keys)
+    """
+    n_bottom = len(bottom_df)
+    columns = np.arange(n_bottom)
+
+    blocks = [sparse.csr_matrix(np.ones((1, n_bottom)))]
+    node_frames = [pd.DataFrame({"level": ["national"], "label": [NATIONAL_LABEL]})]
+
+    for depth, level in enumerate(levels):
+        keys = list(levels[:depth + 1])
+
+        # sort=False keeps first-appearance order, so the bottom level
+        # rows line up one-to-one with the rows of bottom_df
+        codes = bottom_df.groupby(keys, sort=False).ngroup().to_numpy()
+        n_nodes = int(codes.max()) + 1 if n_bottom else 0
+
+        blocks.append(sparse.csr_matrix(
+            (np.ones(n_bottom), (codes, columns)),
+            shape=(n_nodes, n_bottom)
+        ))
+
+        level_nodes = bottom_df[keys].drop_duplicates().reset_index(drop=True)
+        level_nodes.insert(0, "level", level)
+        level_nodes["label"] = level_nodes[level]
+        node_frames.append(level_nodes)
+
+    if n_bottom and len(node_frames[-1]) != n_bottom:
+        raise ValueError(f"Bottom level '{levels[-1]}' must identify each row of bottom_df uniquely")
+
+    S = sparse.vstack(blocks, format="csr")
+    nodes = pd.concat(node_frames, ignore_index=True)
+
+    return S, nodes
+
+def shrink_covariance(residuals):
+    """
+    Estimate a forecast error covariance with Schäfer-Strimmer shrinkage
+
+    The sample covariance is shrunk towards its diagonal, with the
+    shrinkage intensity estimated from the residuals themselves.
+
+    Parameters:
+    - residuals: array of shape (n_observations, n_nodes) with in-sample forecast errors
+
+    Returns:
+    - tuple (W, lambda): shrunk covariance matrix and the shrinkage intensity used
+    """
+    residuals = np.asarray(residuals, dtype=float)
+    n_obs = residuals.shape[0]
+    if n_obs < 2:
+        raise ValueError("At least two residual observations are needed for MinT shrinkage")
+
+    centered = residuals - residuals.mean(axis=0)
+    sample_cov = centered.T @ centered / n_obs
+
+    std = np.sqrt(np.diag(sample_cov))
+    std[std == 0] = 1.0
+    standardized = centered / std
+
+    corr = standardized.T @ standardized / n_obs
+    corr_var = (
+        (standardized ** 2).T @ (standardized ** 2) / n_obs - corr ** 2
+    ) * n_obs / (n_obs - 1) ** 2
+
+    off_diagonal = ~np.eye(corr.shape[0], dtype=bool)
+    denominator = (corr[off_diagonal] ** 2).sum()
+    shrinkage = corr_var[off_diagonal].sum() / denominator if denominator > 0 else 1.0
+    shrinkage = float(np.clip(shrinkage, 0, 1))
+
+    W = sample_cov * (1 - shrinkage)
+    W[np.diag_indices_from(W)] = np.diag(sample_cov)
+
+    return W, shrinkage
+
+def reconcile_forecasts(S, base_forecasts, method="bottom_up", residuals=None):
+    """
+    Reconcile base forecasts so that every level of the hierarchy adds up
+
+    Parameters:
+    - S: sparse summing matrix from build_summing_matrix
+    - base_forecasts: array of shape (n_nodes,) or (n_nodes, n_measures), ordered like the rows of S
+    - method: 'bottom_up', 'wls_struct' (structural scaling) or 'mint_shrink'
+    - residuals: in-sample forecast errors of shape (n_observations, n_nodes), required for 'mint_shrink'
+
+    Returns:
+    - numpy array with the same shape as base_forecasts, coherent across all levels
+    """
+    base = np.asarray(base_forecasts, dtype=float)
+    squeeze = base.ndim == 1
+    if squeeze:
+        base = base[:, None]
+
+    n_nodes, n_bottom = S.shape
+
+    if method == "bottom_up":
+        reconciled = S @ base[n_nodes - n_bottom:]
+
+    elif method == "wls_struct":
+        # Structural scaling: error variance proportional to the number of bottom series
+        w_inv = sparse.diags(1.0 / np.asarray(S.sum(axis=1)).ravel())
+        StW = (S.T @ w_inv).tocsc()
+        bottom = spsolve((StW @ S).tocsc(), StW @ base)
+        reconciled = S @ bottom.reshape(n_bottom, -1)
+
+    elif method == "mint_shrink":
+        if residuals is None:
+            raise ValueError("MinT shrinkage requires in-sample residuals")
+        W, _ = shrink_covariance(residuals)
+        dense_S = S.toarray()
+        W_inv_S = np.linalg.solve(W, dense_S)
+        bottom = np.linalg.solve(dense_S.T @ W_inv_S, W_inv_S.T @ base)
+        reconciled = S @ bottom
+
+    else:
+        raise ValueError(f"Unknown reconciliation method: {method}")
+
+    reconciled = np.asarray(reconciled)
+    return reconciled[:, 0] if squeeze else reconciled
+
+def reconcile_hierarchy(bottom_df, levels, value_columns, method="bottom_up",
+                        base_forecasts=None, residuals=None):
+    """
+    Compute coherent totals for every level of a hierarchy in one pass
+
+    Parameters:
+    - bottom_df: Pandas DataFrame with one row per bottom-level series
+    - levels: list of hierarchy columns from top to bottom, e.g. ['region', 'province']
+    - value_columns: list of numeric columns to aggregate and reconcile
+    - method: reconciliation method passed to reconcile_forecasts
+    - base_forecasts: optional DataFrame aligned with the node frame holding
+      independent forecasts for the upper levels; defaults to bottom-level values only
+    - residuals: optional residual matrix for 'mint_shrink'
+
+    Returns:
+    - Pandas DataFrame with one row per node (national, each level) and the reconciled value columns
+    """
+    S, nodes = build_summing_matrix(bottom_df, levels)
+
+    if base_forecasts is None:
+        base = np.zeros((S.shape[0], len(value_columns)))
+        base[S.shape[0] - S.shape[1]:] = bottom_df[value_columns].to_numpy(dtype=float)
+    else:
+        base = base_forecasts[value_columns].to_numpy(dtype=float)
+
+    reconciled = reconcile_forecasts(S, base, method=method, residuals=residuals)
+
+    result = nodes.copy()
+    for i, column in enumerate(value_columns):
+        result[column] = reconciled[:, i]
+
+    return result
+
+def get_level(hierarchy_df, level):
+    """
+    Select the rows of one level from a reconciled hierarchy frame
+
+    Parameters:
+    - hierarchy_df: Pandas DataFrame returned by reconcile_hierarchy
+    - level: level name, e.g. 'national', 'region' or 'province'
+
+    Returns:
+    - Pandas DataFrame with the nodes of that level
+    """
+    level_df = hierarchy_df[hierarchy_df["level"] == level]
+    return level_df.dropna(axis=1, how="all").reset_index(drop=True)
@@ -0,0 +1,116 @@
+import io
+import multiprocessing
+import os
+import threading
+import zipfile
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from core.reports import render_province_report, report_data_version
+
+class ReportService:
+    """
+    Background rendering of per-province briefing packs
+
+    submit() queues one job per province on a process pool and returns at
+    once, so the Streamlit script thread never waits for a render; pages
+    poll progress() and serve finished packs from report(). Rendered packs
+    are kept per data version (see core.reports.report_data_version), so
+    every session asking for the same data shares one set of renders and
+    a new data version renders fresh packs. Only the most recent
+    max_versions versions are kept.
+    """
+
+    def __init__(self, workers=None, max_versions=2):
+        self.workers = workers or min(4, os.cpu_count() or 1)
+        self.max_versions = max_versions
+        self._pool = None
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _executor(self):
+        if self._pool is None:
+            # The Streamlit server runs many threads, which are not safe to fork
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._pool
+
+    def submit(self, provinces, tables):
+        """
+        Queue the packs of provinces not yet rendered for this data version
+
+        Parameters:
+        - provinces: list of province names
+        - tables: dict with the core.reports.REPORT_TABLES DataFrames
+
+        Returns:
+        - data version string, the key for progress(), report() and bundle()
+        """
+        version = report_data_version(tables)
+
+        with self._lock:
+            jobs = self._jobs.setdefault(version, {})
+            self._jobs.move_to_end(version)
+            for province in provinces:
+                if province not in jobs:
+                    jobs[province] = self._executor().submit(render_province_report, province, tables, version)
+
+            while len(self._jobs) > self.max_versions:
+                _, stale = self._jobs.popitem(last=False)
+                for future in stale.values():
+                    future.cancel()
+
+        return version
+
+    def progress(self, version):
+        """
+        Render progress of a data version
+
+        Returns:
+        - dict with 'total', 'done' and 'failed' pack counts
+        """
+        with self._lock:
+            jobs = list(self._jobs.get(version, {}).values())
+        done = [job for job in jobs if job.done() and not job.cancelled()]
+        failed = [job for job in done if job.exception() is not None]
+        return {"total": len(jobs), "done": len(done), "failed": len(failed)}
+
+    def report(self, version, province):
+        """
+        Finished pack of a province, or None while it is still rendering
+
+        Raises the render error when the job failed.
+        """
+        with self._lock:
+            job = self._jobs.get(version, {}).get(province)
+        if job is None or not job.done():
+            return None
+        return job.result()
+
+    def bundle(self, version):
+        """
+        ZIP archive (bytes) with every finished pack of a data version
+        """
+        with self._lock:
+            jobs = dict(self._jobs.get(version, {}))
+
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+            for province, job in sorted(jobs.items()):
+                if job.done() and not job.cancelled() and job.exception() is None:
+                    archive.writestr(report_filename(province), job.result())
+        return buffer.getvalue()
+
+    def shutdown(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+            self._jobs.clear()
+
+def report_filename(province):
+    """
+    Download file name of a province pack
+    """
+    return "laporan_" + "_".join(province.lower().split()) + ".html"
@@ -0,0 +1,170 @@
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+# Indonesian administrative levels, from the top down
+ADMIN_LEVELS = ["region", "province", "kabupaten", "kecamatan", "desa"]
+
+class RollupStore:
+    """
+    Hierarchical rollups with drill-down and roll-up navigation
+
+    Sums, counts and weighted means are precomputed for every node of the
+    levels present in the base data. An optional loader supplies the rows
+    of one more level below the deepest node on demand, so the finest level
+    is only materialized for the nodes a user actually opens.
+
+    A node is addressed by its path, e.g. ('Indonesia Timur', 'Papua');
+    the empty path () is the national total. The child loader is called
+    with the path of a deepest node and returns its child rows.
+    """
+
+    def __init__(self, base_df, levels, sum_columns, weighted_means=None, child_level=None, child_loader=None,
+                 max_loaded_nodes=512):
+        self.levels = list(levels)
+        self.sum_columns = list(sum_columns)
+        # Weighted mean column -> weight column, e.g. {'stunting_percentage': 'children_under5'}
+        self.weighted_means = dict(weighted_means or {})
+        self.child_level = child_level
+        self.child_loader = child_loader
+
+        self.max_loaded_nodes = max_loaded_nodes
+
+        # Lazily loaded children per node, least recently used first
+        self._lazy = OrderedDict()
+        self._lock = threading.Lock()
+
+        base = self._prepare(base_df)
+        totals = self._total_columns()
+
+        self._root = base[totals].sum()
+        self._root["count"] = len(base)
+
+        # One table per depth, indexed by the node path and sorted for prefix lookups
+        self._tables = []
+        for depth in range(1, len(self.levels) + 1):
+            table = base.groupby(self.levels[:depth], sort=True)[totals].sum()
+            table["count"] = base.groupby(self.levels[:depth], sort=True).size()
+            self._tables.append(table)
+
+    @property
+    def all_levels(self):
+        return self.levels + ([self.child_level] if self.child_level else [])
+
+    def _total_columns(self):
+        products = [f"_{column}_x_weight" for column in self.weighted_means]
+        weights = sorted(set(self.weighted_means.values()) - set(self.sum_columns))
+        return self.sum_columns + products + weights
+
+    def _prepare(self, df):
+        # Weighted means roll up as sum(value * weight) / sum(weight)
+        df = df.copy()
+        for column, weight in self.weighted_means.items():
+            df[f"_{column}_x_weight"] = df[column] * df[weight]
+        return df
+
+    def _finish(self, table):
+        table = table.copy()
+        for column, weight in self.weighted_means.items():
+            with np.errstate(invalid="ignore", divide="ignore"):
+                table[column] = table.pop(f"_{column}_x_weight") / table[weight]
+        return table
+
+    def level_of(self, path):
+        """
+        Name of the level a path points at ('national' for the root)
+        """
+        return self.all_levels[len(path) - 1] if path else "national"
+
+    def node(self, path=()):
+        """
+        Return the rolled-up measures of one node
+
+        Parameters:
+        - path: tuple of names from the top level down
+
+        Returns:
+        - Pandas Series of sums, count and weighted means
+        """
+        path = tuple(path)
+        if not path:
+            row = self._root.to_frame().T
+        elif len(path) <= len(self.levels):
+            table = self._tables[len(path) - 1]
+            row = table.loc[[path if len(path) > 1 else path[0]]]
+        else:
+            parent = self._load_children(path[:-1])
+            row = parent[parent[self.child_level] == path[-1]].drop(columns=self.child_level)
+
+        return self._finish(row).iloc[0]
+
+    def children(self, path=()):
+        """
+        Return the measures of every child of a node (drill-down)
+
+        Parameters:
+        - path: tuple of names from the top level down
+
+        Returns:
+        - Pandas DataFrame with one row per child, the child level as first column
+        """
+        path = tuple(path)
+        depth = len(path)
+
+        if depth < len(self.levels):
+            table = self._tables[depth]
+            if depth:
+                table = table.loc[path if depth > 1 else path[0]]
+                # The remaining index level is the child name
+                if isinstance(table.index, pd.MultiIndex):
+                    table = table.droplevel(list(range(table.index.nlevels - 1)))
+            children = table.rename_axis(self.levels[depth]).reset_index()
+        elif depth == len(self.levels) and self.child_loader is not None:
+            children = self._load_children(path)
+        else:
+            raise ValueError(f"Node {path} has no child level")
+
+        return self._finish(children)
+
+    def _load_children(self, path):
+        with self._lock:
+            if path in self._lazy:
+                self._lazy.move_to_end(path)
+                return self._lazy[path]
+
+            rows = self._prepare(self.child_loader(path))
+            children = rows.groupby(self.child_level, sort=False)[self._total_columns()].sum()
+            children["count"] = rows.groupby(self.child_level, sort=False).size()
+            self._lazy[path] = children.reset_index()
+
+            while len(self._lazy) > self.max_loaded_nodes:
+                self._lazy.popitem(last=False)
+            return self._lazy[path]
+
+    def has_children(self, path):
+        """
+        Whether a node can be drilled into
+        """
+        return len(path) < len(self.levels) or (len(path) == len(self.levels) and self.child_loader is not None)
+
+    def drill_down(self, path, child):
+        """
+        Path of a child node
+        """
+        if not self.has_children(path):
+            raise ValueError(f"Node {tuple(path)} has no child level")
+        return tuple(path) + (child,)
+
+    def roll_up(self, path):
+        """
+        Path of the parent node (the root rolls up to itself)
+        """
+        return tuple(path)[:-1]
+
+    @property
+    def materialized_children(self):
+        """
+        Number of lazily loaded rows currently held in memory
+        """
+        return sum(len(children) for children in self._lazy.values())
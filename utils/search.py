@@ -0,0 +1,329 @@
+import bisect
+import re
+import threading
+import time
+import unicodedata
+import numpy as np
+import pandas as pd
+
+# Common Indonesian and English function words that carry no search signal
+STOPWORDS = {
+    "dan", "di", "ke", "dari", "yang", "untuk", "dengan", "pada", "dalam", "atau",
+    "ini", "itu", "sebagai", "oleh", "akan", "juga", "para", "serta",
+    "the", "and", "of", "in", "for", "to", "a", "an", "with", "on", "by", "or", "at"
+}
+
+TOKEN_PATTERN = r"[0-9a-z]+"
+
+def normalize_text(series):
+    """
+    Lowercase text and strip diacritics so Indonesian and English words share one form
+
+    Parameters:
+    - series: Pandas Series of strings
+
+    Returns:
+    - Pandas Series of normalized strings
+    """
+    return (
+        series.fillna("").astype(str)
+        .str.normalize("NFKD")
+        .str.encode("ascii", errors="ignore")
+        .str.decode("ascii")
+        .str.lower()
+    )
+
+def tokenize(text):
+    """
+    Split a single string into search tokens
+
+    Parameters:
+    - text: string
+
+    Returns:
+    - list of tokens with stopwords removed
+    """
+    normalized = unicodedata.normalize("NFKD", str(text)).encode("ascii", errors="ignore").decode("ascii").lower()
+    return [token for token in re.findall(TOKEN_PATTERN, normalized) if token not in STOPWORDS]
+
+class SearchIndex:
+    """
+    In-process inverted index with BM25 ranking and prefix search
+
+    Postings live in immutable segments of numpy arrays. Updating the data
+    only indexes new or changed rows into a small extra segment and marks
+    replaced rows as deleted; segments are merged once there are too many.
+    """
+
+    def __init__(self, fields, id_column, field_weights=None, k1=1.2, b=0.75, max_segments=8):
+        self.fields = list(fields)
+        self.id_column = id_column
+        self.field_weights = field_weights or {}
+        self.k1 = k1
+        self.b = b
+        self.max_segments = max_segments
+
+        self._segments = []
+        self._doc_ids = np.zeros(0, dtype=object)
+        self._doc_len = np.zeros(0, dtype=np.float32)
+        self._alive = np.zeros(0, dtype=bool)
+        self._position = {}
+        self._hashes = pd.Series(dtype=np.uint64)
+        self._doc_freq = {}
+        self._vocabulary = []
+        self._n_alive = 0
+        self._avg_len = 1.0
+        self._impacts = {}
+        # One index is shared by every Streamlit session, so updates and queries are serialized
+        self._lock = threading.RLock()
+
+    @property
+    def size(self):
+        return self._n_alive
+
+    def _refresh_statistics(self):
+        # Collection statistics change only on update, so BM25 impacts are cached until then
+        self._n_alive = int(self._alive.sum())
+        self._avg_len = float(self._doc_len[self._alive].mean()) if self._n_alive else 1.0
+        self._impacts = {}
+
+    def _build_segment(self, df, first_position):
+        """
+        Tokenize a batch of rows into one postings segment (vectorized)
+        """
+        frames = []
+        for field in self.fields:
+            if field not in df:
+                continue
+            tokens = normalize_text(df[field]).str.findall(TOKEN_PATTERN)
+            exploded = tokens.explode().dropna()
+            frames.append(pd.DataFrame({
+                "doc": first_position + exploded.index.to_numpy(dtype=np.int64),
+                "term": exploded.to_numpy(),
+                "weight": np.float32(self.field_weights.get(field, 1.0))
+            }))
+
+        doc_len = np.zeros(len(df), dtype=np.float32)
+        segment = {}
+        if not frames:
+            return segment, doc_len
+
+        postings = pd.concat(frames, ignore_index=True)
+        postings = postings[~postings["term"].isin(STOPWORDS)]
+
+        # Sum field weights per (term, document) on integer keys rather than strings
+        term_codes, term_labels = pd.factorize(postings["term"])
+        local_docs = postings["doc"].to_numpy() - first_position
+        keys, inverse = np.unique(term_codes.astype(np.int64) * len(df) + local_docs, return_inverse=True)
+        weights = np.bincount(inverse, weights=postings["weight"].to_numpy()).astype(np.float32)
+
+        codes = keys // len(df)
+        docs = (keys % len(df)).astype(np.int32)
+        np.add.at(doc_len, docs, weights)
+        docs += first_position
+
+        boundaries = np.flatnonzero(codes[1:] != codes[:-1]) + 1
+        starts = np.r_[0, boundaries]
+        stops = np.r_[boundaries, len(codes)]
+
+        for start, stop in zip(starts, stops):
+            segment[term_labels[codes[start]]] = (docs[start:stop], weights[start:stop])
+
+        return segment, doc_len
+
+    def _add(self, df):
+        if df.empty:
+            return
+
+        df = df.reset_index(drop=True)
+        first_position = len(self._doc_ids)
+        segment, doc_len = self._build_segment(df, first_position)
+
+        ids = df[self.id_column].to_numpy(dtype=object)
+        self._doc_ids = np.concatenate([self._doc_ids, ids])
+        self._doc_len = np.concatenate([self._doc_len, doc_len])
+        self._alive = np.concatenate([self._alive, np.ones(len(df), dtype=bool)])
+        self._position.update(zip(ids, range(first_position, first_position + len(df))))
+
+        new_terms = False
+        for term, (docs, _) in segment.items():
+            if term not in self._doc_freq:
+                new_terms = True
+                self._doc_freq[term] = 0
+            self._doc_freq[term] += len(docs)
+        if new_terms:
+            self._vocabulary = sorted(self._doc_freq)
+
+        self._segments.append(segment)
+
+    def _remove(self, ids):
+        positions = [self._position.pop(doc_id) for doc_id in ids if doc_id in self._position]
+        if not positions:
+            return
+
+        positions = np.asarray(positions)
+        self._alive[positions] = False
+
+        # Document frequencies only count live documents
+        dead = np.zeros(len(self._alive), dtype=bool)
+        dead[positions] = True
+        for segment in self._segments:
+            for term, (docs, _) in segment.items():
+                removed = int(dead[docs].sum())
+                if removed:
+                    self._doc_freq[term] -= removed
+
+    def update(self, df):
+        """
+        Bring the index in line with a DataFrame, re-indexing only what changed
+
+        Parameters:
+        - df: Pandas DataFrame with the id column and the indexed fields
+
+        Returns:
+        - dict with the number of added, changed and removed documents
+        """
+        with self._lock:
+            return self._update(df)
+
+    def _update(self, df):
+        fields = [field for field in self.fields if field in df]
+        hashes = pd.Series(
+            pd.util.hash_pandas_object(df[fields], index=False).to_numpy(),
+            index=df[self.id_column].to_numpy()
+        )
+
+        previous = self._hashes.reindex(hashes.index)
+        is_new = previous.isna().to_numpy()
+        is_changed = ~is_new & (previous.to_numpy() != hashes.to_numpy())
+        removed_ids = self._hashes.index.difference(hashes.index)
+
+        self._remove(list(hashes.index[is_changed]) + list(removed_ids))
+        self._add(df[is_new | is_changed])
+        self._hashes = hashes
+
+        if len(self._segments) > self.max_segments:
+            self._compact()
+        elif is_new.any() or is_changed.any() or len(removed_ids):
+            self._refresh_statistics()
+
+        return {
+            "added": int(is_new.sum()),
+            "changed": int(is_changed.sum()),
+            "removed": len(removed_ids)
+        }
+
+    def compact(self):
+        """
+        Merge all segments into one and drop postings of deleted documents
+        """
+        with self._lock:
+            self._compact()
+
+    def _compact(self):
+        merged = {}
+        terms = set().union(*self._segments) if self._segments else set()
+
+        for term in terms:
+            parts = [segment[term] for segment in self._segments if term in segment]
+            docs = np.concatenate([docs for docs, _ in parts])
+            weights = np.concatenate([weights for _, weights in parts])
+            keep = self._alive[docs]
+            if keep.any():
+                merged[term] = (docs[keep], weights[keep])
+
+        self._segments = [merged] if merged else []
+        self._doc_freq = {term: len(docs) for term, (docs, _) in merged.items()}
+        self._vocabulary = sorted(self._doc_freq)
+        self._refresh_statistics()
+
+    def _impact(self, segment_number, term):
+        """
+        BM25 term-frequency component of one posting list, cached per collection state
+        """
+        key = (segment_number, term)
+        if key not in self._impacts:
+            docs, tf = self._segments[segment_number][term]
+            norm = self.k1 * (1 - self.b + self.b * self._doc_len[docs] / self._avg_len)
+            self._impacts[key] = (tf * (self.k1 + 1) / (tf + norm)).astype(np.float32)
+        return self._impacts[key]
+
+    def expand_prefix(self, prefix, max_expansions=20):
+        """
+        Return indexed terms starting with a prefix, most frequent first
+
+        Parameters:
+        - prefix: normalized token prefix
+        - max_expansions: maximum number of terms returned
+
+        Returns:
+        - list of terms
+        """
+        start = bisect.bisect_left(self._vocabulary, prefix)
+        stop = bisect.bisect_left(self._vocabulary, prefix + "\uffff")
+        candidates = [term for term in self._vocabulary[start:stop] if self._doc_freq.get(term, 0) > 0]
+
+        if len(candidates) > max_expansions:
+            candidates = sorted(candidates, key=lambda term: -self._doc_freq[term])[:max_expansions]
+        return candidates
+
+    def search(self, query, limit=20, prefix=True, max_expansions=20):
+        """
+        Rank documents against a query with BM25
+
+        Parameters:
+        - query: free-text query in Indonesian or English
+        - limit: number of results to return
+        - prefix: treat the last word as a prefix (search-as-you-type)
+        - max_expansions: maximum number of terms a prefix expands to
+
+        Returns:
+        - tuple (results_df, elapsed_ms): DataFrame with id and score columns, best first
+        """
+        with self._lock:
+            return self._search(query, limit, prefix, max_expansions)
+
+    def _search(self, query, limit, prefix, max_expansions):
+        start = time.perf_counter()
+        tokens = tokenize(query)
+        n_docs = self.size
+
+        if not tokens or n_docs == 0:
+            empty = pd.DataFrame({self.id_column: [], "score": []})
+            return empty, (time.perf_counter() - start) * 1000
+
+        query_terms = [[token] for token in tokens]
+        if prefix and not query.endswith(" "):
+            query_terms[-1] = self.expand_prefix(tokens[-1], max_expansions) or [tokens[-1]]
+
+        scores = np.zeros(len(self._alive), dtype=np.float32)
+        touched = np.zeros(len(self._alive), dtype=bool)
+
+        for alternatives in query_terms:
+            for term in alternatives:
+                doc_freq = self._doc_freq.get(term, 0)
+                if doc_freq <= 0:
+                    continue
+                idf = np.float32(np.log1p((n_docs - doc_freq + 0.5) / (doc_freq + 0.5)))
+
+                for segment_number, segment in enumerate(self._segments):
+                    if term not in segment:
+                        continue
+                    docs = segment[term][0]
+                    # Doc ids are unique within a posting list, so fancy-index += is safe
+                    scores[docs] += idf * self._impact(segment_number, term)
+                    touched[docs] = True
+
+        # nonzero over a bool mask is much cheaper than over the float scores
+        touched &= self._alive
+        candidates = np.flatnonzero(touched)
+        if len(candidates) > limit:
+            candidates = candidates[np.argpartition(-scores[candidates], limit - 1)[:limit]]
+        candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+
+        results = pd.DataFrame({
+            self.id_column: self._doc_ids[candidates],
+            "score": scores[candidates]
+        })
+
+        return results, (time.perf_counter() - start) * 1000
@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+# Rows materialized per page of a filtered table
+TABLE_PAGE_SIZE = 50
+
+# Filtered tables are kept as arrays of row positions into the shared
+# (cached) DataFrame instead of filtered copies; only the page of rows on
+# screen is ever materialized, so a session's filters cost one integer per
+# matching row rather than a copy of every column.
+
+def select_rows(df, isin=None, at_least=None, equals=None):
+    """
+    Positions of the rows matching every filter, without copying any column
+
+    Parameters:
+    - df: Pandas DataFrame
+    - isin: dict column -> allowed values (empty or None keeps every row)
+    - at_least: dict column -> minimum value
+    - equals: dict column -> required value (None keeps every row)
+
+    Returns:
+    - numpy array of row positions, in DataFrame order
+    """
+    mask = np.ones(len(df), dtype=bool)
+
+    for column, values in (isin or {}).items():
+        if values:
+            mask &= df[column].isin(values).to_numpy()
+
+    for column, minimum in (at_least or {}).items():
+        mask &= df[column].to_numpy() >= minimum
+
+    for column, value in (equals or {}).items():
+        if value is not None:
+            mask &= df[column].to_numpy() == value
+
+    return np.flatnonzero(mask)
+
+def rank_rows(df, positions, column, ranked_values):
+    """
+    Order row positions by a ranking of one column, dropping unranked rows
+
+    Parameters:
+    - df: Pandas DataFrame the positions point into
+    - positions: numpy array of row positions
+    - column: column the ranking refers to, e.g. 'district'
+    - ranked_values: values of that column in rank order, e.g. search results
+
+    Returns:
+    - numpy array of row positions, best ranked first
+    """
+    ranks = pd.Index(ranked_values).drop_duplicates().get_indexer(df[column].to_numpy()[positions])
+    keep = ranks >= 0
+    return positions[keep][np.argsort(ranks[keep], kind="stable")]
+
+def sort_rows(df, positions, column, ascending=True):
+    """
+    Order row positions by one column (stable)
+    """
+    values = df[column].to_numpy()[positions]
+    order = np.argsort(values if ascending else -values, kind="stable")
+    return positions[order]
+
+def display_table_page(df, positions, columns, key, formats=None, page_size=TABLE_PAGE_SIZE, height=400):
+    """
+    Display one page of the selected rows, materializing only that page
+
+    Parameters:
+    - df: Pandas DataFrame the positions point into
+    - positions: numpy array of row positions to show, in display order
+    - columns: dict column -> display label, in display order
+    - key: widget key prefix of the page selector
+    - formats: optional dict column -> mapping applied to the shown values
+    - page_size: rows per page
+    - height: table height in pixels
+    """
+    n_pages = max(1, -(-len(positions) // page_size))
+    page_key = f"{key}_page"
+
+    # The page lives in session state only (no widget default); filters may
+    # shrink the selection below the page a session was on
+    if st.session_state.get(page_key, 1) > n_pages or page_key not in st.session_state:
+        st.session_state[page_key] = 1
+
+    page = 1
+    if n_pages > 1:
+        page = st.number_input(f"Halaman (dari {n_pages})", min_value=1, max_value=n_pages, key=page_key)
+
+    rows = positions[(page - 1) * page_size:page * page_size]
+    table = df.iloc[rows, df.columns.get_indexer(list(columns))]
+    table = table.assign(**{column: table[column].map(mapping) for column, mapping in (formats or {}).items()})
+    table.columns = list(columns.values())
+
+    st.dataframe(table, height=height)
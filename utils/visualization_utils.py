@@ -1,25 +1,150 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
-import matplotlib.pyplot as plt
-import seaborn as sns
 from utils.data_utils import load_nutrition_data
+from utils.figure_cache import figure_cache, figure_payload_report
+from utils.profiling import timed
+from utils.downsample import lttb, stratified_sample, allocate_budget, grid_strata
+from core.aggregation import AggregationPlan
 
-def create_regional_nutrition_comparison(data, metric):
+# Point traces above this many points are drawn with WebGL instead of SVG
+WEBGL_THRESHOLD = 5000
+
+# Most points a chart sends to the browser; larger charts are downsampled server-side
+MAX_CHART_POINTS = 20000
+
+# Per-point trace attributes that must not be subset when downsampling
+_NON_POINT_ATTRIBUTES = {"colorscale", "range", "tickvals", "ticktext"}
+
+# Nutrition metrics offered on the nutrition page
+NUTRITION_METRICS = ['stunting_percentage', 'wasting_percentage', 'obesity_percentage',
+                     'anemia_percentage', 'exclusive_breastfeeding', 'food_security_score']
+
+# Provinces compared in the nutrition radar chart
+RADAR_PROVINCES = ["DKI Jakarta", "Papua", "Jawa Barat", "Nusa Tenggara Timur", "Sulawesi Selatan"]
+
+# Columns of the nutrition correlation heatmap
+CORRELATION_COLUMNS = NUTRITION_METRICS + ['nutrition_centers', 'health_workers_per_1000', 'priority_level']
+
+def _point_count(trace):
+    for attribute in ("x", "lat", "r", "locations", "y"):
+        values = trace.get(attribute)
+        if values is not None and not isinstance(values, str):
+            return len(values)
+    return 0
+
+def _take_points(properties, index, n):
+    # Subset every per-point array (x, y, hovertext, customdata, marker.color, ...) of a trace
+    taken = {}
+    for key, value in properties.items():
+        if isinstance(value, dict):
+            taken[key] = _take_points(value, index, n)
+        elif key not in _NON_POINT_ATTRIBUTES and isinstance(value, (list, tuple, np.ndarray)) and len(value) == n:
+            taken[key] = np.asarray(value)[index]
+        else:
+            taken[key] = value
+    return taken
+
+def apply_large_data_mode(fig, max_points=MAX_CHART_POINTS, webgl_threshold=WEBGL_THRESHOLD):
+    """
+    Keep point-heavy charts usable in the browser
+    
+    Charts with more than max_points points are downsampled server-side
+    (LTTB for lines, stratified sampling for scatters, with the budget split
+    over traces by size) and get a "Menampilkan N dari M titik" note; SVG
+    scatter traces above webgl_threshold points switch to WebGL. Small
+    charts are returned unchanged.
+    
+    Parameters:
+    - fig: Plotly figure
+    - max_points: most points to keep over all traces
+    - webgl_threshold: point count from which scatter traces use scattergl
+    
+    Returns:
+    - Plotly figure
+    """
+    traces = [trace.to_plotly_json() for trace in fig.data]
+    sizes = [_point_count(trace) if trace["type"].startswith("scatter") else 0 for trace in traces]
+    total = sum(sizes)
+    if total <= webgl_threshold:
+        return fig
+    
+    budgets = allocate_budget(sizes, max_points)
+    shown = int(budgets.sum())
+    webgl_properties = go.Scattergl()._valid_props
+    
+    new_traces = []
+    for trace, size, budget in zip(traces, sizes, budgets):
+        if budget < size:
+            x = np.asarray(trace.get("x", trace.get("lon", np.arange(size))))
+            y = np.asarray(trace.get("y", trace.get("lat", np.zeros(size))))
+            is_line = "lines" in (trace.get("mode") or "")
+            if is_line and (np.issubdtype(x.dtype, np.number) or np.issubdtype(x.dtype, np.datetime64)):
+                index = lttb(x, y, budget)
+            else:
+                index = stratified_sample(grid_strata(x, y), budget)
+            trace = _take_points(trace, index, size)
+        
+        if trace["type"] == "scatter" and shown > webgl_threshold:
+            # scattergl accepts nearly every scatter attribute; drop the few it does not
+            trace = {key: value for key, value in trace.items() if key in webgl_properties}
+            trace["type"] = "scattergl"
+        new_traces.append(trace)
+    
+    fig = go.Figure(data=new_traces, layout=fig.layout)
+    
+    if shown < total:
+        fig.add_annotation(
+            text=f"Menampilkan {shown:,} dari {total:,} titik",
+            xref="paper", yref="paper", x=1, y=1.06,
+            xanchor="right", yanchor="bottom",
+            showarrow=False, font=dict(size=11, color="gray")
+        )
+    
+    return fig
+
+def plan_nutrition_charts():
+    """
+    Aggregation plan with everything the filtered nutrition page charts need
+    
+    Returns:
+    - AggregationPlan with 'means', 'by_region', 'by_province' and 'priority_counts'
+    """
+    return (
+        AggregationPlan()
+        .mean('means', NUTRITION_METRICS)
+        .group_mean('by_region', 'region', NUTRITION_METRICS)
+        .group_mean('by_province', 'province', NUTRITION_METRICS)
+        .value_counts('priority_counts', 'priority_level')
+    )
+
+def plan_national_nutrition_charts():
+    """
+    Aggregation plan for the nutrition charts that always cover all provinces
+    
+    Returns:
+    - AggregationPlan with 'radar_rows' and 'correlation'
+    """
+    return (
+        AggregationPlan()
+        .rows('radar_rows', 'province', RADAR_PROVINCES, NUTRITION_METRICS)
+        .correlation('correlation', CORRELATION_COLUMNS)
+    )
+
+@figure_cache
+def create_regional_nutrition_comparison(regional_data, metric):
     """
     Create a bar chart comparing nutrition metrics across regions
     
     Parameters:
-    - data: Pandas DataFrame with nutrition data
+    - regional_data: Pandas DataFrame with the mean metrics per region ('by_region' of plan_nutrition_charts)
     - metric: string, the metric to display
     
     Returns:
     - Plotly figure
     """
-    # Group by region and calculate mean
-    regional_data = data.groupby('region')[metric].mean().reset_index()
-    
     # Define color scheme based on metric
     if 'stunting' in metric or 'wasting' in metric or 'anemia' in metric:
         color_scale = px.colors.sequential.Reds
@@ -51,12 +176,13 @@ def create_regional_nutrition_comparison(data, metric):
     
     return fig
 
+@figure_cache
 def create_provincial_nutrition_map(data, metric):
     """
     Create a choropleth map of nutrition metrics by province
     
     Parameters:
-    - data: Pandas DataFrame with nutrition data
+    - data: Pandas DataFrame with the metrics per province ('by_province' of plan_nutrition_charts)
     - metric: string, the metric to display
     
     Returns:
@@ -96,37 +222,28 @@ def create_provincial_nutrition_map(data, metric):
     
     fig.update_layout(height=600)
     
-    return fig
+    return apply_large_data_mode(fig)
 
-def create_nutrition_indicators_radar(data):
+@figure_cache
+def create_nutrition_indicators_radar(radar_rows):
     """
     Create a radar chart of nutrition indicators for selected provinces
     
     Parameters:
-    - data: Pandas DataFrame with nutrition data
+    - radar_rows: Pandas DataFrame with the RADAR_PROVINCES rows ('radar_rows' of plan_national_nutrition_charts)
     
     Returns:
     - Plotly figure
     """
-    # Select a few provinces to compare
-    selected_provinces = ["DKI Jakarta", "Papua", "Jawa Barat", "Nusa Tenggara Timur", "Sulawesi Selatan"]
-    
-    # Metrics to include in radar chart
-    metrics = ['stunting_percentage', 'wasting_percentage', 'obesity_percentage', 
-              'anemia_percentage', 'exclusive_breastfeeding', 'food_security_score']
-    
-    # Filter data
-    filtered_data = data[data['province'].isin(selected_provinces)]
-    
     # Create radar chart
     fig = go.Figure()
     
-    for province in selected_provinces:
-        province_data = filtered_data[filtered_data['province'] == province]
+    for province in RADAR_PROVINCES:
+        province_data = radar_rows[radar_rows['province'] == province]
         if not province_data.empty:
             fig.add_trace(go.Scatterpolar(
-                r=province_data[metrics].values.flatten().tolist(),
-                theta=[m.replace('_', ' ').title() for m in metrics],
+                r=province_data[NUTRITION_METRICS].values.flatten().tolist(),
+                theta=[m.replace('_', ' ').title() for m in NUTRITION_METRICS],
                 fill='toself',
                 name=province
             ))
@@ -144,18 +261,19 @@ def create_nutrition_indicators_radar(data):
     
     return fig
 
-def create_priority_level_distribution(data):
+@figure_cache
+def create_priority_level_distribution(priority_counts):
     """
     Create a pie chart showing the distribution of priority levels
     
     Parameters:
-    - data: Pandas DataFrame with nutrition data
+    - priority_counts: Pandas Series with the number of provinces per priority level
+      ('priority_counts' of plan_nutrition_charts)
     
     Returns:
     - Plotly figure
     """
-    # Count provinces by priority level
-    priority_counts = data['priority_level'].value_counts().reset_index()
+    priority_counts = priority_counts.reset_index()
     priority_counts.columns = ['Priority Level', 'Count']
     
     # Create pie chart
@@ -176,23 +294,20 @@ def create_priority_level_distribution(data):
     
     return fig
 
-def create_correlation_heatmap(data):
+@timed("chart")
+def create_correlation_heatmap(corr_matrix):
     """
     Create a heatmap showing correlations between different nutrition metrics
     
     Parameters:
-    - data: Pandas DataFrame with nutrition data
+    - corr_matrix: Pandas DataFrame correlation matrix ('correlation' of plan_national_nutrition_charts)
     
     Returns:
     - Matplotlib figure
     """
-    # Select numeric columns for correlation
-    numeric_cols = ['stunting_percentage', 'wasting_percentage', 'obesity_percentage', 
-                    'anemia_percentage', 'exclusive_breastfeeding', 'food_security_score',
-                    'nutrition_centers', 'health_workers_per_1000', 'priority_level']
-    
-    # Calculate correlation matrix
-    corr_matrix = data[numeric_cols].corr()
+    # Matplotlib and seaborn take over a second to import, so only load them here
+    import matplotlib.pyplot as plt
+    import seaborn as sns
     
     # Create matplotlib figure
     fig, ax = plt.subplots(figsize=(10, 8))
@@ -214,6 +329,7 @@ def create_correlation_heatmap(data):
     
     return fig
 
+@figure_cache
 def create_specialization_distribution(data):
     """
     Create a horizontal bar chart showing the distribution of positions by specialization
@@ -252,6 +368,7 @@ def create_specialization_distribution(data):
     
     return fig
 
+@figure_cache
 def create_collaboration_types_chart(data):
     """
     Create a bar chart showing the distribution of private sector collaboration types
@@ -292,3 +409,131 @@ def create_collaboration_types_chart(data):
     fig.update_xaxes(tickangle=45)
     
     return fig
+
+@timed("chart")
+def create_density_map_figure(raster, title, height=500):
+    """
+    Create a Plotly map showing a server-side rendered density image instead of raw points
+    
+    Parameters:
+    - raster: dict returned by DensityRenderer.render
+    - title: string, figure title
+    - height: figure height in pixels
+    
+    Returns:
+    - Plotly figure
+    """
+    west, south, east, north = raster["extent"]
+    
+    # Zoom at which the extent spans roughly the width of the figure
+    zoom = float(np.log2(360 * 800 / 256 / max(east - west, 1e-6)))
+    
+    fig = go.Figure(go.Scattermap(lat=[], lon=[]))
+    fig.update_layout(
+        title=title,
+        height=height,
+        margin={"r": 0, "t": 40, "l": 0, "b": 0},
+        map=dict(
+            style="open-street-map",
+            center=dict(lat=(south + north) / 2, lon=(west + east) / 2),
+            zoom=zoom,
+            layers=[dict(
+                sourcetype="image",
+                source=raster["image"],
+                coordinates=[[west, north], [east, north], [east, south], [west, south]]
+            )]
+        )
+    )
+    
+    return fig
+
+def display_drilldown(store, metric, labels, key_prefix="drilldown", ascending=False):
+    """
+    Display cascading level selectors over a rollup store and a chart of the selected node's children
+    
+    Parameters:
+    - store: RollupStore with the hierarchy
+    - metric: measure column to chart
+    - labels: dict mapping level and measure names to display labels
+    - key_prefix: String prefix for session state keys to avoid conflicts
+    - ascending: sort the children by the metric in ascending order
+    
+    Returns:
+    - tuple (path, node, children): the selected path, its measures, and its
+      children (None when the node has no child level)
+    """
+    selectable_levels = store.all_levels[:-1]
+    selector_columns = st.columns(len(selectable_levels))
+    path = ()
+    
+    # Each selector only lists the children of the node selected above it,
+    # and child rows below the stored levels are loaded on demand
+    for column, level in zip(selector_columns, selectable_levels):
+        options = store.children(path)[level].tolist()
+        with column:
+            choice = st.selectbox(
+                labels.get(level, level),
+                options=["Semua"] + options,
+                key=f"{key_prefix}_{'/'.join(path)}_{level}"
+            )
+        if choice == "Semua":
+            break
+        path = store.drill_down(path, choice)
+    
+    node = store.node(path)
+    
+    if not store.has_children(path):
+        return path, node, None
+    
+    children = store.children(path).sort_values(metric, ascending=ascending)
+    child_level = store.all_levels[len(path)]
+    
+    fig = px.bar(
+        children,
+        x=child_level,
+        y=metric,
+        color=metric,
+        color_continuous_scale='RdYlGn_r',
+        title=f"{labels.get(metric, metric)} per {labels.get(child_level, child_level)} - {path[-1] if path else 'Indonesia'}",
+        labels={
+            child_level: labels.get(child_level, child_level),
+            metric: labels.get(metric, metric)
+        }
+    )
+    
+    fig.update_layout(
+        xaxis_tickangle=-45,
+        height=450
+    )
+    
+    st.plotly_chart(fig, use_container_width=True)
+    
+    return path, node, children
+
+def display_figure_payloads(builders):
+    """
+    Display an expander with the payload sizes of a page's cached figures
+    
+    Parameters:
+    - builders: list of figure_cache-decorated functions used on the page
+    """
+    report = figure_payload_report(builders)
+    if report.empty:
+        return
+    
+    with st.expander("Ukuran Data Grafik"):
+        raw, compact = report["raw_bytes"].sum(), report["compact_bytes"].sum()
+        st.caption(
+            f"Data grafik dikirim dalam format biner ringkas: {compact / 1024:,.0f} KB "
+            f"dari {raw / 1024:,.0f} KB ({raw / compact:.1f}x lebih kecil)"
+        )
+        st.dataframe(
+            report[["figure", "raw_bytes", "compact_bytes", "ratio"]].rename(columns={
+                "figure": "Grafik",
+                "raw_bytes": "Ukuran Awal (byte)",
+                "compact_bytes": "Ukuran Ringkas (byte)",
+                "ratio": "Rasio"
+            }),
+            use_container_width=True,
+            hide_index=True
+        )